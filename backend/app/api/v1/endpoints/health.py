@@ -1,6 +1,16 @@
+from collections import Counter
+
 from fastapi import APIRouter
 
-from app.api.v1.schemas.common import HealthResponse
+from app.api.v1.schemas.common import (
+    CacheStatsResponse,
+    HealthResponse,
+    LLMCacheStatsResponse,
+    LLMParseStatsResponse,
+    RealtimeStatsResponse,
+)
+from app.core.dependencies import CacheDep, LLMCacheDep, RealtimeServiceDep, SettingsDep
+from app.services.answer_parsing import ParseStats
 
 router = APIRouter(tags=["health"])
 
@@ -8,3 +18,44 @@ router = APIRouter(tags=["health"])
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
     return HealthResponse(status="ok")
+
+
+@router.get("/health/cache", response_model=CacheStatsResponse)
+def cache_stats(cache: CacheDep, settings: SettingsDep) -> CacheStatsResponse:
+    """Hit/miss counters of the survey read cache in this process."""
+    stats = cache.stats
+    return CacheStatsResponse(
+        backend=settings.CACHE_BACKEND,
+        entries=cache.size(),
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        invalidations=stats.invalidations,
+        hit_ratio=round(stats.hit_ratio, 3),
+    )
+
+
+@router.get("/health/llm-cache", response_model=LLMCacheStatsResponse)
+def llm_cache_stats(cache: LLMCacheDep) -> LLMCacheStatsResponse:
+    """Size and lifetime hit ratio of the LLM response cache, across all workers."""
+    if cache is None:
+        return LLMCacheStatsResponse(enabled=False)
+    return LLMCacheStatsResponse(enabled=True, **cache.stats())
+
+
+@router.get("/health/llm-parsing", response_model=LLMParseStatsResponse)
+def llm_parse_stats(cache: LLMCacheDep) -> LLMParseStatsResponse:
+    """Answers per parser stage and fallback rate of each model, across all workers."""
+    if cache is None:
+        return LLMParseStatsResponse(enabled=False)
+    models = {
+        model: ParseStats(Counter(methods)).as_dict()
+        for model, methods in cache.parse_stats().items()
+    }
+    return LLMParseStatsResponse(enabled=True, models=models)
+
+
+@router.get("/health/realtime", response_model=RealtimeStatsResponse)
+def realtime_stats(realtime: RealtimeServiceDep) -> RealtimeStatsResponse:
+    """Websocket clients of this process and messages dropped by their full queues."""
+    return RealtimeStatsResponse(**realtime.stats())
@@ -1,6 +1,16 @@
-from fastapi import APIRouter, Query
+import asyncio
+import hashlib
+import os
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 
 from app.api.v1.schemas.agent import AgentListResponse, AgentResponse
+from app.api.v1.schemas.common import BaseSchema
+from app.api.v1.schemas.job import JobResponse
 from app.api.v1.schemas.response import (
     AggregateListResponse,
     AggregateOut,
@@ -15,7 +25,19 @@ from app.api.v1.schemas.survey import (
     SurveyQuestionResponse,
     SurveyResponse,
 )
-from app.core.dependencies import SurveyServiceDep
+from app.api.v1.serialization import FastJSONResponse, list_response
+from app.core.dependencies import (
+    JobServiceDep,
+    ResponseCacheDep,
+    SurveyQueryDep,
+    SurveyServiceDep,
+)
+from app.core.errors import ValidationError
+from app.domain.entities.survey import Survey
+from app.infrastructure.cache.base import Cache
+from app.services import columnar_export
+from app.services.export import MEDIA_TYPES, ExportFormat, stream_export
+from app.services.survey_service import SurveyService
 
 router = APIRouter(prefix="/surveys", tags=["Surveys"])
 
@@ -39,12 +61,12 @@ def create_survey(body: SurveyCreate, svc: SurveyServiceDep):
 
 
 @router.get("", response_model=SurveyListResponse)
-def list_surveys(
-    svc: SurveyServiceDep,
+async def list_surveys(
+    queries: SurveyQueryDep,
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
 ):
-    surveys = svc.list_surveys(limit=limit, offset=offset)
+    surveys = await queries.list_surveys(limit=limit, offset=offset)
     return SurveyListResponse(
         surveys=[_survey_to_response(s) for s in surveys],
         count=len(surveys),
@@ -52,8 +74,8 @@ def list_surveys(
 
 
 @router.get("/{survey_id}", response_model=SurveyResponse)
-def get_survey(survey_id: str, svc: SurveyServiceDep):
-    survey = svc.get_survey(survey_id)
+async def get_survey(survey_id: str, queries: SurveyQueryDep):
+    survey = await queries.get_survey(survey_id)
     return _survey_to_response(survey)
 
 
@@ -62,39 +84,51 @@ def delete_survey(survey_id: str, svc: SurveyServiceDep):
     svc.delete_survey(survey_id)
 
 
+# ── Simulation ───────────────────────────────────────────
+
+
+@router.post("/{survey_id}/run", response_model=JobResponse, status_code=202)
+def run_survey(survey_id: str, jobs: JobServiceDep):
+    job = jobs.submit_run(survey_id)
+    return _job_to_response(job)
+
+
+@router.get("/{survey_id}/job", response_model=JobResponse)
+def get_survey_job(survey_id: str, jobs: JobServiceDep):
+    job = jobs.get_job(survey_id)
+    return _job_to_response(job)
+
+
+@router.post("/{survey_id}/cancel", response_model=JobResponse, status_code=202)
+def cancel_survey_run(survey_id: str, jobs: JobServiceDep):
+    job = jobs.cancel_run(survey_id)
+    return _job_to_response(job)
+
+
 # ── Agents ───────────────────────────────────────────────
 
 
 @router.get("/{survey_id}/agents", response_model=AgentListResponse)
-def get_survey_agents(survey_id: str, svc: SurveyServiceDep):
-    agents = svc.get_agents(survey_id)
-    items = [
-        AgentResponse(
-            id=a.id,
-            survey_id=a.survey_id,
-            agent_index=a.agent_index,
-            eco=a.eco,
-            open=a.open,
-            trust=a.trust,
-            temperament=a.temperament,
-            age=a.age,
-            education=a.education,
-            urban_rural=a.urban_rural,
-            classe_sociale=a.classe_sociale,
-            background=a.background,
-            created_at=a.created_at,
-        )
-        for a in agents
-    ]
-    return AgentListResponse(agents=items, count=len(items))
+def get_survey_agents(
+    survey_id: str,
+    request: Request,
+    svc: SurveyServiceDep,
+    cache: ResponseCacheDep,
+):
+    survey = svc.get_survey(survey_id)
+    return _completed_json(request, survey, cache, lambda: _agents_body(svc, survey_id))
+
+
+def _agents_body(svc: SurveyService, survey_id: str) -> FastJSONResponse:
+    return list_response("agents", svc.get_agents(survey_id), AgentResponse)
 
 
 # ── Questions ────────────────────────────────────────────
 
 
 @router.get("/{survey_id}/questions", response_model=list[SurveyQuestionResponse])
-def get_survey_questions(survey_id: str, svc: SurveyServiceDep):
-    questions = svc.get_questions(survey_id)
+async def get_survey_questions(survey_id: str, queries: SurveyQueryDep):
+    questions = await queries.get_questions(survey_id)
     return [
         SurveyQuestionResponse(
             id=q.id,
@@ -116,26 +150,35 @@ def get_survey_questions(survey_id: str, svc: SurveyServiceDep):
 @router.get("/{survey_id}/responses", response_model=ResponseListResponse)
 def get_survey_responses(
     survey_id: str,
+    request: Request,
     svc: SurveyServiceDep,
+    cache: ResponseCacheDep,
     limit: int = Query(default=1000, ge=1),
     offset: int = Query(default=0, ge=0),
+    fields: str | None = Query(default=None),
+    include_raw: bool = Query(default=True),
 ):
-    responses = svc.get_responses(survey_id)
-    items = [
-        ResponseOut(
-            id=r.id,
-            survey_id=r.survey_id,
-            agent_id=r.agent_id,
-            stance=r.stance,
-            confidence=r.confidence,
-            short_reason=r.short_reason,
-            raw_llm_output=r.raw_llm_output,
-            is_fallback=r.is_fallback,
-            created_at=r.created_at,
-        )
-        for r in responses
-    ]
-    return ResponseListResponse(responses=items, count=len(items))
+    selected = _parse_fields(fields, ResponseOut)
+    survey = svc.get_survey(survey_id)
+    return _completed_json(
+        request,
+        survey,
+        cache,
+        lambda: _responses_body(svc, survey_id, selected, include_raw),
+    )
+
+
+def _responses_body(
+    svc: SurveyService,
+    survey_id: str,
+    selected: list[str] | None,
+    include_raw: bool,
+) -> FastJSONResponse:
+    if selected:
+        rows = svc.get_response_rows(survey_id, selected)
+        return FastJSONResponse({"responses": rows, "count": len(rows)})
+    responses = svc.get_responses(survey_id, include_raw=include_raw)
+    return list_response("responses", responses, ResponseOut)
 
 
 # ── Question responses (mode questionnaire) ──────────────
@@ -145,24 +188,35 @@ def get_survey_responses(
     "/{survey_id}/question-responses",
     response_model=QuestionResponseListResponse,
 )
-def get_survey_question_responses(survey_id: str, svc: SurveyServiceDep):
-    responses = svc.get_question_responses(survey_id)
-    items = [
-        QuestionResponseOut(
-            id=r.id,
-            survey_id=r.survey_id,
-            agent_id=r.agent_id,
-            question_id=r.question_id,
-            answer=r.answer,
-            confidence=r.confidence,
-            short_reason=r.short_reason,
-            raw_llm_output=r.raw_llm_output,
-            is_fallback=r.is_fallback,
-            created_at=r.created_at,
-        )
-        for r in responses
-    ]
-    return QuestionResponseListResponse(responses=items, count=len(items))
+def get_survey_question_responses(
+    survey_id: str,
+    request: Request,
+    svc: SurveyServiceDep,
+    cache: ResponseCacheDep,
+    fields: str | None = Query(default=None),
+    include_raw: bool = Query(default=True),
+):
+    selected = _parse_fields(fields, QuestionResponseOut)
+    survey = svc.get_survey(survey_id)
+    return _completed_json(
+        request,
+        survey,
+        cache,
+        lambda: _question_responses_body(svc, survey_id, selected, include_raw),
+    )
+
+
+def _question_responses_body(
+    svc: SurveyService,
+    survey_id: str,
+    selected: list[str] | None,
+    include_raw: bool,
+) -> FastJSONResponse:
+    if selected:
+        rows = svc.get_question_response_rows(survey_id, selected)
+        return FastJSONResponse({"responses": rows, "count": len(rows)})
+    responses = svc.get_question_responses(survey_id, include_raw=include_raw)
+    return list_response("responses", responses, QuestionResponseOut)
 
 
 # ── Aggregates ───────────────────────────────────────────
@@ -185,19 +239,66 @@ def compute_aggregates(survey_id: str, svc: SurveyServiceDep):
 
 
 @router.get("/{survey_id}/aggregates", response_model=AggregateListResponse)
-def get_aggregates(survey_id: str, svc: SurveyServiceDep):
-    aggregates = svc.get_aggregates(survey_id)
-    items = [
-        AggregateOut(
-            id=a.id,
-            survey_id=a.survey_id,
-            question_id=a.question_id,
-            aggregation=a.aggregation,
-            computed_at=a.computed_at,
-        )
-        for a in aggregates
-    ]
-    return AggregateListResponse(aggregates=items, count=len(items))
+async def get_aggregates(
+    survey_id: str,
+    request: Request,
+    queries: SurveyQueryDep,
+    cache: ResponseCacheDep,
+):
+    survey = await queries.get_survey(survey_id)
+    aggregates = await queries.get_aggregates(survey_id)
+
+    def build() -> FastJSONResponse:
+        return list_response("aggregates", aggregates, AggregateOut)
+
+    # Aggregates can be recomputed after completion (POST /aggregate).
+    computed_at = max((a.computed_at for a in aggregates), default=None)
+    # The response cache may be SQLite-backed: keep its I/O off the event loop.
+    return await asyncio.to_thread(_completed_json, request, survey, cache, build, computed_at)
+
+
+# ── Export ───────────────────────────────────────────────
+
+
+@router.get("/{survey_id}/export", response_class=StreamingResponse)
+def export_survey_results(
+    survey_id: str,
+    svc: SurveyServiceDep,
+    fmt: ExportFormat = Query(default="ndjson", alias="format"),
+    include_agents: bool = Query(default=False),
+    include_raw: bool = Query(default=False),
+):
+    survey = svc.get_survey(survey_id)
+    return StreamingResponse(
+        stream_export(svc, survey, fmt, include_agents, include_raw),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="survey-{survey_id}.{fmt}"'},
+    )
+
+
+@router.get("/{survey_id}/export.parquet", response_class=FileResponse)
+def export_survey_parquet(survey_id: str, svc: SurveyServiceDep):
+    return _columnar_export(svc, survey_id, "parquet")
+
+
+@router.get("/{survey_id}/export.arrow", response_class=FileResponse)
+def export_survey_arrow(survey_id: str, svc: SurveyServiceDep):
+    return _columnar_export(svc, survey_id, "arrow")
+
+
+def _columnar_export(
+    svc: SurveyService,
+    survey_id: str,
+    fmt: columnar_export.ColumnarFormat,
+) -> FileResponse:
+    survey = svc.get_survey(survey_id)
+    path = columnar_export.write_columnar(svc, survey, fmt)
+    return FileResponse(
+        path,
+        media_type=columnar_export.MEDIA_TYPES[fmt],
+        filename=f"survey-{survey_id}.{fmt}",
+        background=BackgroundTask(os.unlink, path),
+    )
 
 
 # ── Helpers ──────────────────────────────────────────────
@@ -220,3 +321,79 @@ def _survey_to_response(s) -> SurveyResponse:
         completed_at=s.completed_at,
         created_at=s.created_at,
     )
+
+
+def _job_to_response(j) -> JobResponse:
+    return JobResponse(
+        id=j.id,
+        survey_id=j.survey_id,
+        kind=j.kind,
+        status=j.status,
+        attempts=j.attempts,
+        max_attempts=j.max_attempts,
+        progress_done=j.progress_done,
+        progress_total=j.progress_total,
+        cancel_requested=j.cancel_requested,
+        last_error=j.last_error,
+        created_at=j.created_at,
+        updated_at=j.updated_at,
+    )
+
+
+def _parse_fields(fields: str | None, schema: type[BaseSchema]) -> list[str] | None:
+    """Validate a `fields=a,b` projection against the columns of `schema`."""
+    if fields is None:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in schema.model_fields]
+    if not selected or unknown:
+        raise ValidationError(
+            f"Invalid fields: {', '.join(unknown) or fields!r}",
+            details={"allowed": list(schema.model_fields)},
+        )
+    return selected
+
+
+def _completed_json(
+    request: Request,
+    survey: Survey,
+    cache: Cache,
+    build: Callable[[], Response],
+    *version: Any,
+) -> Response:
+    """Serve a sub-resource of a completed survey with a strong ETag.
+
+    Results no longer change once a survey is completed, so the body is
+    serialised once and its bytes cached under the ETag; a matching
+    `If-None-Match` gets a 304 without touching the cache at all.
+    """
+    if survey.status != "completed":
+        return build()
+    etag = _etag(request, survey, *version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    key = f"body:{etag}"
+    body = cache.get(key)
+    if body is None:
+        body = bytes(build().body)
+        cache.set(key, body)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _etag(request: Request, survey: Survey, *version: Any) -> str:
+    parts = [
+        request.url.path,
+        *sorted(f"{k}={v}" for k, v in request.query_params.multi_items()),
+        survey.status,
+        str(survey.completed_at),
+        *(str(v) for v in version),
+    ]
+    return '"' + hashlib.sha256("|".join(parts).encode()).hexdigest()[:32] + '"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return "*" in candidates or etag in candidates
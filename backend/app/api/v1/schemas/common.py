@@ -14,6 +14,42 @@ class HealthResponse(BaseSchema):
     status: str = "ok"
 
 
+class CacheStatsResponse(BaseSchema):
+    backend: str
+    entries: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    hit_ratio: float
+
+
+class RealtimeStatsResponse(BaseSchema):
+    connections: int
+    dropped: int
+
+
+class LLMCacheStatsResponse(BaseSchema):
+    enabled: bool
+    entries: int = 0
+    size_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    hit_ratio: float = 0.0
+
+
+class ModelParseStats(BaseSchema):
+    parsed: int
+    parse_fallbacks: int
+    parse_fallback_rate: float
+    parse_methods: dict[str, int]
+
+
+class LLMParseStatsResponse(BaseSchema):
+    enabled: bool
+    models: dict[str, ModelParseStats] = {}
+
+
 class ErrorDetail(BaseSchema):
     message: str
     status_code: int
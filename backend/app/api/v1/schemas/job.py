@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from app.api.v1.schemas.common import BaseSchema
+
+
+class JobResponse(BaseSchema):
+    id: str
+    survey_id: str
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    progress_done: int
+    progress_total: int
+    cancel_requested: bool
+    last_error: str | None = None
+    created_at: datetime
+    updated_at: datetime
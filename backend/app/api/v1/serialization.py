@@ -0,0 +1,64 @@
+"""Fast JSON bodies for the list endpoints.
+
+The domain entities are dataclasses whose fields mirror the `*Out` schemas,
+so orjson can serialise them natively: no per-item Pydantic model is built,
+validated and dumped again. Routes keep their `response_model`, which then
+only documents the body in the OpenAPI schema.
+"""
+
+import dataclasses
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+# Same output as Pydantic for what the entities hold: UTC datetimes end in "Z".
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+def list_response(
+    key: str,
+    items: Sequence[Any],
+    schema: type[BaseModel],
+) -> FastJSONResponse:
+    """`{key: [...], "count": n}` with each item shaped like `schema`."""
+    return FastJSONResponse({key: project(items, schema), "count": len(items)})
+
+
+def project(items: Sequence[Any], schema: type[BaseModel]) -> Sequence[Any]:
+    """Items as orjson-native values exposing exactly the fields of `schema`.
+
+    Dicts (projected rows) and dataclasses with the schema's fields pass
+    through untouched; other objects are reduced to those fields.
+    """
+    if not items or isinstance(items[0], dict) or _mirrors(type(items[0]), schema):
+        return items
+    fields = tuple(schema.model_fields)
+    return [{name: getattr(item, name) for name in fields} for item in items]
+
+
+@cache
+def _mirrors(cls: type, schema: type[BaseModel]) -> bool:
+    if not dataclasses.is_dataclass(cls):
+        return False
+    return tuple(f.name for f in dataclasses.fields(cls)) == tuple(schema.model_fields)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
@@ -19,15 +19,67 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_SERVICE_ROLE_KEY: str = ""
     SUPABASE_SCHEMA: str = "public"
+    SUPABASE_PAGE_SIZE: int = 1000
+    SUPABASE_HTTP2: bool = True
+    SUPABASE_MAX_CONNECTIONS: int = 20
+    SUPABASE_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    SUPABASE_KEEPALIVE_EXPIRY: float = 30.0
+    SUPABASE_TIMEOUT: float = 10.0
+    DB_WRITE_CHUNK_SIZE: int = 500
+    DB_WRITE_MAX_CHUNK_BYTES: int = 1_000_000
+    DB_WRITE_MAX_CONCURRENCY: int = 4
+    DB_WRITE_MAX_RETRIES: int = 2
+
+    CACHE_BACKEND: Literal["memory", "sqlite", "none"] = "sqlite"
+    CACHE_PATH: str = "data/cache.sqlite3"
+    CACHE_TTL_SECONDS: float = 30.0
+    CACHE_MAX_ENTRIES: int = 10_000
+    RESPONSE_CACHE_PATH: str = "data/response_cache.sqlite3"
+    RESPONSE_CACHE_TTL_SECONDS: float = 3600.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256
 
     CORS_ORIGINS: str = "*"
     LOG_LEVEL: str = "INFO"
 
+    LLM_PROVIDER: Literal["groq", "ollama", "router"] = "groq"
+
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "llama-3.3-70b-versatile"
+    GROQ_MAX_CONCURRENCY: int = 8
+    GROQ_REQUESTS_PER_MINUTE: int = 0
+    GROQ_TOKENS_PER_MINUTE: int = 0
 
     OLLAMA_HOST: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3.2:3b"
+    OLLAMA_MAX_CONCURRENCY: int = 1
+    OLLAMA_HOSTS: str = ""
+
+    LLM_ROUTER_FAILURE_THRESHOLD: int = 5
+    LLM_ROUTER_RESET_SECONDS: float = 30.0
+
+    LLM_JSON_MODE: bool = True
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "data/llm_cache.sqlite3"
+    LLM_CACHE_MAX_BYTES: int = 256_000_000
+
+    SIMULATION_MAX_CONCURRENCY: int = 16
+    SIMULATION_CHUNK_SIZE: int = 200
+    AGGREGATE_SNAPSHOT_INTERVAL: float = 2.0
+
+    REALTIME_BROKER: Literal["memory", "sqlite"] = "sqlite"
+    REALTIME_BROKER_PATH: str = "data/realtime.sqlite3"
+    REALTIME_POLL_INTERVAL: float = 0.05
+    REALTIME_SEND_QUEUE_SIZE: int = 100
+    REALTIME_OVERFLOW_POLICY: Literal["drop_oldest", "drop_newest", "coalesce"] = "coalesce"
+    REALTIME_SEND_TIMEOUT: float = 5.0
+    REALTIME_BATCH_INTERVAL: float = 0.1
+    REALTIME_BATCH_MAX_SIZE: int = 100
+
+    JOB_QUEUE_PATH: str = "data/jobs.sqlite3"
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_LEASE_SECONDS: float = 60.0
+    WORKER_PROCESSES: int = 2
+    WORKER_POLL_INTERVAL: float = 1.0
 
     @property
     def cors_origins_list(self) -> list[str]:
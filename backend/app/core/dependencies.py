@@ -3,25 +3,49 @@ from typing import Annotated
 from fastapi import Depends
 
 from app.core.config import Settings, get_settings
+from app.infrastructure.cache.base import Cache
+from app.infrastructure.cache.factory import get_cache, get_response_cache
+from app.infrastructure.db.async_supabase_client import (
+    AsyncSupabaseClient,
+    get_async_supabase_client,
+)
 from app.infrastructure.db.supabase_client import SupabaseClient, get_supabase_client
+from app.infrastructure.llm.cache import LLMResponseCache
+from app.infrastructure.llm.factory import get_llm_cache
+from app.infrastructure.pubsub.factory import create_broker
+from app.infrastructure.queue.sqlite_queue import SQLiteJobQueue, get_job_queue
 from app.repositories.agent_repo import AgentRepository
 from app.repositories.response_repo import ResponseRepository
-from app.repositories.survey_aggregate_repo import SurveyAggregateRepository
-from app.repositories.survey_question_repo import SurveyQuestionRepository
+from app.repositories.survey_aggregate_repo import (
+    AsyncSurveyAggregateRepository,
+    SurveyAggregateRepository,
+)
+from app.repositories.survey_question_repo import (
+    AsyncSurveyQuestionRepository,
+    SurveyQuestionRepository,
+)
 from app.repositories.survey_question_response_repo import SurveyQuestionResponseRepository
-from app.repositories.survey_repo import SurveyRepository
+from app.repositories.survey_repo import AsyncSurveyRepository, SurveyRepository
+from app.services.aggregation import get_live_aggregates
+from app.services.job_service import SurveyJobService
 from app.services.realtime_service import RealtimeService
+from app.services.survey_query_service import SurveyQueryService
 from app.services.survey_service import SurveyService
 
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 SupabaseDep = Annotated[SupabaseClient, Depends(get_supabase_client)]
+AsyncSupabaseDep = Annotated[AsyncSupabaseClient, Depends(get_async_supabase_client)]
+JobQueueDep = Annotated[SQLiteJobQueue, Depends(get_job_queue)]
+CacheDep = Annotated[Cache, Depends(get_cache)]
+ResponseCacheDep = Annotated[Cache, Depends(get_response_cache)]
+LLMCacheDep = Annotated[LLMResponseCache | None, Depends(get_llm_cache)]
 
 
 # ── Repositories ─────────────────────────────────────────
 
 
-def get_survey_repo(db: SupabaseDep) -> SurveyRepository:
-    return SurveyRepository(db)
+def get_survey_repo(db: SupabaseDep, cache: CacheDep) -> SurveyRepository:
+    return SurveyRepository(db, cache)
 
 
 def get_agent_repo(db: SupabaseDep) -> AgentRepository:
@@ -36,8 +60,8 @@ def get_survey_aggregate_repo(db: SupabaseDep) -> SurveyAggregateRepository:
     return SurveyAggregateRepository(db)
 
 
-def get_survey_question_repo(db: SupabaseDep) -> SurveyQuestionRepository:
-    return SurveyQuestionRepository(db)
+def get_survey_question_repo(db: SupabaseDep, cache: CacheDep) -> SurveyQuestionRepository:
+    return SurveyQuestionRepository(db, cache)
 
 
 def get_survey_question_response_repo(db: SupabaseDep) -> SurveyQuestionResponseRepository:
@@ -55,6 +79,32 @@ QuestionResponseRepoDep = Annotated[
 ]
 
 
+def get_async_survey_repo(db: AsyncSupabaseDep, cache: CacheDep) -> AsyncSurveyRepository:
+    return AsyncSurveyRepository(db, cache)
+
+
+def get_async_survey_question_repo(
+    db: AsyncSupabaseDep,
+    cache: CacheDep,
+) -> AsyncSurveyQuestionRepository:
+    return AsyncSurveyQuestionRepository(db, cache)
+
+
+def get_async_survey_aggregate_repo(db: AsyncSupabaseDep) -> AsyncSurveyAggregateRepository:
+    return AsyncSurveyAggregateRepository(db)
+
+
+AsyncSurveyRepoDep = Annotated[AsyncSurveyRepository, Depends(get_async_survey_repo)]
+AsyncQuestionRepoDep = Annotated[
+    AsyncSurveyQuestionRepository,
+    Depends(get_async_survey_question_repo),
+]
+AsyncAggregateRepoDep = Annotated[
+    AsyncSurveyAggregateRepository,
+    Depends(get_async_survey_aggregate_repo),
+]
+
+
 # ── Realtime ─────────────────────────────────────────────
 
 _realtime_service: RealtimeService | None = None
@@ -63,10 +113,23 @@ _realtime_service: RealtimeService | None = None
 def get_realtime_service() -> RealtimeService:
     global _realtime_service
     if _realtime_service is None:
-        _realtime_service = RealtimeService()
+        settings = get_settings()
+        _realtime_service = RealtimeService(
+            create_broker(),
+            send_queue_size=settings.REALTIME_SEND_QUEUE_SIZE,
+            overflow_policy=settings.REALTIME_OVERFLOW_POLICY,
+            send_timeout=settings.REALTIME_SEND_TIMEOUT,
+        )
     return _realtime_service
 
 
+async def close_realtime_service() -> None:
+    global _realtime_service
+    if _realtime_service is not None:
+        await _realtime_service.close()
+        _realtime_service = None
+
+
 RealtimeServiceDep = Annotated[RealtimeService, Depends(get_realtime_service)]
 
 
@@ -88,7 +151,30 @@ def get_survey_service(
         aggregate_repo=aggregate_repo,
         question_repo=question_repo,
         question_response_repo=question_response_repo,
+        live_aggregates=get_live_aggregates(),
     )
 
 
 SurveyServiceDep = Annotated[SurveyService, Depends(get_survey_service)]
+
+
+def get_survey_query_service(
+    survey_repo: AsyncSurveyRepoDep,
+    question_repo: AsyncQuestionRepoDep,
+    aggregate_repo: AsyncAggregateRepoDep,
+) -> SurveyQueryService:
+    return SurveyQueryService(survey_repo, question_repo, aggregate_repo)
+
+
+SurveyQueryDep = Annotated[SurveyQueryService, Depends(get_survey_query_service)]
+
+
+def get_job_service(
+    svc: SurveyServiceDep,
+    queue: JobQueueDep,
+    settings: SettingsDep,
+) -> SurveyJobService:
+    return SurveyJobService(svc, queue, max_attempts=settings.JOB_MAX_ATTEMPTS)
+
+
+JobServiceDep = Annotated[SurveyJobService, Depends(get_job_service)]
@@ -13,3 +13,14 @@ class Response:
     raw_llm_output: str | None = None
     is_fallback: bool = False
     created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class ResponseSummary:
+    """Projection of a response without its raw LLM output, for aggregation."""
+
+    agent_id: str
+    stance: str | None
+    confidence: float
+    short_reason: str | None
+    is_fallback: bool
@@ -14,3 +14,14 @@ class SurveyQuestionResponse:
     raw_llm_output: str | None = None
     is_fallback: bool = False
     created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class SurveyQuestionResponseSummary:
+    """Projection of a question response without its raw LLM output."""
+
+    agent_id: str
+    question_id: str
+    answer: str
+    confidence: float
+    is_fallback: bool
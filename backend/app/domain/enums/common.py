@@ -23,3 +23,11 @@ class QuestionType(str, Enum):
     STANCE = "stance"
     LIKERT = "likert"
     MCQ = "mcq"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    LEASED = "leased"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
@@ -0,0 +1,48 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Cache(Protocol):
+    """Expiring key/value store placed in front of repository reads.
+
+    `get` returns None on a miss, so None itself is never cached. Values are
+    shared with other callers and must be treated as read-only.
+
+    Every `delete` of a key bumps its `generation`. A read-through fill passes
+    the generation read before loading the value, and `set` drops it if the
+    key was invalidated meanwhile: a load racing an update never caches the
+    old value.
+    """
+
+    stats: CacheStats
+
+    def get(self, key: str) -> Any | None: ...
+
+    def generation(self, key: str) -> int: ...
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def size(self) -> int: ...
+
+    def clear(self) -> None: ...
@@ -0,0 +1,50 @@
+from app.core.config import get_settings
+from app.infrastructure.cache.base import Cache
+from app.infrastructure.cache.memory_cache import TTLCache
+from app.infrastructure.cache.null_cache import NullCache
+from app.infrastructure.cache.sqlite_cache import SQLiteCache
+
+
+def create_cache(path: str, max_entries: int, ttl: float) -> Cache:
+    backend = get_settings().CACHE_BACKEND
+    if backend == "sqlite":
+        return SQLiteCache(path, max_entries=max_entries, ttl=ttl)
+    if backend == "memory":
+        return TTLCache(max_entries=max_entries, ttl=ttl)
+    return NullCache()
+
+
+_cache: Cache | None = None
+_response_cache: Cache | None = None
+
+
+def get_cache() -> Cache:
+    """Entities read by the repositories (surveys, questions)."""
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = create_cache(
+            settings.CACHE_PATH,
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            ttl=settings.CACHE_TTL_SECONDS,
+        )
+    return _cache
+
+
+def get_response_cache() -> Cache:
+    """Serialised JSON bodies of completed surveys' sub-resources."""
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = create_cache(
+            settings.RESPONSE_CACHE_PATH,
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    return _response_cache
+
+
+def reset_cache() -> None:
+    global _cache, _response_cache
+    _cache = None
+    _response_cache = None
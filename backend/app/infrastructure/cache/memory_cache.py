@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.infrastructure.cache.base import CacheStats
+
+
+class TTLCache:
+    """In-process LRU whose entries also expire `ttl` seconds after being set.
+
+    Invalidations only reach the current process: use it for single process
+    setups, or where a few seconds of staleness across workers is acceptable.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 30.0):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Last invalidation of each key, numbered process-wide. Forgotten keys
+        # report the highest number forgotten, so a pending fill can only be
+        # refused, never accepted, by the trimming.
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._invalidations = 0
+        self._forgotten_generation = 0
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.stats.record("misses")
+                return None
+            self._entries.move_to_end(key)
+        self.stats.record("hits")
+        return entry[1]
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations.get(key, self._forgotten_generation)
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        with self._lock:
+            current = self._generations.get(key, self._forgotten_generation)
+            if generation is not None and generation != current:
+                return
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self.stats.record("evictions", evicted)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._invalidations += 1
+                self._generations[key] = self._invalidations
+                self._generations.move_to_end(key)
+            while len(self._generations) > self._max_entries:
+                _, forgotten = self._generations.popitem(last=False)
+                self._forgotten_generation = max(self._forgotten_generation, forgotten)
+        self.stats.record("invalidations", len(keys))
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,29 @@
+from typing import Any
+
+from app.infrastructure.cache.base import CacheStats
+
+
+class NullCache:
+    """Caches nothing: every read goes to the database."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Any | None:
+        self.stats.record("misses")
+        return None
+
+    def generation(self, key: str) -> int:
+        return 0
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def size(self) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
@@ -0,0 +1,146 @@
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any
+
+from app.infrastructure.cache.base import CacheStats
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_accessed_at ON cache (accessed_at);
+CREATE TABLE IF NOT EXISTS generations (
+    key TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteCache:
+    """LRU/TTL cache kept in a local SQLite file shared by every process.
+
+    The API workers and the survey workers read and invalidate the same
+    entries, so a status change made by a worker is visible to the next API
+    read instead of after the TTL. Hit/miss counters are per process.
+
+    Recency is refreshed at most once per `touch_interval` (a quarter of the
+    TTL by default) per entry, so most hits are plain reads that take no
+    write lock.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10_000,
+        ttl: float = 30.0,
+        touch_interval: float | None = None,
+    ):
+        self._path = path
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._touch_interval = ttl / 4 if touch_interval is None else touch_interval
+        self.stats = CacheStats()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            # WAL is a property of the database file: set once, not per connection.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, accessed_at FROM cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is not None and now - row[1] >= self._touch_interval:
+                conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        finally:
+            conn.close()
+        if row is None:
+            self.stats.record("misses")
+            return None
+        self.stats.record("hits")
+        return pickle.loads(row[0])
+
+    def generation(self, key: str) -> int:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT generation FROM generations WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else 0
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        now = time.time()
+        entry = (key, pickle.dumps(value), now + self._ttl, now)
+        conn = self._connect()
+        try:
+            if generation is None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    entry,
+                )
+            else:
+                # Checked in the same statement, so no delete can slip in between.
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                    "SELECT ?, ?, ?, ? WHERE COALESCE("
+                    "(SELECT generation FROM generations WHERE key = ?), 0) = ?",
+                    (*entry, key, generation),
+                )
+            evicted = conn.execute(
+                "DELETE FROM cache WHERE expires_at <= ? OR key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (now, self._max_entries),
+            ).rowcount
+        finally:
+            conn.close()
+        if evicted:
+            self.stats.record("evictions", evicted)
+
+    def delete(self, *keys: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("DELETE FROM cache WHERE key = ?", [(k,) for k in keys])
+            conn.executemany(
+                "INSERT INTO generations (key, generation) VALUES (?, 1) "
+                "ON CONFLICT (key) DO UPDATE SET generation = generation + 1",
+                [(k,) for k in keys],
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        self.stats.record("invalidations", len(keys))
+
+    def size(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        finally:
+            conn.close()
+
+    def clear(self) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30, isolation_level=None)
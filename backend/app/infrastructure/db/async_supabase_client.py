@@ -0,0 +1,273 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.errors import RepoError
+from app.infrastructure.db.supabase_client import keyset_filter
+
+
+class AsyncSupabaseClient:
+    """Async PostgREST client sharing one pooled HTTP/2 connection set.
+
+    Talks to `{url}/rest/v1` directly with httpx, so `async def` endpoints can
+    await data access instead of holding a threadpool slot for each round
+    trip; concurrent requests are multiplexed over at most `max_connections`
+    kept-alive connections. Mirrors the call signatures of `SupabaseClient`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        schema: str = "public",
+        page_size: int = 1000,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        http2: bool = True,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._url = url
+        self._key = key
+        self._schema = schema
+        self._page_size = page_size
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = timeout
+        self._http2 = http2
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            if not self._url or not self._key:
+                raise RepoError("Supabase URL and KEY must be configured")
+            if self._http2 and self._transport is None:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    raise RepoError("h2 package not installed (pip install 'httpx[http2]')")
+            self._client = httpx.AsyncClient(
+                base_url=f"{self._url.rstrip('/')}/rest/v1",
+                headers={
+                    "apikey": self._key,
+                    "Authorization": f"Bearer {self._key}",
+                    "Accept-Profile": self._schema,
+                    "Content-Profile": self._schema,
+                },
+                http2=self._http2,
+                limits=self._limits,
+                timeout=self._timeout,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ── Reads ────────────────────────────────────────────
+
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: dict[str, Any] | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_by: str | None = None,
+        order_desc: bool = False,
+    ) -> list[dict[str, Any]]:
+        params = {"select": columns, **self._filters(filters)}
+        if order_by:
+            params["order"] = f"{order_by}.{'desc' if order_desc else 'asc'}"
+        if limit is not None:
+            params["limit"] = str(limit)
+        if offset is not None:
+            params["offset"] = str(offset)
+        response = await self._request("GET", table, "Select", params=params)
+        return response.json()
+
+    async def select_one(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        results = await self.select(table, columns, filters, limit=1)
+        return results[0] if results else None
+
+    async def select_iter(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: dict[str, Any] | None = None,
+        key: str | tuple[str, ...] = "id",
+        page_size: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Keyset-paginated stream of rows, see `SupabaseClient.select_iter`."""
+        keys = (key,) if isinstance(key, str) else key
+        size = page_size or self._page_size
+        last: tuple[Any, ...] | None = None
+        while True:
+            params = {"select": columns, **self._filters(filters)}
+            if last is not None:
+                if len(keys) == 1:
+                    params[keys[0]] = f"gt.{last[0]}"
+                else:
+                    params["or"] = f"({keyset_filter(keys, last)})"
+            params["order"] = ",".join(f"{name}.asc" for name in keys)
+            params["limit"] = str(size)
+            rows = (await self._request("GET", table, "Select", params=params)).json()
+            if not rows:
+                return
+            for row in rows:
+                yield row
+            last = tuple(rows[-1][name] for name in keys)
+
+    # ── Writes ───────────────────────────────────────────
+
+    async def insert(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        returning: bool = True,
+    ) -> list[dict[str, Any]] | int:
+        response = await self._request(
+            "POST", table, "Insert", json=data, prefer=self._prefer(returning)
+        )
+        return self._write_result(response, returning)
+
+    async def upsert(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        on_conflict: str = "id",
+        returning: bool = True,
+        ignore_duplicates: bool = False,
+    ) -> list[dict[str, Any]] | int:
+        resolution = "ignore-duplicates" if ignore_duplicates else "merge-duplicates"
+        response = await self._request(
+            "POST",
+            table,
+            "Upsert",
+            params={"on_conflict": on_conflict},
+            json=data,
+            prefer=self._prefer(returning, f"resolution={resolution}"),
+        )
+        return self._write_result(response, returning)
+
+    async def update(
+        self,
+        table: str,
+        data: dict[str, Any],
+        filters: dict[str, Any],
+        returning: bool = True,
+    ) -> list[dict[str, Any]] | int:
+        response = await self._request(
+            "PATCH",
+            table,
+            "Update",
+            params=self._filters(filters),
+            json=data,
+            prefer=self._prefer(returning),
+        )
+        return self._write_result(response, returning)
+
+    async def delete(
+        self,
+        table: str,
+        filters: dict[str, Any],
+        returning: bool = True,
+    ) -> list[dict[str, Any]] | int:
+        response = await self._request(
+            "DELETE",
+            table,
+            "Delete",
+            params=self._filters(filters),
+            prefer=self._prefer(returning),
+        )
+        return self._write_result(response, returning)
+
+    # ── Private helpers ──────────────────────────────────
+
+    async def _request(
+        self,
+        method: str,
+        table: str,
+        operation: str,
+        params: dict[str, str] | None = None,
+        json: Any = None,
+        prefer: str | None = None,
+    ) -> httpx.Response:
+        headers = {"Prefer": prefer} if prefer else None
+        try:
+            response = await self._get_client().request(
+                method, f"/{table}", params=params, json=json, headers=headers
+            )
+            response.raise_for_status()
+            return response
+        except RepoError:
+            raise
+        except Exception as e:
+            raise RepoError(f"{operation} failed on {table}: {e}")
+
+    @staticmethod
+    def _filters(filters: dict[str, Any] | None) -> dict[str, str]:
+        params = {}
+        for key, value in (filters or {}).items():
+            if value is None:
+                params[key] = "is.null"
+            elif isinstance(value, bool):
+                params[key] = f"eq.{str(value).lower()}"
+            else:
+                params[key] = f"eq.{value}"
+        return params
+
+    @staticmethod
+    def _prefer(returning: bool, *extra: str) -> str:
+        options = ["return=representation"] if returning else ["return=minimal", "count=exact"]
+        return ",".join([*options, *extra])
+
+    @staticmethod
+    def _write_result(response: httpx.Response, returning: bool) -> list[dict[str, Any]] | int:
+        if returning:
+            return response.json() if response.content else []
+        # Content-Range: "*/42" or "0-41/42"
+        total = response.headers.get("content-range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else 0
+
+
+_async_supabase_client: AsyncSupabaseClient | None = None
+
+
+def get_async_supabase_client() -> AsyncSupabaseClient:
+    global _async_supabase_client
+    if _async_supabase_client is None:
+        settings = get_settings()
+        _async_supabase_client = AsyncSupabaseClient(
+            url=settings.SUPABASE_URL,
+            key=settings.SUPABASE_SERVICE_ROLE_KEY,
+            schema=settings.SUPABASE_SCHEMA,
+            page_size=settings.SUPABASE_PAGE_SIZE,
+            max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPABASE_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY,
+            timeout=settings.SUPABASE_TIMEOUT,
+            http2=settings.SUPABASE_HTTP2,
+        )
+    return _async_supabase_client
+
+
+async def close_async_supabase_client() -> None:
+    global _async_supabase_client
+    if _async_supabase_client is not None:
+        await _async_supabase_client.close()
+        _async_supabase_client = None
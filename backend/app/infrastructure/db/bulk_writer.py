@@ -0,0 +1,159 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.errors import RepoError
+from app.core.logging import get_logger
+from app.infrastructure.db.supabase_client import SupabaseClient, is_transient
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ChunkFailure:
+    index: int
+    rows: int
+    error: str
+
+
+@dataclass
+class BulkWriteResult:
+    written: int = 0
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    failures: list[ChunkFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+class BulkWriter:
+    """Writes large row sets as bounded chunks sent concurrently.
+
+    Chunks hold at most `chunk_size` rows and about `max_chunk_bytes` of JSON.
+    Each chunk is inserted ignoring rows whose primary key already exists, so
+    retrying a chunk whose first attempt did reach the database neither
+    duplicates nor overwrites rows: rows must carry their `id`, which the
+    repositories already assign client-side. Only transient failures are
+    retried (see `is_transient`); a rejected chunk fails at once.
+    """
+
+    def __init__(
+        self,
+        db: SupabaseClient,
+        chunk_size: int = 500,
+        max_chunk_bytes: int = 1_000_000,
+        max_concurrency: int = 4,
+        max_retries: int = 2,
+        retry_delay: float = 0.5,
+    ):
+        self._db = db
+        self._chunk_size = chunk_size
+        self._max_chunk_bytes = max_chunk_bytes
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+
+    def write(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        returning: bool = True,
+    ) -> BulkWriteResult:
+        """Write every row; failed chunks are reported, not raised."""
+        chunks = self._split(rows)
+        result = BulkWriteResult()
+        if not chunks:
+            return result
+
+        workers = min(self._max_concurrency, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(
+                pool.map(lambda chunk: self._write_chunk(table, chunk, returning), chunks)
+            )
+
+        for index, (chunk, outcome) in enumerate(zip(chunks, outcomes, strict=True)):
+            if isinstance(outcome, Exception):
+                result.failures.append(ChunkFailure(index, len(chunk), str(outcome)))
+                continue
+            result.written += len(chunk)
+            if isinstance(outcome, list):
+                result.rows.extend(outcome)
+        if result.failures:
+            logger.warning(
+                f"Bulk write on {table}: {len(result.failures)}/{len(chunks)} chunk(s) failed"
+            )
+        return result
+
+    def write_or_raise(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        returning: bool = True,
+    ) -> BulkWriteResult:
+        result = self.write(table, rows, returning)
+        if not result.ok:
+            raise RepoError(
+                f"Bulk write failed on {table}: {len(result.failures)} chunk(s) not written",
+                details={
+                    "written": result.written,
+                    "failed_chunks": [vars(f) for f in result.failures],
+                },
+            )
+        return result
+
+    # ── Private helpers ──────────────────────────────────
+
+    def _split(self, rows: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        chunks: list[list[dict[str, Any]]] = []
+        current: list[dict[str, Any]] = []
+        size = 0
+        for row in rows:
+            row_size = len(json.dumps(row, default=str))
+            if current and (
+                len(current) >= self._chunk_size or size + row_size > self._max_chunk_bytes
+            ):
+                chunks.append(current)
+                current, size = [], 0
+            current.append(row)
+            size += row_size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _write_chunk(
+        self,
+        table: str,
+        chunk: list[dict[str, Any]],
+        returning: bool,
+    ) -> list[dict[str, Any]] | int | Exception:
+        attempt = 0
+        while True:
+            try:
+                if returning:
+                    written = self._db.upsert(table, chunk, ignore_duplicates=True)
+                    if attempt and len(written) < len(chunk):
+                        # Rows stored by an attempt whose reply was lost are not echoed back.
+                        echoed = {r["id"] for r in written}
+                        written += [r for r in chunk if r["id"] not in echoed]
+                    return written
+                return self._db.upsert(table, chunk, returning=False, ignore_duplicates=True)
+            except RepoError as e:
+                if attempt >= self._max_retries or not is_transient(e):
+                    return e
+                time.sleep(self._retry_delay * 2**attempt)
+                attempt += 1
+
+
+def create_bulk_writer(db: SupabaseClient) -> BulkWriter:
+    settings = get_settings()
+    return BulkWriter(
+        db,
+        chunk_size=settings.DB_WRITE_CHUNK_SIZE,
+        max_chunk_bytes=settings.DB_WRITE_MAX_CHUNK_BYTES,
+        max_concurrency=settings.DB_WRITE_MAX_CONCURRENCY,
+        max_retries=settings.DB_WRITE_MAX_RETRIES,
+    )
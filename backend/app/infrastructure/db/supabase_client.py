@@ -1,14 +1,60 @@
-from typing import Any
+from collections.abc import Iterator
+from typing import Any, Literal, overload
+
+import httpx
 
 from app.core.config import get_settings
 from app.core.errors import RepoError
 
+# SQLSTATE classes worth retrying: connection, transaction rollback (deadlock,
+# serialization), insufficient resources, operator intervention, system error.
+_TRANSIENT_SQLSTATE_CLASSES = ("08", "40", "53", "57", "58")
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed request may succeed as is on retry.
+
+    True for transport errors and timeouts, HTTP 429/5xx and PostgREST
+    connection errors; False for constraint violations, bad payloads, auth
+    failures and other client errors. A `RepoError` is judged by its cause.
+    """
+    if isinstance(error, RepoError):
+        cause = error.__cause__ or error.__context__
+        return cause is not None and is_transient(cause)
+    if isinstance(error, httpx.TransportError | ConnectionError | TimeoutError):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        # postgrest reports the HTTP status when the error body is not JSON.
+        return code == 429 or code >= 500
+    if isinstance(code, str):
+        return code.startswith("PGRST00") or code[:2] in _TRANSIENT_SQLSTATE_CLASSES
+    return False
+
+
+def keyset_filter(keys: tuple[str, ...], last: tuple[Any, ...]) -> str:
+    """PostgREST `or` condition matching the rows after `last` in `keys` order."""
+    values = [_quote(v) for v in last]
+    clauses = []
+    for i, name in enumerate(keys):
+        terms = [f"{k}.eq.{v}" for k, v in zip(keys[:i], values[:i], strict=True)]
+        terms.append(f"{name}.gt.{values[i]}")
+        clauses.append(f"and({','.join(terms)})" if i else terms[0])
+    return ",".join(clauses)
+
+
+def _quote(value: Any) -> str:
+    """Double-quote a filter value so `,`, `.` and `:` in it are taken literally."""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
 
 class SupabaseClient:
-    def __init__(self, url: str, key: str, schema: str = "public"):
+    def __init__(self, url: str, key: str, schema: str = "public", page_size: int = 1000):
         self._url = url
         self._key = key
         self._schema = schema
+        self._page_size = page_size
         self._client: Any = None
 
     def _get_client(self) -> Any:
@@ -52,6 +98,47 @@ class SupabaseClient:
         except Exception as e:
             raise RepoError(f"Select failed on {table}: {e}")
 
+    def select_iter(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: dict[str, Any] | None = None,
+        key: str | tuple[str, ...] = "id",
+        page_size: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every matching row, fetched page by page with keyset pagination.
+
+        Pages are ordered by `key`, a column or a tuple of columns (such as
+        `("created_at", "id")`) that must be unique within the filtered rows
+        and indexed; each page starts after the last key of the previous one,
+        so the cost per page stays constant whatever the table size. The last
+        page is always followed by an empty one.
+        """
+        keys = (key,) if isinstance(key, str) else key
+        size = page_size or self._page_size
+        last: tuple[Any, ...] | None = None
+        while True:
+            try:
+                query = self.table(table).select(columns)
+                for name, value in (filters or {}).items():
+                    query = query.eq(name, value)
+                if last is not None:
+                    if len(keys) == 1:
+                        query = query.gt(keys[0], last[0])
+                    else:
+                        query = query.or_(keyset_filter(keys, last))
+                for name in keys:
+                    query = query.order(name)
+                rows = query.limit(size).execute().data or []
+            except Exception as e:
+                raise RepoError(f"Select failed on {table}: {e}")
+            # PostgREST's max-rows may cut a page below `size`: only an empty
+            # page proves the end.
+            if not rows:
+                return
+            yield from rows
+            last = tuple(rows[-1][name] for name in keys)
+
     def select_one(
         self,
         table: str,
@@ -61,46 +148,157 @@ class SupabaseClient:
         results = self.select(table, columns, filters, limit=1)
         return results[0] if results else None
 
+    @overload
     def insert(
         self,
         table: str,
         data: dict[str, Any] | list[dict[str, Any]],
-    ) -> list[dict[str, Any]]:
+        returning: Literal[True] = ...,
+    ) -> list[dict[str, Any]]: ...
+
+    @overload
+    def insert(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        returning: Literal[False],
+    ) -> int: ...
+
+    def insert(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        returning: bool = True,
+    ) -> list[dict[str, Any]] | int:
+        """Insert rows and return them, or only their count when `returning` is False."""
         try:
-            response = self.table(table).insert(data).execute()
-            return response.data or []
+            query = self.table(table).insert(data, **self._write_options(returning))
+            return self._write_result(query.execute(), returning)
         except Exception as e:
             raise RepoError(f"Insert failed on {table}: {e}")
 
+    @overload
+    def upsert(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        on_conflict: str = ...,
+        returning: Literal[True] = ...,
+        ignore_duplicates: bool = ...,
+    ) -> list[dict[str, Any]]: ...
+
+    @overload
+    def upsert(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        on_conflict: str = ...,
+        *,
+        returning: Literal[False],
+        ignore_duplicates: bool = ...,
+    ) -> int: ...
+
+    def upsert(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        on_conflict: str = "id",
+        returning: bool = True,
+        ignore_duplicates: bool = False,
+    ) -> list[dict[str, Any]] | int:
+        """Insert or replace rows on `on_conflict`, or keep existing rows with
+        `ignore_duplicates` (conflicting rows are then neither written nor returned)."""
+        try:
+            query = self.table(table).upsert(
+                data,
+                on_conflict=on_conflict,
+                ignore_duplicates=ignore_duplicates,
+                **self._write_options(returning),
+            )
+            return self._write_result(query.execute(), returning)
+        except Exception as e:
+            raise RepoError(f"Upsert failed on {table}: {e}")
+
+    @overload
     def update(
         self,
         table: str,
         data: dict[str, Any],
         filters: dict[str, Any],
-    ) -> list[dict[str, Any]]:
+        returning: Literal[True] = ...,
+    ) -> list[dict[str, Any]]: ...
+
+    @overload
+    def update(
+        self,
+        table: str,
+        data: dict[str, Any],
+        filters: dict[str, Any],
+        returning: Literal[False],
+    ) -> int: ...
+
+    def update(
+        self,
+        table: str,
+        data: dict[str, Any],
+        filters: dict[str, Any],
+        returning: bool = True,
+    ) -> list[dict[str, Any]] | int:
         try:
-            query = self.table(table).update(data)
+            query = self.table(table).update(data, **self._write_options(returning))
             for key, value in filters.items():
                 query = query.eq(key, value)
-            response = query.execute()
-            return response.data or []
+            return self._write_result(query.execute(), returning)
         except Exception as e:
             raise RepoError(f"Update failed on {table}: {e}")
 
+    @overload
     def delete(
         self,
         table: str,
         filters: dict[str, Any],
-    ) -> list[dict[str, Any]]:
+        returning: Literal[True] = ...,
+    ) -> list[dict[str, Any]]: ...
+
+    @overload
+    def delete(
+        self,
+        table: str,
+        filters: dict[str, Any],
+        returning: Literal[False],
+    ) -> int: ...
+
+    def delete(
+        self,
+        table: str,
+        filters: dict[str, Any],
+        returning: bool = True,
+    ) -> list[dict[str, Any]] | int:
         try:
-            query = self.table(table).delete()
+            query = self.table(table).delete(**self._write_options(returning))
             for key, value in filters.items():
                 query = query.eq(key, value)
-            response = query.execute()
-            return response.data or []
+            return self._write_result(query.execute(), returning)
         except Exception as e:
             raise RepoError(f"Delete failed on {table}: {e}")
 
+    # ── Private helpers ──────────────────────────────────
+
+    @staticmethod
+    def _write_options(returning: bool) -> dict[str, Any]:
+        """PostgREST preferences: echo rows back, or only count them (`return=minimal`)."""
+        if returning:
+            return {}
+        from postgrest.types import CountMethod, ReturnMethod
+
+        return {"returning": ReturnMethod.minimal, "count": CountMethod.exact}
+
+    @staticmethod
+    def _write_result(response: Any, returning: bool) -> list[dict[str, Any]] | int:
+        if returning:
+            return response.data or []
+        return response.count or 0
+
 
 _supabase_client: SupabaseClient | None = None
 
@@ -113,6 +311,7 @@ def get_supabase_client() -> SupabaseClient:
             url=settings.SUPABASE_URL,
             key=settings.SUPABASE_SERVICE_ROLE_KEY,
             schema=settings.SUPABASE_SCHEMA,
+            page_size=settings.SUPABASE_PAGE_SIZE,
         )
     return _supabase_client
 
@@ -0,0 +1,70 @@
+"""Interfaces communes aux clients LLM (Groq, Ollama)."""
+
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class LLMProvider(Protocol):
+    """Surface synchrone partagée par `GroqClient` et `OllamaClient`."""
+
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+    ) -> str: ...
+
+    def generate_batch(
+        self,
+        prompts: list[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+        max_concurrency: int | None = None,
+    ) -> list[str]: ...
+
+    def is_available(self) -> bool: ...
+
+    def list_models(self) -> list[str]: ...
+
+
+@runtime_checkable
+class AsyncLLMProvider(Protocol):
+    """Surface asynchrone partagée par `AsyncGroqClient` et `AsyncOllamaClient`.
+
+    Toutes les méthodes s'exécutent sur la boucle d'événements de l'appelant :
+    un `generate_batch` de plusieurs milliers de prompts n'occupe aucun thread.
+    """
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+    ) -> str: ...
+
+    async def generate_batch(
+        self,
+        prompts: list[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+        max_concurrency: int | None = None,
+    ) -> list[str]: ...
+
+    async def is_available(self) -> bool: ...
+
+    async def list_models(self) -> list[str]: ...
+
+
+def build_messages(prompt: str, system_prompt: str | None) -> list[dict[str, str]]:
+    """Messages de chat : le prompt système éventuel, puis le prompt utilisateur."""
+    messages = []
+
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+
+    messages.append({"role": "user", "content": prompt})
+    return messages
@@ -0,0 +1,294 @@
+"""Cache persistant des réponses LLM, adressé par le contenu de la requête."""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.infrastructure.llm.base import AsyncLLMProvider
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed_at ON llm_cache (accessed_at);
+CREATE TABLE IF NOT EXISTS llm_cache_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO llm_cache_stats (id) VALUES (1);
+CREATE TABLE IF NOT EXISTS llm_parse_stats (
+    model TEXT NOT NULL,
+    method TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (model, method)
+);
+"""
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    system_prompt: str | None,
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    seed: int | None,
+) -> str:
+    """Empreinte SHA-256 de tout ce qui détermine la réponse du modèle."""
+    payload = [provider, model, system_prompt, prompt, temperature, max_tokens, seed]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """Réponses LLM stockées dans un fichier SQLite local partagé par les workers.
+
+    La taille totale des réponses est bornée par `max_bytes` : au-delà, les
+    entrées les moins récemment lues sont évincées. Les compteurs de hits et
+    de misses sont persistés avec les entrées, donc visibles de tout processus.
+
+    Une lecture ne prend pas le verrou d'écriture du fichier : la date d'accès
+    n'est rafraîchie que si elle a plus de `touch_interval` secondes, et les
+    compteurs sont cumulés en mémoire puis écrits tous les `flush_every`
+    lookups (ou par `flush_stats`).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256_000_000,
+        evict_every: int = 100,
+        touch_interval: float = 60.0,
+        flush_every: int = 100,
+    ):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._evict_every = evict_every
+        self._touch_interval = touch_interval
+        self._flush_every = flush_every
+        self._writes = 0
+        self._pending = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            # Le mode WAL est une propriété du fichier : fixé une fois pour toutes.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT response, accessed_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] >= self._touch_interval:
+                conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        finally:
+            conn.close()
+        self._count("misses" if row is None else "hits")
+        return None if row is None else row[0]
+
+    def set(self, key: str, response: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, size, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, len(response.encode()), time.time()),
+            )
+            self._writes += 1
+            if self._writes % self._evict_every == 0:
+                self._evict(conn)
+        finally:
+            conn.close()
+
+    def flush_stats(self) -> None:
+        """Écrit les compteurs cumulés en mémoire par ce processus."""
+        with self._lock:
+            hits, misses = self._pending["hits"], self._pending["misses"]
+            self._pending = {"hits": 0, "misses": 0}
+        if not hits and not misses:
+            return
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE llm_cache_stats SET hits = hits + ?, misses = misses + ? WHERE id = 1",
+                (hits, misses),
+            )
+        finally:
+            conn.close()
+
+    def stats(self) -> dict[str, Any]:
+        self.flush_stats()
+        conn = self._connect()
+        try:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            hits, misses = conn.execute(
+                "SELECT hits, misses FROM llm_cache_stats WHERE id = 1"
+            ).fetchone()
+        finally:
+            conn.close()
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def record_parsing(self, methods_by_model: dict[str, dict[str, int]]) -> None:
+        """Ajoute les réponses d'un run, par modèle et étape du parseur qui les a lues."""
+        rows = [
+            (model, method, count)
+            for model, methods in methods_by_model.items()
+            for method, count in methods.items()
+            if count
+        ]
+        if not rows:
+            return
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "INSERT INTO llm_parse_stats (model, method, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (model, method) DO UPDATE SET count = count + excluded.count",
+                rows,
+            )
+        finally:
+            conn.close()
+
+    def parse_stats(self) -> dict[str, dict[str, int]]:
+        """Cumul de `record_parsing` sur tous les workers."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT model, method, count FROM llm_parse_stats ORDER BY model, method"
+            ).fetchall()
+        finally:
+            conn.close()
+        methods_by_model: dict[str, dict[str, int]] = {}
+        for model, method, count in rows:
+            methods_by_model.setdefault(model, {})[method] = count
+        return methods_by_model
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._pending[name] += 1
+            due = sum(self._pending.values()) >= self._flush_every
+        if due:
+            self.flush_stats()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS total "
+            "FROM llm_cache) WHERE total > ?)",
+            (self._max_bytes,),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30, isolation_level=None)
+
+
+class CachedLLMClient:
+    """`AsyncLLMProvider` servant depuis `LLMResponseCache` les requêtes déjà vues.
+
+    La clé inclut le fournisseur, le modèle, les deux prompts, les paramètres
+    d'échantillonnage et la graine du sondage : une relance à l'identique ne
+    repaie aucun appel. Seules les réponses obtenues sont mises en cache, pas
+    les erreurs, ni les réponses que `accept(prompt, réponse)` juge
+    inexploitables : une relance après un échec les redemande au modèle.
+    """
+
+    def __init__(
+        self,
+        inner: AsyncLLMProvider,
+        cache: LLMResponseCache,
+        provider: str,
+        model: str,
+        seed: int | None = None,
+        max_concurrency: int = 8,
+        accept: Callable[[str, str], bool] | None = None,
+    ):
+        self._inner = inner
+        self._cache = cache
+        self._accept = accept
+        self._provider = provider
+        self._model = model
+        self._seed = seed
+        self._max_concurrency = max_concurrency
+        self.hits = 0
+        self.misses = 0
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+    ) -> str:
+        key = cache_key(
+            self._provider,
+            self._model,
+            system_prompt,
+            prompt,
+            temperature,
+            max_tokens,
+            self._seed,
+        )
+        cached = await asyncio.to_thread(self._cache.get, key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        response = await self._inner.generate(prompt, system_prompt, temperature, max_tokens)
+        if self._accept is None or self._accept(prompt, response):
+            await asyncio.to_thread(self._cache.set, key, response)
+        return response
+
+    async def generate_batch(
+        self,
+        prompts: list[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+        max_concurrency: int | None = None,
+    ) -> list[str]:
+        semaphore = asyncio.Semaphore(max_concurrency or self._max_concurrency)
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.generate(prompt, system_prompt, temperature, max_tokens)
+
+        return list(await asyncio.gather(*(run(p) for p in prompts)))
+
+    async def is_available(self) -> bool:
+        return await self._inner.is_available()
+
+    async def list_models(self) -> list[str]:
+        return await self._inner.list_models()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
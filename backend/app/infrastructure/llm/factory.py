@@ -0,0 +1,105 @@
+"""Construction des clients LLM asynchrones à partir de la configuration."""
+
+from functools import lru_cache
+
+from app.core.config import get_settings
+from app.infrastructure.llm.base import AsyncLLMProvider
+from app.infrastructure.llm.cache import LLMResponseCache
+from app.infrastructure.llm.groq_client import AsyncGroqClient, GroqConfig
+from app.infrastructure.llm.ollama_client import AsyncOllamaClient, OllamaConfig
+from app.infrastructure.llm.router import CircuitBreaker, LLMRouter, RoutedProvider
+
+
+@lru_cache
+def get_async_llm_client(model: str) -> AsyncLLMProvider:
+    """Renvoie le client du fournisseur configuré pour `model`.
+
+    Les clients sont mis en cache par modèle : les simulations concurrentes
+    partagent ainsi le même pool HTTP et le même budget RPM/TPM. En mode
+    `router`, tous les modèles partagent le même routeur.
+    """
+    settings = get_settings()
+    if settings.LLM_PROVIDER == "router":
+        return get_llm_router()
+    if settings.LLM_PROVIDER == "ollama":
+        return _ollama_client(settings.OLLAMA_HOST, model)
+    return _groq_client(model)
+
+
+@lru_cache
+def get_llm_router() -> LLMRouter:
+    """Routeur sur Groq (si une clé est configurée) et chaque hôte Ollama.
+
+    Un même nom de modèle ne désigne pas le même modèle chez les deux
+    fournisseurs : chacun utilise son modèle configuré (`GROQ_MODEL`,
+    `OLLAMA_MODEL`). Groq n'y rejoue pas les 429 lui-même : l'appel bascule
+    sur un autre fournisseur, ou le routeur attend le `retry-after` quand
+    aucun autre n'est disponible.
+    """
+    settings = get_settings()
+
+    def breaker() -> CircuitBreaker:
+        return CircuitBreaker(
+            failure_threshold=settings.LLM_ROUTER_FAILURE_THRESHOLD,
+            reset_seconds=settings.LLM_ROUTER_RESET_SECONDS,
+        )
+
+    providers = []
+    if settings.GROQ_API_KEY:
+        providers.append(
+            RoutedProvider(
+                name="groq",
+                client=_groq_client(settings.GROQ_MODEL, max_retries=0),
+                model=settings.GROQ_MODEL,
+                max_concurrency=settings.GROQ_MAX_CONCURRENCY,
+                breaker=breaker(),
+            )
+        )
+    hosts = [settings.OLLAMA_HOST, *settings.OLLAMA_HOSTS.split(",")]
+    for host in dict.fromkeys(h.strip() for h in hosts if h.strip()):
+        providers.append(
+            RoutedProvider(
+                name=f"ollama:{host}",
+                client=_ollama_client(host, settings.OLLAMA_MODEL),
+                model=settings.OLLAMA_MODEL,
+                max_concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+                breaker=breaker(),
+            )
+        )
+    return LLMRouter(providers)
+
+
+@lru_cache
+def get_llm_cache() -> LLMResponseCache | None:
+    """Cache des réponses partagé par les runs, ou None s'il est désactivé."""
+    settings = get_settings()
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    return LLMResponseCache(settings.LLM_CACHE_PATH, max_bytes=settings.LLM_CACHE_MAX_BYTES)
+
+
+def _groq_client(model: str, max_retries: int = 5) -> AsyncGroqClient:
+    settings = get_settings()
+    return AsyncGroqClient(
+        GroqConfig(
+            api_key=settings.GROQ_API_KEY,
+            model=model,
+            max_concurrency=settings.GROQ_MAX_CONCURRENCY,
+            requests_per_minute=settings.GROQ_REQUESTS_PER_MINUTE or None,
+            tokens_per_minute=settings.GROQ_TOKENS_PER_MINUTE or None,
+            max_retries=max_retries,
+            json_mode=settings.LLM_JSON_MODE,
+        )
+    )
+
+
+def _ollama_client(host: str, model: str) -> AsyncOllamaClient:
+    settings = get_settings()
+    return AsyncOllamaClient(
+        OllamaConfig(
+            host=host,
+            model=model,
+            max_concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+            json_mode=settings.LLM_JSON_MODE,
+        )
+    )
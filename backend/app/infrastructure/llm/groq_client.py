@@ -1,8 +1,22 @@
 """Client Groq pour la génération de textes via LLM cloud."""
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Any
 
-from groq import Groq
+from groq import APIConnectionError, AsyncGroq, Groq
+
+from app.infrastructure.llm.base import build_messages
+from app.infrastructure.llm.rate_limit import (
+    RateLimiter,
+    backoff_delay,
+    estimate_tokens,
+    is_rate_limited,
+    retry_after_of,
+    status_code_of,
+)
 
 
 @dataclass
@@ -12,14 +26,31 @@ class GroqConfig:
     api_key: str = ""
     model: str = "llama-3.3-70b-versatile"
     timeout: float = 60.0
+    max_concurrency: int = 8
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    # Mode JSON natif de Groq : la réponse est garantie être un objet JSON valide.
+    json_mode: bool = False
 
 
 class GroqClient:
     """Client pour interagir avec l'API Groq."""
 
-    def __init__(self, config: GroqConfig | None = None):
+    def __init__(self, config: GroqConfig | None = None, client: Any = None):
         self._config = config or GroqConfig()
-        self._client = Groq(api_key=self._config.api_key)
+        # Les retries sont gérés ici pour que le backoff respecte le rate limiter.
+        self._client = client or Groq(
+            api_key=self._config.api_key,
+            timeout=self._config.timeout,
+            max_retries=0,
+        )
+        self._limiter = RateLimiter(
+            requests_per_minute=self._config.requests_per_minute,
+            tokens_per_minute=self._config.tokens_per_minute,
+        )
 
     def generate(
         self,
@@ -30,6 +61,9 @@ class GroqClient:
     ) -> str:
         """Génère du texte avec le modèle configuré.
 
+        Les appels respectent les budgets RPM/TPM configurés et sont rejoués
+        avec backoff exponentiel sur 429, erreurs 5xx et erreurs réseau.
+
         Args:
             prompt: Le prompt utilisateur
             system_prompt: Instructions système optionnelles
@@ -39,21 +73,33 @@ class GroqClient:
         Returns:
             Le texte généré
         """
-        messages = []
-
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-
-        messages.append({"role": "user", "content": prompt})
-
-        response = self._client.chat.completions.create(
-            model=self._config.model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
+        messages = build_messages(prompt, system_prompt)
+        estimated = estimate_tokens(system_prompt, prompt, max_tokens=max_tokens)
+        attempt = 0
+        while True:
+            self._limiter.acquire(estimated)
+            try:
+                response = self._client.chat.completions.create(
+                    model=self._config.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **_format_options(self._config),
+                )
+            except Exception as e:
+                if attempt >= self._config.max_retries or not _is_retryable(e):
+                    raise
+                delay = _retry_delay(self._config, e, attempt)
+                if is_rate_limited(e):
+                    self._limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
+                continue
 
-        return response.choices[0].message.content or ""
+            usage = getattr(response, "usage", None)
+            self._limiter.record_usage(estimated, getattr(usage, "total_tokens", None))
+            return response.choices[0].message.content or ""
 
     def generate_batch(
         self,
@@ -61,28 +107,36 @@ class GroqClient:
         system_prompt: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 256,
+        max_concurrency: int | None = None,
     ) -> list[str]:
-        """Génère du texte pour plusieurs prompts.
+        """Génère du texte pour plusieurs prompts, en parallèle.
 
         Args:
             prompts: Liste de prompts
             system_prompt: Instructions système optionnelles
             temperature: Contrôle la créativité
             max_tokens: Nombre max de tokens par réponse
+            max_concurrency: Nombre max d'appels simultanés (défaut : config)
 
         Returns:
-            Liste des textes générés
+            Liste des textes générés, dans l'ordre des prompts
         """
-        results = []
-        for prompt in prompts:
-            text = self.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
+        if not prompts:
+            return []
+
+        workers = min(max_concurrency or self._config.max_concurrency, len(prompts))
+        if workers <= 1:
+            return [
+                self.generate(prompt, system_prompt, temperature, max_tokens) for prompt in prompts
+            ]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="groq") as pool:
+            return list(
+                pool.map(
+                    lambda prompt: self.generate(prompt, system_prompt, temperature, max_tokens),
+                    prompts,
+                )
             )
-            results.append(text)
-        return results
 
     def is_available(self) -> bool:
         """Vérifie si l'API Groq est disponible."""
@@ -99,3 +153,112 @@ class GroqClient:
             return [model.id for model in response.data]
         except Exception:
             return []
+
+
+class AsyncGroqClient:
+    """Client asynchrone pour l'API Groq, basé sur `groq.AsyncGroq`."""
+
+    def __init__(self, config: GroqConfig | None = None, client: Any = None):
+        self._config = config or GroqConfig()
+        self._client = client or AsyncGroq(
+            api_key=self._config.api_key,
+            timeout=self._config.timeout,
+            max_retries=0,
+        )
+        self._limiter = RateLimiter(
+            requests_per_minute=self._config.requests_per_minute,
+            tokens_per_minute=self._config.tokens_per_minute,
+        )
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+    ) -> str:
+        """Génère du texte avec le modèle configuré (voir `GroqClient.generate`)."""
+        messages = build_messages(prompt, system_prompt)
+        estimated = estimate_tokens(system_prompt, prompt, max_tokens=max_tokens)
+        attempt = 0
+        while True:
+            await self._limiter.acquire_async(estimated)
+            try:
+                response = await self._client.chat.completions.create(
+                    model=self._config.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **_format_options(self._config),
+                )
+            except Exception as e:
+                if attempt >= self._config.max_retries or not _is_retryable(e):
+                    raise
+                delay = _retry_delay(self._config, e, attempt)
+                if is_rate_limited(e):
+                    self._limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            usage = getattr(response, "usage", None)
+            self._limiter.record_usage(estimated, getattr(usage, "total_tokens", None))
+            return response.choices[0].message.content or ""
+
+    async def generate_batch(
+        self,
+        prompts: list[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+        max_concurrency: int | None = None,
+    ) -> list[str]:
+        """Génère du texte pour plusieurs prompts sur la boucle courante.
+
+        Returns:
+            Liste des textes générés, dans l'ordre des prompts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self._config.max_concurrency)
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.generate(prompt, system_prompt, temperature, max_tokens)
+
+        return list(await asyncio.gather(*(run(p) for p in prompts)))
+
+    async def is_available(self) -> bool:
+        """Vérifie si l'API Groq est disponible."""
+        try:
+            await self._client.models.list()
+            return True
+        except Exception:
+            return False
+
+    async def list_models(self) -> list[str]:
+        """Liste les modèles disponibles."""
+        try:
+            response = await self._client.models.list()
+            return [model.id for model in response.data]
+        except Exception:
+            return []
+
+
+def _format_options(config: GroqConfig) -> dict[str, Any]:
+    if not config.json_mode:
+        return {}
+    return {"response_format": {"type": "json_object"}}
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, APIConnectionError):
+        return True
+    status = status_code_of(exc)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def _retry_delay(config: GroqConfig, exc: Exception, attempt: int) -> float:
+    retry_after = retry_after_of(exc)
+    if retry_after is not None:
+        return min(retry_after, config.backoff_max)
+    return backoff_delay(attempt, config.backoff_base, config.backoff_max)
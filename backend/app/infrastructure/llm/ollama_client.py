@@ -1,9 +1,14 @@
 """Client Ollama pour la génération de textes via LLM local."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Any
 
 import ollama
 
+from app.infrastructure.llm.base import build_messages
+
 
 @dataclass
 class OllamaConfig:
@@ -12,14 +17,17 @@ class OllamaConfig:
     host: str = "http://localhost:11434"
     model: str = "qwen2.5:latest"
     timeout: float = 60.0
+    max_concurrency: int = 1
+    # Sortie contrainte par la grammaire JSON d'Ollama (`format="json"`).
+    json_mode: bool = False
 
 
 class OllamaClient:
     """Client pour interagir avec Ollama en local."""
 
-    def __init__(self, config: OllamaConfig | None = None):
+    def __init__(self, config: OllamaConfig | None = None, client: Any = None):
         self._config = config or OllamaConfig()
-        self._client = ollama.Client(host=self._config.host)
+        self._client = client or ollama.Client(host=self._config.host)
 
     def generate(
         self,
@@ -39,20 +47,14 @@ class OllamaClient:
         Returns:
             Le texte généré
         """
-        messages = []
-
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-
-        messages.append({"role": "user", "content": prompt})
-
         response = self._client.chat(
             model=self._config.model,
-            messages=messages,
+            messages=build_messages(prompt, system_prompt),
             options={
                 "temperature": temperature,
                 "num_predict": max_tokens,
             },
+            **_format_options(self._config),
         )
 
         return response["message"]["content"]
@@ -63,6 +65,7 @@ class OllamaClient:
         system_prompt: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 256,
+        max_concurrency: int | None = None,
     ) -> list[str]:
         """Génère du texte pour plusieurs prompts.
 
@@ -71,20 +74,24 @@ class OllamaClient:
             system_prompt: Instructions système optionnelles
             temperature: Contrôle la créativité
             max_tokens: Nombre max de tokens par réponse
+            max_concurrency: Nombre max d'appels simultanés (défaut : config)
 
         Returns:
-            Liste des textes générés
+            Liste des textes générés, dans l'ordre des prompts
         """
-        results = []
-        for prompt in prompts:
-            text = self.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
+        workers = min(max_concurrency or self._config.max_concurrency, len(prompts))
+        if workers <= 1:
+            return [
+                self.generate(prompt, system_prompt, temperature, max_tokens) for prompt in prompts
+            ]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ollama") as pool:
+            return list(
+                pool.map(
+                    lambda prompt: self.generate(prompt, system_prompt, temperature, max_tokens),
+                    prompts,
+                )
             )
-            results.append(text)
-        return results
 
     def is_available(self) -> bool:
         """Vérifie si Ollama est disponible."""
@@ -101,3 +108,72 @@ class OllamaClient:
             return [model["name"] for model in response.get("models", [])]
         except Exception:
             return []
+
+
+class AsyncOllamaClient:
+    """Client asynchrone pour Ollama, basé sur `ollama.AsyncClient`."""
+
+    def __init__(self, config: OllamaConfig | None = None, client: Any = None):
+        self._config = config or OllamaConfig()
+        self._client = client or ollama.AsyncClient(host=self._config.host)
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+    ) -> str:
+        """Génère du texte avec le modèle configuré (voir `OllamaClient.generate`)."""
+        response = await self._client.chat(
+            model=self._config.model,
+            messages=build_messages(prompt, system_prompt),
+            options={
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
+            **_format_options(self._config),
+        )
+
+        return response["message"]["content"]
+
+    async def generate_batch(
+        self,
+        prompts: list[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+        max_concurrency: int | None = None,
+    ) -> list[str]:
+        """Génère du texte pour plusieurs prompts sur la boucle courante.
+
+        Returns:
+            Liste des textes générés, dans l'ordre des prompts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self._config.max_concurrency)
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.generate(prompt, system_prompt, temperature, max_tokens)
+
+        return list(await asyncio.gather(*(run(p) for p in prompts)))
+
+    async def is_available(self) -> bool:
+        """Vérifie si Ollama est disponible."""
+        try:
+            await self._client.list()
+            return True
+        except Exception:
+            return False
+
+    async def list_models(self) -> list[str]:
+        """Liste les modèles disponibles."""
+        try:
+            response = await self._client.list()
+            return [model["name"] for model in response.get("models", [])]
+        except Exception:
+            return []
+
+
+def _format_options(config: OllamaConfig) -> dict[str, Any]:
+    return {"format": "json"} if config.json_mode else {}
@@ -0,0 +1,146 @@
+"""Limiteurs de débit (token bucket) pour les appels LLM."""
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+class TokenBucket:
+    """Token bucket thread-safe à réservation.
+
+    Une réservation débite immédiatement le seau (qui peut devenir négatif)
+    et renvoie le délai d'attente nécessaire : les appelants sont ainsi
+    servis dans l'ordre d'arrivée, qu'ils attendent en synchrone ou en async.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._capacity = capacity
+        self._rate = refill_per_second
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    def reserve(self, amount: float) -> float:
+        """Réserve `amount` jetons et renvoie le délai d'attente en secondes."""
+        amount = min(amount, self._capacity)
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def adjust(self, amount: float) -> None:
+        """Corrige a posteriori une réservation (positif = jetons consommés en plus)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._capacity, self._tokens - amount)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+
+
+class RateLimiter:
+    """Combine un budget de requêtes/minute et de tokens/minute.
+
+    Un budget à `None` est illimité. `pause` suspend tous les appelants
+    (typiquement après un 429 portant un `retry-after`).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._requests = (
+            TokenBucket(requests_per_minute, requests_per_minute / 60.0, clock)
+            if requests_per_minute
+            else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute, tokens_per_minute / 60.0, clock)
+            if tokens_per_minute
+            else None
+        )
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Réserve une requête de `tokens` tokens et renvoie le délai à respecter."""
+        wait = 0.0
+        if self._requests is not None:
+            wait = max(wait, self._requests.reserve(1))
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._paused_until - self._clock())
+        return wait
+
+    def acquire(self, tokens: int) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record_usage(self, estimated: int, actual: int | None) -> None:
+        """Recale le budget TPM sur la consommation réelle renvoyée par l'API."""
+        if self._tokens is not None and actual is not None:
+            self._tokens.adjust(actual - estimated)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+def estimate_tokens(*texts: str | None, max_tokens: int = 0) -> int:
+    """Estimation grossière (≈ 4 caractères par token) du coût d'un appel."""
+    chars = sum(len(t) for t in texts if t)
+    return chars // 4 + 1 + max_tokens
+
+
+def status_code_of(exc: BaseException) -> int | None:
+    code = getattr(exc, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    return status_code_of(exc) == 429
+
+
+def retry_after_of(exc: BaseException) -> float | None:
+    """Lit l'en-tête `retry-after` d'une erreur HTTP, s'il est exploitable."""
+    response: Any = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Backoff exponentiel avec full jitter."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
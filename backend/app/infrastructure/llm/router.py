@@ -0,0 +1,324 @@
+"""Routage des appels LLM entre plusieurs fournisseurs (Groq, hôtes Ollama)."""
+
+import asyncio
+import copy
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.infrastructure.llm.base import AsyncLLMProvider
+from app.infrastructure.llm.rate_limit import backoff_delay, retry_after_of, status_code_of
+
+# Poids des nouvelles mesures dans les moyennes mobiles de latence et d'erreurs.
+_EWMA_ALPHA = 0.2
+
+
+class NoProviderAvailableError(RuntimeError):
+    """Tous les fournisseurs ont échoué ou ont leur disjoncteur ouvert."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Panne du fournisseur (réseau, délai, 429, 5xx) plutôt que de la requête.
+
+    Une requête refusée (400 pour un prompt trop long, par exemple) le serait
+    par tous les fournisseurs : elle ne doit ni basculer ni ouvrir de disjoncteur.
+    """
+    status = status_code_of(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    cause: BaseException | None = exc
+    while cause is not None:
+        # Les SDK (Groq, Ollama) enveloppent l'erreur httpx d'origine.
+        if isinstance(cause, (httpx.TransportError, ConnectionError, TimeoutError)):
+            return True
+        cause = cause.__cause__
+    return False
+
+
+class CircuitBreaker:
+    """Disjoncteur : ouvert après `failure_threshold` échecs consécutifs.
+
+    Une fois `reset_seconds` écoulées, un seul appel d'essai est laissé passer
+    (état semi-ouvert) : son succès referme le disjoncteur, son échec le rouvre.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self._reset_seconds:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        """Secondes avant le prochain appel d'essai, 0 si le disjoncteur est fermé."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._reset_seconds - self._clock())
+
+    def allows(self) -> bool:
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._probing)
+
+    def on_acquire(self) -> None:
+        if self.state == "half_open":
+            self._probing = True
+
+    def on_release(self) -> None:
+        # Un appel d'essai annulé ne doit pas bloquer le semi-ouvert indéfiniment.
+        self._probing = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+        self._probing = False
+
+
+@dataclass
+class RoutedProvider:
+    """Un fournisseur derrière le routeur, avec son plafond d'appels simultanés."""
+
+    name: str
+    client: AsyncLLMProvider
+    model: str = ""
+    max_concurrency: int = 1
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    in_flight: int = 0
+    latency: float = 0.0
+    error_rate: float = 0.0
+
+    def score(self) -> float:
+        """Coût estimé d'un appel de plus ici : plus bas, meilleur."""
+        load = 1 + self.in_flight / self.max_concurrency
+        return (self.latency + 0.05) * load / max(0.05, 1 - self.error_rate)
+
+    def record(self, latency: float | None) -> None:
+        failed = latency is None
+        self.error_rate += _EWMA_ALPHA * (float(failed) - self.error_rate)
+        if failed:
+            self.breaker.record_failure()
+            return
+        if self.latency == 0.0:
+            self.latency = latency
+        else:
+            self.latency += _EWMA_ALPHA * (latency - self.latency)
+        self.breaker.record_success()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "model": self.model,
+            "state": self.breaker.state,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "latency_ms": round(self.latency * 1000, 1),
+            "error_rate": round(self.error_rate, 3),
+        }
+
+
+class LLMRouter:
+    """`AsyncLLMProvider` répartissant les appels entre plusieurs fournisseurs.
+
+    Chaque appel part vers le fournisseur disponible au meilleur score
+    (latence moyenne, charge courante, taux d'erreurs récent) qui a encore
+    une place sous son plafond ; quand tous sont pleins, il attend qu'une
+    place se libère. En cas d'échec passager (`is_transient`), l'appel est
+    rejoué sur le fournisseur suivant, chacun n'étant essayé qu'une fois par
+    tour ; les autres erreurs remontent telles quelles. Les fournisseurs au
+    disjoncteur ouvert sont écartés jusqu'à leur appel d'essai. Quand plus
+    aucun n'est disponible, le routeur attend (`retry-after`, fin du délai du
+    disjoncteur ou backoff) et recommence, jusqu'à `max_retries` fois.
+    """
+
+    def __init__(
+        self,
+        providers: list[RoutedProvider],
+        clock: Callable[[], float] = time.perf_counter,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self._providers = providers
+        self._clock = clock
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._released = asyncio.Condition()
+        self._clients = {p.name: p.client for p in providers}
+        self._requests: Counter[str] = Counter()
+        self._failures: Counter[str] = Counter()
+        self._served_by: dict[int, str] | None = None
+
+    @property
+    def providers(self) -> list[RoutedProvider]:
+        return self._providers
+
+    def session(
+        self, wrap: Callable[[RoutedProvider], AsyncLLMProvider] | None = None
+    ) -> "LLMRouter":
+        """Vue du routeur pour un run : mêmes places, disjoncteurs et mesures.
+
+        La vue compte ses propres appels, donc `stats()` ne couvre que ce run,
+        et retient quel modèle a répondu à chaque requête (`served_by`).
+        Avec `wrap`, chaque fournisseur est appelé à travers `wrap(provider)`,
+        par exemple un cache propre au modèle qu'il sert.
+        """
+        view = copy.copy(self)
+        view._clients = {p.name: wrap(p) if wrap else p.client for p in self._providers}
+        view._requests = Counter()
+        view._failures = Counter()
+        view._served_by = {}
+        return view
+
+    def served_by(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+    ) -> str | None:
+        """Modèle qui a répondu à cette requête dans la vue, None s'il est inconnu."""
+        if self._served_by is None:
+            return None
+        return self._served_by.get(hash((prompt, system_prompt, temperature, max_tokens)))
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+    ) -> str:
+        tried: set[str] = set()
+        last_error: Exception | None = None
+        attempt = 0
+        while True:
+            provider = await self._acquire(tried)
+            if provider is None:
+                if not self._providers or attempt >= self._max_retries:
+                    break
+                await asyncio.sleep(self._retry_delay(last_error, attempt))
+                attempt += 1
+                tried.clear()
+                continue
+            tried.add(provider.name)
+            self._requests[provider.name] += 1
+            start = self._clock()
+            try:
+                response = await self._clients[provider.name].generate(
+                    prompt, system_prompt, temperature, max_tokens
+                )
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                self._failures[provider.name] += 1
+                provider.record(None)
+                last_error = e
+                continue
+            else:
+                provider.record(self._clock() - start)
+                if self._served_by is not None:
+                    # Une empreinte suffit : les prompts restent hors de la mémoire du run.
+                    key = hash((prompt, system_prompt, temperature, max_tokens))
+                    self._served_by[key] = provider.model or provider.name
+                return response
+            finally:
+                await self._release(provider)
+        if last_error is not None:
+            raise last_error
+        raise NoProviderAvailableError("No LLM provider available (all circuits open)")
+
+    async def generate_batch(
+        self,
+        prompts: list[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+        max_concurrency: int | None = None,
+    ) -> list[str]:
+        """Génère du texte pour plusieurs prompts, bornés par les plafonds du routeur."""
+        semaphore = asyncio.Semaphore(
+            max_concurrency or sum(p.max_concurrency for p in self._providers)
+        )
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.generate(prompt, system_prompt, temperature, max_tokens)
+
+        return list(await asyncio.gather(*(run(p) for p in prompts)))
+
+    async def is_available(self) -> bool:
+        for provider in self._providers:
+            if provider.breaker.allows() and await provider.client.is_available():
+                return True
+        return False
+
+    async def list_models(self) -> list[str]:
+        models: list[str] = []
+        for provider in self._providers:
+            models.extend(m for m in await provider.client.list_models() if m not in models)
+        return models
+
+    def stats(self) -> dict[str, Any]:
+        providers = {}
+        for p in self._providers:
+            client_stats = getattr(self._clients[p.name], "stats", None)
+            providers[p.name] = {
+                **p.stats(),
+                "requests": self._requests[p.name],
+                "failures": self._failures[p.name],
+                **(client_stats() if client_stats else {}),
+            }
+        return {"providers": providers}
+
+    def _retry_delay(self, error: Exception | None, attempt: int) -> float:
+        """Attente avant un nouveau tour, quand aucun fournisseur n'est disponible."""
+        retry_after = retry_after_of(error) if error is not None else None
+        if retry_after is None:
+            retry_after = backoff_delay(attempt, self._backoff_base, self._backoff_max)
+        reopens_in = min(p.breaker.retry_in() for p in self._providers)
+        return min(max(retry_after, reopens_in), self._backoff_max)
+
+    async def _acquire(self, tried: set[str]) -> RoutedProvider | None:
+        async with self._released:
+            while True:
+                candidates = [
+                    p for p in self._providers if p.name not in tried and p.breaker.allows()
+                ]
+                if not candidates:
+                    return None
+                free = [p for p in candidates if p.in_flight < p.max_concurrency]
+                if free:
+                    provider = min(free, key=RoutedProvider.score)
+                    provider.in_flight += 1
+                    provider.breaker.on_acquire()
+                    return provider
+                await self._released.wait()
+
+    async def _release(self, provider: RoutedProvider) -> None:
+        async with self._released:
+            provider.in_flight -= 1
+            provider.breaker.on_release()
+            self._released.notify_all()
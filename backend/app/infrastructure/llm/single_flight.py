@@ -0,0 +1,92 @@
+"""Déduplication des appels LLM identiques en cours (*single-flight*)."""
+
+import asyncio
+from typing import Any
+
+from app.infrastructure.llm.base import AsyncLLMProvider
+from app.infrastructure.llm.rate_limit import estimate_tokens
+
+_Key = tuple[str | None, str, float, int]
+
+
+class SingleFlightLLMClient:
+    """`AsyncLLMProvider` qui fusionne les requêtes identiques simultanées.
+
+    Des agents aux traits discrets produisent souvent des prompts identiques
+    au sein d'un run : le premier appelant déclenche l'appel amont, les
+    suivants attendent le même résultat (ou la même exception) au lieu de
+    repayer l'appel. Seules les requêtes en vol sont fusionnées ; une requête
+    arrivant après la réponse repart en amont.
+    """
+
+    def __init__(self, inner: AsyncLLMProvider, max_concurrency: int = 8):
+        self._inner = inner
+        self._max_concurrency = max_concurrency
+        self._in_flight: dict[_Key, asyncio.Future[str]] = {}
+        self.requests = 0
+        self.upstream_calls = 0
+        self.tokens_saved = 0
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+    ) -> str:
+        self.requests += 1
+        key = (system_prompt, prompt, temperature, max_tokens)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.tokens_saved += estimate_tokens(system_prompt, prompt, max_tokens=max_tokens)
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.upstream_calls += 1
+        try:
+            response = await self._inner.generate(prompt, system_prompt, temperature, max_tokens)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Évite l'avertissement « exception never retrieved » sans attente.
+                future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            del self._in_flight[key]
+
+    async def generate_batch(
+        self,
+        prompts: list[str],
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 256,
+        max_concurrency: int | None = None,
+    ) -> list[str]:
+        semaphore = asyncio.Semaphore(max_concurrency or self._max_concurrency)
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.generate(prompt, system_prompt, temperature, max_tokens)
+
+        return list(await asyncio.gather(*(run(p) for p in prompts)))
+
+    async def is_available(self) -> bool:
+        return await self._inner.is_available()
+
+    async def list_models(self) -> list[str]:
+        return await self._inner.list_models()
+
+    def stats(self) -> dict[str, Any]:
+        deduplicated = self.requests - self.upstream_calls
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "dedup_ratio": round(deduplicated / self.requests, 3) if self.requests else 0.0,
+            "dedup_tokens_saved": self.tokens_saved,
+        }
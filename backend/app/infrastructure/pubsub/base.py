@@ -0,0 +1,23 @@
+from collections.abc import Awaitable, Callable
+from typing import Protocol
+
+MessageHandler = Callable[[str, str], Awaitable[None]]
+
+
+class Broker(Protocol):
+    """Pub/sub transport used by `RealtimeService` to reach every process.
+
+    A process publishes serialised events on a channel (the experiment ID) and
+    receives, through its handler, the events of the channels it subscribed to,
+    whichever process published them.
+    """
+
+    async def start(self, handler: MessageHandler) -> None: ...
+
+    async def close(self) -> None: ...
+
+    def subscribe(self, channel: str) -> None: ...
+
+    def unsubscribe(self, channel: str) -> None: ...
+
+    async def publish(self, channel: str, message: str) -> None: ...
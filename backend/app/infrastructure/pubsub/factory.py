@@ -0,0 +1,14 @@
+from app.core.config import get_settings
+from app.infrastructure.pubsub.base import Broker
+from app.infrastructure.pubsub.memory_broker import InProcessBroker
+from app.infrastructure.pubsub.sqlite_broker import SQLiteBroker
+
+
+def create_broker() -> Broker:
+    settings = get_settings()
+    if settings.REALTIME_BROKER == "sqlite":
+        return SQLiteBroker(
+            settings.REALTIME_BROKER_PATH,
+            poll_interval=settings.REALTIME_POLL_INTERVAL,
+        )
+    return InProcessBroker()
@@ -0,0 +1,25 @@
+from app.infrastructure.pubsub.base import MessageHandler
+
+
+class InProcessBroker:
+    """Delivers events to the publishing process only (single worker setups)."""
+
+    def __init__(self) -> None:
+        self._handler: MessageHandler | None = None
+        self._channels: set[str] = set()
+
+    async def start(self, handler: MessageHandler) -> None:
+        self._handler = handler
+
+    async def close(self) -> None:
+        self._handler = None
+
+    def subscribe(self, channel: str) -> None:
+        self._channels.add(channel)
+
+    def unsubscribe(self, channel: str) -> None:
+        self._channels.discard(channel)
+
+    async def publish(self, channel: str, message: str) -> None:
+        if self._handler is not None and channel in self._channels:
+            await self._handler(channel, message)
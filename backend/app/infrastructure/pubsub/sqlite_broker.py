@@ -0,0 +1,136 @@
+import asyncio
+import os
+import sqlite3
+import time
+
+from app.core.logging import get_logger
+from app.infrastructure.pubsub.base import MessageHandler
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_created_at ON events (created_at);
+"""
+
+
+class SQLiteBroker:
+    """Multi-process broker backed by an append-only SQLite event log.
+
+    Every process (API workers, survey workers) appends to the same local file
+    and tails it from the last event it has seen, keeping only the channels it
+    subscribed to. Old events are pruned after `retention_seconds`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        poll_interval: float = 0.05,
+        retention_seconds: float = 60.0,
+    ):
+        self._path = path
+        self._poll_interval = poll_interval
+        self._retention = retention_seconds
+        self._channels: set[str] = set()
+        self._handler: MessageHandler | None = None
+        self._task: asyncio.Task | None = None
+        self._last_id = 0
+        self._pruned_at = 0.0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    async def start(self, handler: MessageHandler) -> None:
+        if self._task is not None:
+            return
+        self._handler = handler
+        self._last_id = await asyncio.to_thread(self._max_id)
+        self._task = asyncio.create_task(self._tail())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self, channel: str) -> None:
+        self._channels.add(channel)
+
+    def unsubscribe(self, channel: str) -> None:
+        self._channels.discard(channel)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await asyncio.to_thread(self._insert, channel, message)
+
+    # ── Private helpers ──────────────────────────────────
+
+    async def _tail(self) -> None:
+        while True:
+            try:
+                rows = await asyncio.to_thread(self._read_since, self._last_id)
+                for event_id, channel, payload in rows:
+                    self._last_id = event_id
+                    if channel in self._channels and self._handler is not None:
+                        await self._handler(channel, payload)
+                if time.time() - self._pruned_at > self._retention:
+                    await asyncio.to_thread(self._prune)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Realtime broker poll failed")
+            await asyncio.sleep(self._poll_interval)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _insert(self, channel: str, message: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO events (channel, payload, created_at) VALUES (?, ?, ?)",
+                (channel, message, time.time()),
+            )
+        finally:
+            conn.close()
+
+    def _read_since(self, last_id: int) -> list[tuple[int, str, str]]:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT id, channel, payload FROM events WHERE id > ? ORDER BY id LIMIT 1000",
+                (last_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def _max_id(self) -> int:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT MAX(id) FROM events").fetchone()
+            return row[0] or 0
+        finally:
+            conn.close()
+
+    def _prune(self) -> None:
+        self._pruned_at = time.time()
+        cutoff = self._pruned_at - self._retention
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM events WHERE created_at < ?", (cutoff,))
+        finally:
+            conn.close()
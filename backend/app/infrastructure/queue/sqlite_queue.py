@@ -0,0 +1,295 @@
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from app.core.config import get_settings
+from app.core.errors import ConflictError, NotFoundError
+from app.domain.entities.job import Job
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    survey_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_available ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_survey ON jobs (survey_id, created_at);
+"""
+
+ACTIVE_STATUSES = ("queued", "leased")
+
+
+class SQLiteJobQueue:
+    """Durable job queue stored in a local SQLite file.
+
+    Safe to share between the API workers and any number of worker processes:
+    every state transition runs in its own `BEGIN IMMEDIATE` transaction, and a
+    job is owned by a worker only while its lease is valid. A worker that dies
+    simply lets its lease expire and the job is handed to another worker.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        retry_base_seconds: float = 5.0,
+        retry_max_seconds: float = 300.0,
+    ):
+        self._path = path
+        self._retry_base = retry_base_seconds
+        self._retry_max = retry_max_seconds
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    # ── Producer side ────────────────────────────────────
+
+    def enqueue(
+        self,
+        kind: str,
+        survey_id: str,
+        payload: dict[str, Any] | None = None,
+        max_attempts: int = 3,
+    ) -> Job:
+        now = time.time()
+        job_id = str(uuid4())
+        with self._transaction() as conn:
+            active = conn.execute(
+                "SELECT id FROM jobs WHERE survey_id = ? AND status IN (?, ?)",
+                (survey_id, *ACTIVE_STATUSES),
+            ).fetchone()
+            if active:
+                raise ConflictError(f"Survey {survey_id} already has an active job {active['id']}")
+            conn.execute(
+                "INSERT INTO jobs (id, kind, survey_id, status, payload, max_attempts,"
+                " available_at, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, kind, survey_id, json.dumps(payload or {}), max_attempts, now, now, now),
+            )
+            return self._fetch(conn, job_id)
+
+    def get(self, job_id: str) -> Job:
+        with self._transaction() as conn:
+            return self._fetch(conn, job_id)
+
+    def get_latest_for_survey(self, survey_id: str) -> Job | None:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE survey_id = ? ORDER BY created_at DESC LIMIT 1",
+                (survey_id,),
+            ).fetchone()
+            return self._to_entity(row) if row else None
+
+    def cancel(self, job_id: str) -> Job:
+        """Cancel a queued job at once, or ask the worker holding it to stop."""
+        now = time.time()
+        with self._transaction() as conn:
+            job = self._fetch(conn, job_id)
+            if job.status == "queued":
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', updated_at = ? WHERE id = ?",
+                    (now, job_id),
+                )
+            elif job.status == "leased":
+                conn.execute(
+                    "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ?",
+                    (now, job_id),
+                )
+            return self._fetch(conn, job_id)
+
+    # ── Worker side ──────────────────────────────────────
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Job | None:
+        """Atomically hand the oldest available job to `worker_id`."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs"
+                " WHERE (status = 'queued' AND available_at <= ?)"
+                " OR (status = 'leased' AND lease_expires_at <= ? AND attempts < max_attempts)"
+                " ORDER BY available_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires_at = ?,"
+                " attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, row["id"]),
+            )
+            return self._fetch(conn, row["id"])
+
+    def heartbeat(
+        self,
+        job_id: str,
+        worker_id: str,
+        lease_seconds: float,
+        progress_done: int | None = None,
+        progress_total: int | None = None,
+    ) -> bool:
+        """Extend the lease and record progress.
+
+        Returns False when the worker must stop: the job was cancelled or its
+        lease now belongs to another worker.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ?,"
+                " progress_done = COALESCE(?, progress_done),"
+                " progress_total = COALESCE(?, progress_total)"
+                " WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + lease_seconds, now, progress_done, progress_total, job_id, worker_id),
+            )
+            if cursor.rowcount == 0:
+                return False
+            row = conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            return not row["cancel_requested"]
+
+    def complete(self, job_id: str, worker_id: str) -> Job:
+        return self._finish(job_id, worker_id, "succeeded", None)
+
+    def mark_cancelled(self, job_id: str, worker_id: str) -> Job:
+        return self._finish(job_id, worker_id, "cancelled", None)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Job:
+        """Record a failed attempt; the job is re-queued with backoff while attempts remain."""
+        now = time.time()
+        with self._transaction() as conn:
+            job = self._fetch(conn, job_id)
+            if job.attempts < job.max_attempts and not job.cancel_requested:
+                delay = min(self._retry_max, self._retry_base * 2 ** (job.attempts - 1))
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', lease_owner = NULL,"
+                    " lease_expires_at = NULL, available_at = ?, last_error = ?, updated_at = ?"
+                    " WHERE id = ? AND lease_owner = ?",
+                    (now + delay, error, now, job_id, worker_id),
+                )
+                return self._fetch(conn, job_id)
+        return self._finish(job_id, worker_id, "failed", error)
+
+    def reap_expired(self) -> list[Job]:
+        """Fail jobs whose lease expired after their last allowed attempt."""
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'leased' AND lease_expires_at <= ?"
+                " AND (attempts >= max_attempts OR cancel_requested = 1)",
+                (now,),
+            ).fetchall()
+            reaped = []
+            for row in rows:
+                conn.execute(
+                    "UPDATE jobs SET status = CASE WHEN cancel_requested = 1"
+                    " THEN 'cancelled' ELSE 'failed' END,"
+                    " last_error = COALESCE(last_error, 'lease expired'),"
+                    " lease_owner = NULL, lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                    (now, row["id"]),
+                )
+                reaped.append(self._fetch(conn, row["id"]))
+            return reaped
+
+    # ── Private helpers ──────────────────────────────────
+
+    def _finish(self, job_id: str, worker_id: str, status: str, error: str | None) -> Job:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, last_error = COALESCE(?, last_error),"
+                " lease_owner = NULL, lease_expires_at = NULL, updated_at = ?"
+                " WHERE id = ? AND lease_owner = ?",
+                (status, error, now, job_id, worker_id),
+            )
+            return self._fetch(conn, job_id)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _fetch(self, conn: sqlite3.Connection, job_id: str) -> Job:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise NotFoundError(f"Job {job_id} not found")
+        return self._to_entity(row)
+
+    def _to_entity(self, row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            survey_id=row["survey_id"],
+            status=row["status"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            progress_done=row["progress_done"],
+            progress_total=row["progress_total"],
+            cancel_requested=bool(row["cancel_requested"]),
+            lease_owner=row["lease_owner"],
+            lease_expires_at=self._to_dt(row["lease_expires_at"]),
+            last_error=row["last_error"],
+            available_at=self._to_dt(row["available_at"]) or datetime.utcnow(),
+            created_at=self._to_dt(row["created_at"]) or datetime.utcnow(),
+            updated_at=self._to_dt(row["updated_at"]) or datetime.utcnow(),
+        )
+
+    @staticmethod
+    def _to_dt(value: float | None) -> datetime | None:
+        if value is None:
+            return None
+        return datetime.utcfromtimestamp(value)
+
+
+_job_queue: SQLiteJobQueue | None = None
+
+
+def get_job_queue() -> SQLiteJobQueue:
+    global _job_queue
+    if _job_queue is None:
+        settings = get_settings()
+        _job_queue = SQLiteJobQueue(settings.JOB_QUEUE_PATH)
+    return _job_queue
+
+
+def reset_job_queue() -> None:
+    global _job_queue
+    _job_queue = None
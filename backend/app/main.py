@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import router as v1_router
 from app.core.config import get_settings
+from app.core.dependencies import close_realtime_service
 from app.core.errors import (
     AppError,
     app_error_handler,
@@ -13,6 +14,7 @@ from app.core.errors import (
     http_exception_handler,
 )
 from app.core.logging import get_logger, setup_logging
+from app.infrastructure.db.async_supabase_client import close_async_supabase_client
 
 logger = get_logger(__name__)
 
@@ -24,6 +26,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"Starting {settings.APP_NAME} in {settings.ENV} mode")
     yield
     logger.info("Shutting down...")
+    await close_realtime_service()
+    await close_async_supabase_client()
 
 
 def create_app() -> FastAPI:
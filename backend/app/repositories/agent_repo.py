@@ -1,9 +1,11 @@
+from collections.abc import Iterator
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal, overload
 from uuid import uuid4
 
 from app.core.errors import NotFoundError, RepoError
 from app.domain.entities.agent import Agent
+from app.infrastructure.db.bulk_writer import create_bulk_writer
 from app.infrastructure.db.supabase_client import SupabaseClient
 
 
@@ -12,6 +14,7 @@ class AgentRepository:
 
     def __init__(self, db: SupabaseClient):
         self._db = db
+        self._writer = create_bulk_writer(db)
 
     def create_agent(self, data: dict[str, Any]) -> Agent:
         if "id" not in data:
@@ -23,16 +26,35 @@ class AgentRepository:
             raise RepoError("Failed to create agent")
         return self._to_entity(result[0])
 
-    def create_agents_batch(self, agents_data: list[dict[str, Any]]) -> list[Agent]:
+    @overload
+    def create_agents_batch(
+        self,
+        agents_data: list[dict[str, Any]],
+        returning: Literal[True] = ...,
+    ) -> list[Agent]: ...
+
+    @overload
+    def create_agents_batch(
+        self,
+        agents_data: list[dict[str, Any]],
+        *,
+        returning: Literal[False],
+    ) -> int: ...
+
+    def create_agents_batch(
+        self,
+        agents_data: list[dict[str, Any]],
+        returning: bool = True,
+    ) -> list[Agent] | int:
         for a in agents_data:
             if "id" not in a:
                 a["id"] = str(uuid4())
             if "created_at" not in a:
                 a["created_at"] = datetime.utcnow().isoformat()
-        result = self._db.insert(self.TABLE, agents_data)
-        if not result:
-            raise RepoError("Failed to create agents batch")
-        return [self._to_entity(r) for r in result]
+        result = self._writer.write_or_raise(self.TABLE, agents_data, returning=returning)
+        if not returning:
+            return result.written
+        return [self._to_entity(r) for r in result.rows]
 
     def get_agent(self, agent_id: str) -> Agent:
         row = self._db.select_one(self.TABLE, filters={"id": agent_id})
@@ -55,8 +77,22 @@ class AgentRepository:
         )
         return [self._to_entity(r) for r in rows]
 
-    def delete_agents_by_survey(self, survey_id: str) -> None:
-        self._db.delete(self.TABLE, filters={"survey_id": survey_id})
+    def iter_agents_by_survey(self, survey_id: str) -> Iterator[Agent]:
+        for row in self._db.select_iter(
+            self.TABLE, filters={"survey_id": survey_id}, key="agent_index"
+        ):
+            yield self._to_entity(row)
+
+    def iter_rows_by_survey(self, survey_id: str, fields: list[str]) -> Iterator[dict[str, Any]]:
+        """Stream raw rows restricted to `fields`, in `agent_index` order."""
+        columns = ",".join(dict.fromkeys(["agent_index", *fields]))
+        for row in self._db.select_iter(
+            self.TABLE, columns=columns, filters={"survey_id": survey_id}, key="agent_index"
+        ):
+            yield {field: row.get(field) for field in fields}
+
+    def delete_agents_by_survey(self, survey_id: str) -> int:
+        return self._db.delete(self.TABLE, filters={"survey_id": survey_id}, returning=False)
 
     def _to_entity(self, row: dict[str, Any]) -> Agent:
         return Agent(
@@ -1,17 +1,34 @@
+from collections.abc import Iterator
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal, overload
 from uuid import uuid4
 
 from app.core.errors import NotFoundError, RepoError
-from app.domain.entities.response import Response
+from app.domain.entities.response import Response, ResponseSummary
+from app.infrastructure.db.bulk_writer import create_bulk_writer
 from app.infrastructure.db.supabase_client import SupabaseClient
 
 
 class ResponseRepository:
     TABLE = "responses"
+    COLUMNS = (
+        "id",
+        "survey_id",
+        "agent_id",
+        "stance",
+        "confidence",
+        "short_reason",
+        "raw_llm_output",
+        "is_fallback",
+        "created_at",
+    )
+    SUMMARY_COLUMNS = "id,agent_id,stance,confidence,short_reason,is_fallback"
+    # Keyset of the streams that must keep creation order (ids are random UUIDs).
+    ORDER_KEY = ("created_at", "id")
 
     def __init__(self, db: SupabaseClient):
         self._db = db
+        self._writer = create_bulk_writer(db)
 
     def create_response(self, data: dict[str, Any]) -> Response:
         if "id" not in data:
@@ -23,16 +40,35 @@ class ResponseRepository:
             raise RepoError("Failed to create response")
         return self._to_entity(result[0])
 
-    def create_responses_batch(self, rows: list[dict[str, Any]]) -> list[Response]:
+    @overload
+    def create_responses_batch(
+        self,
+        rows: list[dict[str, Any]],
+        returning: Literal[True] = ...,
+    ) -> list[Response]: ...
+
+    @overload
+    def create_responses_batch(
+        self,
+        rows: list[dict[str, Any]],
+        *,
+        returning: Literal[False],
+    ) -> int: ...
+
+    def create_responses_batch(
+        self,
+        rows: list[dict[str, Any]],
+        returning: bool = True,
+    ) -> list[Response] | int:
         for r in rows:
             if "id" not in r:
                 r["id"] = str(uuid4())
             if "created_at" not in r:
                 r["created_at"] = datetime.utcnow().isoformat()
-        result = self._db.insert(self.TABLE, rows)
-        if not result:
-            raise RepoError("Failed to create responses batch")
-        return [self._to_entity(r) for r in result]
+        result = self._writer.write_or_raise(self.TABLE, rows, returning=returning)
+        if not returning:
+            return result.written
+        return [self._to_entity(r) for r in result.rows]
 
     def get_response(self, response_id: str) -> Response:
         row = self._db.select_one(self.TABLE, filters={"id": response_id})
@@ -55,8 +91,42 @@ class ResponseRepository:
         )
         return [self._to_entity(r) for r in rows]
 
-    def delete_responses_by_survey(self, survey_id: str) -> None:
-        self._db.delete(self.TABLE, filters={"survey_id": survey_id})
+    def iter_responses_by_survey(
+        self,
+        survey_id: str,
+        include_raw: bool = True,
+    ) -> Iterator[Response]:
+        columns = "*" if include_raw else ",".join(c for c in self.COLUMNS if c != "raw_llm_output")
+        for row in self._db.select_iter(
+            self.TABLE, columns=columns, filters={"survey_id": survey_id}, key=self.ORDER_KEY
+        ):
+            yield self._to_entity(row)
+
+    def iter_rows_by_survey(self, survey_id: str, fields: list[str]) -> Iterator[dict[str, Any]]:
+        """Stream raw rows restricted to `fields`.
+
+        The paging key is selected as well, then dropped unless asked for.
+        """
+        columns = ",".join(dict.fromkeys([*self.ORDER_KEY, *fields]))
+        for row in self._db.select_iter(
+            self.TABLE, columns=columns, filters={"survey_id": survey_id}, key=self.ORDER_KEY
+        ):
+            yield {field: row.get(field) for field in fields}
+
+    def iter_summaries_by_survey(self, survey_id: str) -> Iterator[ResponseSummary]:
+        for row in self._db.select_iter(
+            self.TABLE, columns=self.SUMMARY_COLUMNS, filters={"survey_id": survey_id}
+        ):
+            yield ResponseSummary(
+                agent_id=row["agent_id"],
+                stance=row.get("stance"),
+                confidence=float(row.get("confidence", 0.5)),
+                short_reason=row.get("short_reason"),
+                is_fallback=bool(row.get("is_fallback", False)),
+            )
+
+    def delete_responses_by_survey(self, survey_id: str) -> int:
+        return self._db.delete(self.TABLE, filters={"survey_id": survey_id}, returning=False)
 
     def _to_entity(self, row: dict[str, Any]) -> Response:
         return Response(
@@ -1,35 +1,71 @@
 from datetime import datetime
-from typing import Any
-from uuid import uuid4
+from typing import Any, Literal, overload
+from uuid import NAMESPACE_URL, uuid5
 
 from app.core.errors import RepoError
 from app.domain.entities.survey_aggregate import SurveyAggregate
+from app.infrastructure.db.async_supabase_client import AsyncSupabaseClient
 from app.infrastructure.db.supabase_client import SupabaseClient
 
 
+def aggregate_id(survey_id: str, question_id: str | None) -> str:
+    """Stable id of the aggregate row of one question (or of a text survey)."""
+    return str(uuid5(NAMESPACE_URL, f"survey_aggregates/{survey_id}/{question_id or ''}"))
+
+
 class SurveyAggregateRepository:
     TABLE = "survey_aggregates"
 
     def __init__(self, db: SupabaseClient):
         self._db = db
 
-    def upsert_aggregate(
+    @overload
+    def upsert_aggregates_batch(
+        self,
+        survey_id: str,
+        aggregations: list[tuple[str | None, dict[str, Any]]],
+        returning: Literal[True] = ...,
+    ) -> list[SurveyAggregate]: ...
+
+    @overload
+    def upsert_aggregates_batch(
         self,
         survey_id: str,
-        aggregation: dict[str, Any],
-        question_id: str | None = None,
-    ) -> SurveyAggregate:
-        data: dict[str, Any] = {
-            "id": str(uuid4()),
-            "survey_id": survey_id,
-            "question_id": question_id,
-            "aggregation": aggregation,
-            "computed_at": datetime.utcnow().isoformat(),
-        }
-        result = self._db.insert(self.TABLE, data)
+        aggregations: list[tuple[str | None, dict[str, Any]]],
+        *,
+        returning: Literal[False],
+    ) -> int: ...
+
+    def upsert_aggregates_batch(
+        self,
+        survey_id: str,
+        aggregations: list[tuple[str | None, dict[str, Any]]],
+        returning: bool = True,
+    ) -> list[SurveyAggregate] | int:
+        """Write one aggregate per (question_id, aggregation) pair, replacing rows in place.
+
+        Ids are derived from `(survey_id, question_id)`, so a second write of
+        the same question updates its row: readers never see the set empty.
+        """
+        if not aggregations:
+            return [] if returning else 0
+        computed_at = datetime.utcnow().isoformat()
+        rows = [
+            {
+                "id": aggregate_id(survey_id, question_id),
+                "survey_id": survey_id,
+                "question_id": question_id,
+                "aggregation": aggregation,
+                "computed_at": computed_at,
+            }
+            for question_id, aggregation in aggregations
+        ]
+        if not returning:
+            return self._db.upsert(self.TABLE, rows, returning=False)
+        result = self._db.upsert(self.TABLE, rows)
         if not result:
-            raise RepoError("Failed to upsert survey aggregate")
-        return self._to_entity(result[0])
+            raise RepoError("Failed to upsert survey aggregates batch")
+        return [self._to_entity(r) for r in result]
 
     def get_aggregates(self, survey_id: str) -> list[SurveyAggregate]:
         rows = self._db.select(
@@ -39,8 +75,21 @@ class SurveyAggregateRepository:
         )
         return [self._to_entity(r) for r in rows]
 
-    def delete_by_survey(self, survey_id: str) -> None:
-        self._db.delete(self.TABLE, filters={"survey_id": survey_id})
+    def delete_other_aggregates(self, survey_id: str, keep_ids: list[str]) -> int:
+        """Delete the survey's aggregate rows not in `keep_ids`.
+
+        Rows written before ids were derived from `(survey_id, question_id)`
+        carry random ids that an upsert never replaces.
+        """
+        keep = set(keep_ids)
+        rows = self._db.select(self.TABLE, columns="id", filters={"survey_id": survey_id})
+        stale = [r["id"] for r in rows if r["id"] not in keep]
+        for stale_id in stale:
+            self._db.delete(self.TABLE, filters={"id": stale_id}, returning=False)
+        return len(stale)
+
+    def delete_by_survey(self, survey_id: str) -> int:
+        return self._db.delete(self.TABLE, filters={"survey_id": survey_id}, returning=False)
 
     def _to_entity(self, row: dict[str, Any]) -> SurveyAggregate:
         return SurveyAggregate(
@@ -60,3 +109,22 @@ class SurveyAggregateRepository:
         if isinstance(value, str):
             return datetime.fromisoformat(value.replace("Z", "+00:00"))
         return None
+
+
+class AsyncSurveyAggregateRepository:
+    """Read side of `SurveyAggregateRepository` for `async def` endpoints."""
+
+    TABLE = SurveyAggregateRepository.TABLE
+    _to_entity = SurveyAggregateRepository._to_entity
+    _parse_dt = staticmethod(SurveyAggregateRepository._parse_dt)
+
+    def __init__(self, db: AsyncSupabaseClient):
+        self._db = db
+
+    async def get_aggregates(self, survey_id: str) -> list[SurveyAggregate]:
+        rows = await self._db.select(
+            self.TABLE,
+            filters={"survey_id": survey_id},
+            order_by="computed_at",
+        )
+        return [self._to_entity(r) for r in rows]
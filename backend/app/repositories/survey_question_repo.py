@@ -1,39 +1,78 @@
+import asyncio
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal, overload
 from uuid import uuid4
 
 from app.core.errors import RepoError
 from app.domain.entities.survey_question import SurveyQuestion
+from app.infrastructure.cache.base import Cache
+from app.infrastructure.cache.null_cache import NullCache
+from app.infrastructure.db.async_supabase_client import AsyncSupabaseClient
 from app.infrastructure.db.supabase_client import SupabaseClient
 
 
 class SurveyQuestionRepository:
     TABLE = "survey_questions"
 
-    def __init__(self, db: SupabaseClient):
+    def __init__(self, db: SupabaseClient, cache: Cache | None = None):
         self._db = db
+        self._cache = cache or NullCache()
 
-    def create_questions_batch(self, questions: list[dict[str, Any]]) -> list[SurveyQuestion]:
+    @overload
+    def create_questions_batch(
+        self,
+        questions: list[dict[str, Any]],
+        returning: Literal[True] = ...,
+    ) -> list[SurveyQuestion]: ...
+
+    @overload
+    def create_questions_batch(
+        self,
+        questions: list[dict[str, Any]],
+        *,
+        returning: Literal[False],
+    ) -> int: ...
+
+    def create_questions_batch(
+        self,
+        questions: list[dict[str, Any]],
+        returning: bool = True,
+    ) -> list[SurveyQuestion] | int:
         for q in questions:
             if "id" not in q:
                 q["id"] = str(uuid4())
             if "created_at" not in q:
                 q["created_at"] = datetime.utcnow().isoformat()
+        self._cache.delete(*{self.cache_key(q["survey_id"]) for q in questions})
+        if not returning:
+            return self._db.insert(self.TABLE, questions, returning=False)
         result = self._db.insert(self.TABLE, questions)
         if not result:
             raise RepoError("Failed to create survey questions")
         return [self._to_entity(r) for r in result]
 
     def list_by_survey(self, survey_id: str) -> list[SurveyQuestion]:
-        rows = self._db.select(
-            self.TABLE,
-            filters={"survey_id": survey_id},
-            order_by="question_index",
-        )
-        return [self._to_entity(r) for r in rows]
+        key = self.cache_key(survey_id)
+        questions = self._cache.get(key)
+        if questions is None:
+            generation = self._cache.generation(key)
+            rows = self._db.select(
+                self.TABLE,
+                filters={"survey_id": survey_id},
+                order_by="question_index",
+            )
+            questions = [self._to_entity(r) for r in rows]
+            self._cache.set(key, questions, generation)
+        return questions
 
-    def delete_by_survey(self, survey_id: str) -> None:
-        self._db.delete(self.TABLE, filters={"survey_id": survey_id})
+    def delete_by_survey(self, survey_id: str) -> int:
+        deleted = self._db.delete(self.TABLE, filters={"survey_id": survey_id}, returning=False)
+        self._cache.delete(self.cache_key(survey_id))
+        return deleted
+
+    @staticmethod
+    def cache_key(survey_id: str) -> str:
+        return f"questions:{survey_id}"
 
     def _to_entity(self, row: dict[str, Any]) -> SurveyQuestion:
         return SurveyQuestion(
@@ -57,3 +96,29 @@ class SurveyQuestionRepository:
         if isinstance(value, str):
             return datetime.fromisoformat(value.replace("Z", "+00:00"))
         return None
+
+
+class AsyncSurveyQuestionRepository:
+    """Read side of `SurveyQuestionRepository` for `async def` endpoints."""
+
+    TABLE = SurveyQuestionRepository.TABLE
+    _to_entity = SurveyQuestionRepository._to_entity
+    _parse_dt = staticmethod(SurveyQuestionRepository._parse_dt)
+
+    def __init__(self, db: AsyncSupabaseClient, cache: Cache | None = None):
+        self._db = db
+        self._cache = cache or NullCache()
+
+    async def list_by_survey(self, survey_id: str) -> list[SurveyQuestion]:
+        key = SurveyQuestionRepository.cache_key(survey_id)
+        questions = await asyncio.to_thread(self._cache.get, key)
+        if questions is None:
+            generation = await asyncio.to_thread(self._cache.generation, key)
+            rows = await self._db.select(
+                self.TABLE,
+                filters={"survey_id": survey_id},
+                order_by="question_index",
+            )
+            questions = [self._to_entity(r) for r in rows]
+            await asyncio.to_thread(self._cache.set, key, questions, generation)
+        return questions
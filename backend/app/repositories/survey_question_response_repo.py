@@ -1,28 +1,67 @@
+from collections.abc import Iterator
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal, overload
 from uuid import uuid4
 
-from app.core.errors import RepoError
-from app.domain.entities.survey_question_response import SurveyQuestionResponse
+from app.domain.entities.survey_question_response import (
+    SurveyQuestionResponse,
+    SurveyQuestionResponseSummary,
+)
+from app.infrastructure.db.bulk_writer import create_bulk_writer
 from app.infrastructure.db.supabase_client import SupabaseClient
 
 
 class SurveyQuestionResponseRepository:
     TABLE = "survey_question_responses"
+    COLUMNS = (
+        "id",
+        "survey_id",
+        "agent_id",
+        "question_id",
+        "answer",
+        "confidence",
+        "short_reason",
+        "raw_llm_output",
+        "is_fallback",
+        "created_at",
+    )
+    SUMMARY_COLUMNS = "id,agent_id,question_id,answer,confidence,is_fallback"
+    # Keyset of the streams that must keep creation order (ids are random UUIDs).
+    ORDER_KEY = ("created_at", "id")
 
     def __init__(self, db: SupabaseClient):
         self._db = db
+        self._writer = create_bulk_writer(db)
 
-    def create_batch(self, rows: list[dict[str, Any]]) -> list[SurveyQuestionResponse]:
+    @overload
+    def create_batch(
+        self,
+        rows: list[dict[str, Any]],
+        returning: Literal[True] = ...,
+    ) -> list[SurveyQuestionResponse]: ...
+
+    @overload
+    def create_batch(
+        self,
+        rows: list[dict[str, Any]],
+        *,
+        returning: Literal[False],
+    ) -> int: ...
+
+    def create_batch(
+        self,
+        rows: list[dict[str, Any]],
+        returning: bool = True,
+    ) -> list[SurveyQuestionResponse] | int:
         for r in rows:
             if "id" not in r:
                 r["id"] = str(uuid4())
             if "created_at" not in r:
                 r["created_at"] = datetime.utcnow().isoformat()
-        result = self._db.insert(self.TABLE, rows)
-        if not result:
-            raise RepoError("Failed to create survey question responses")
-        return [self._to_entity(r) for r in result]
+        result = self._writer.write_or_raise(self.TABLE, rows, returning=returning)
+        if not returning:
+            return result.written
+        return [self._to_entity(r) for r in result.rows]
 
     def list_by_survey(
         self,
@@ -39,20 +78,60 @@ class SurveyQuestionResponseRepository:
         )
         return [self._to_entity(r) for r in rows]
 
+    def iter_by_survey(
+        self,
+        survey_id: str,
+        page_size: int | None = None,
+        include_raw: bool = True,
+    ) -> Iterator[SurveyQuestionResponse]:
+        """Stream every response of a survey, one keyset page at a time."""
+        columns = "*" if include_raw else ",".join(c for c in self.COLUMNS if c != "raw_llm_output")
+        for row in self._db.select_iter(
+            self.TABLE,
+            columns=columns,
+            filters={"survey_id": survey_id},
+            key=self.ORDER_KEY,
+            page_size=page_size,
+        ):
+            yield self._to_entity(row)
+
+    def iter_rows_by_survey(self, survey_id: str, fields: list[str]) -> Iterator[dict[str, Any]]:
+        """Stream raw rows restricted to `fields`.
+
+        The paging key is selected as well, then dropped unless asked for.
+        """
+        columns = ",".join(dict.fromkeys([*self.ORDER_KEY, *fields]))
+        for row in self._db.select_iter(
+            self.TABLE, columns=columns, filters={"survey_id": survey_id}, key=self.ORDER_KEY
+        ):
+            yield {field: row.get(field) for field in fields}
+
+    def iter_summaries_by_survey(self, survey_id: str) -> Iterator[SurveyQuestionResponseSummary]:
+        for row in self._db.select_iter(
+            self.TABLE, columns=self.SUMMARY_COLUMNS, filters={"survey_id": survey_id}
+        ):
+            yield SurveyQuestionResponseSummary(
+                agent_id=row["agent_id"],
+                question_id=row["question_id"],
+                answer=row["answer"],
+                confidence=float(row.get("confidence", 0.5)),
+                is_fallback=bool(row.get("is_fallback", False)),
+            )
+
     def list_by_survey_and_question(
         self,
         survey_id: str,
         question_id: str,
     ) -> list[SurveyQuestionResponse]:
-        rows = self._db.select(
+        rows = self._db.select_iter(
             self.TABLE,
             filters={"survey_id": survey_id, "question_id": question_id},
-            order_by="created_at",
+            key=self.ORDER_KEY,
         )
         return [self._to_entity(r) for r in rows]
 
-    def delete_by_survey(self, survey_id: str) -> None:
-        self._db.delete(self.TABLE, filters={"survey_id": survey_id})
+    def delete_by_survey(self, survey_id: str) -> int:
+        return self._db.delete(self.TABLE, filters={"survey_id": survey_id}, returning=False)
 
     def _to_entity(self, row: dict[str, Any]) -> SurveyQuestionResponse:
         return SurveyQuestionResponse(
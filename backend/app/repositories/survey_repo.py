@@ -1,17 +1,23 @@
+import asyncio
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
 from app.core.errors import NotFoundError, RepoError
 from app.domain.entities.survey import Survey
+from app.infrastructure.cache.base import Cache
+from app.infrastructure.cache.null_cache import NullCache
+from app.infrastructure.db.async_supabase_client import AsyncSupabaseClient
 from app.infrastructure.db.supabase_client import SupabaseClient
+from app.repositories.survey_question_repo import SurveyQuestionRepository
 
 
 class SurveyRepository:
     TABLE = "surveys"
 
-    def __init__(self, db: SupabaseClient):
+    def __init__(self, db: SupabaseClient, cache: Cache | None = None):
         self._db = db
+        self._cache = cache or NullCache()
 
     def create_survey(
         self,
@@ -43,10 +49,16 @@ class SurveyRepository:
         return self._to_entity(result[0])
 
     def get_survey(self, survey_id: str) -> Survey:
-        row = self._db.select_one(self.TABLE, filters={"id": survey_id})
-        if not row:
-            raise NotFoundError(f"Survey {survey_id} not found")
-        return self._to_entity(row)
+        key = self.cache_key(survey_id)
+        survey = self._cache.get(key)
+        if survey is None:
+            generation = self._cache.generation(key)
+            row = self._db.select_one(self.TABLE, filters={"id": survey_id})
+            if not row:
+                raise NotFoundError(f"Survey {survey_id} not found")
+            survey = self._to_entity(row)
+            self._cache.set(key, survey, generation)
+        return survey
 
     def list_surveys(
         self,
@@ -67,12 +79,20 @@ class SurveyRepository:
 
     def update_survey(self, survey_id: str, data: dict[str, Any]) -> Survey:
         result = self._db.update(self.TABLE, data, filters={"id": survey_id})
+        self._cache.delete(self.cache_key(survey_id))
         if not result:
             raise NotFoundError(f"Survey {survey_id} not found")
         return self._to_entity(result[0])
 
-    def delete_survey(self, survey_id: str) -> None:
-        self._db.delete(self.TABLE, filters={"id": survey_id})
+    def delete_survey(self, survey_id: str) -> int:
+        deleted = self._db.delete(self.TABLE, filters={"id": survey_id}, returning=False)
+        # Questions go with the survey (ON DELETE CASCADE).
+        self._cache.delete(self.cache_key(survey_id), SurveyQuestionRepository.cache_key(survey_id))
+        return deleted
+
+    @staticmethod
+    def cache_key(survey_id: str) -> str:
+        return f"survey:{survey_id}"
 
     def _to_entity(self, row: dict[str, Any]) -> Survey:
         return Survey(
@@ -101,3 +121,44 @@ class SurveyRepository:
         if isinstance(value, str):
             return datetime.fromisoformat(value.replace("Z", "+00:00"))
         return None
+
+
+class AsyncSurveyRepository:
+    """Read side of `SurveyRepository` for `async def` endpoints."""
+
+    TABLE = SurveyRepository.TABLE
+    _to_entity = SurveyRepository._to_entity
+    _parse_dt = staticmethod(SurveyRepository._parse_dt)
+
+    def __init__(self, db: AsyncSupabaseClient, cache: Cache | None = None):
+        self._db = db
+        self._cache = cache or NullCache()
+
+    async def get_survey(self, survey_id: str) -> Survey:
+        key = SurveyRepository.cache_key(survey_id)
+        survey = await asyncio.to_thread(self._cache.get, key)
+        if survey is None:
+            generation = await asyncio.to_thread(self._cache.generation, key)
+            row = await self._db.select_one(self.TABLE, filters={"id": survey_id})
+            if not row:
+                raise NotFoundError(f"Survey {survey_id} not found")
+            survey = self._to_entity(row)
+            await asyncio.to_thread(self._cache.set, key, survey, generation)
+        return survey
+
+    async def list_surveys(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        created_by: str | None = None,
+    ) -> list[Survey]:
+        filters = {"created_by": created_by} if created_by else None
+        rows = await self._db.select(
+            self.TABLE,
+            filters=filters,
+            limit=limit,
+            offset=offset,
+            order_by="created_at",
+            order_desc=True,
+        )
+        return [self._to_entity(r) for r in rows]
@@ -0,0 +1,55 @@
+import random
+from typing import Any
+from uuid import uuid4
+
+EDUCATION_LEVELS = ["sans diplôme", "cap/bep", "bac", "bac+2", "bac+3", "bac+5", "doctorat"]
+EDUCATION_WEIGHTS = [0.12, 0.2, 0.2, 0.16, 0.14, 0.15, 0.03]
+
+URBAN_RURAL = ["urbain", "périurbain", "rural"]
+URBAN_RURAL_WEIGHTS = [0.5, 0.3, 0.2]
+
+CLASSES_SOCIALES = ["populaire", "moyenne", "aisée"]
+CLASSES_SOCIALES_WEIGHTS = [0.35, 0.5, 0.15]
+
+
+def generate_agents(survey_id: str, n_agents: int, seed: int) -> list[dict[str, Any]]:
+    """Generate a deterministic panel of agents for a survey.
+
+    The same `seed` and `n_agents` always produce the same traits, so a survey can
+    be re-run with an identical panel.
+    """
+    rng = random.Random(seed)
+    agents = []
+    for idx in range(n_agents):
+        eco = round(rng.uniform(-1.0, 1.0), 3)
+        open_ = round(rng.uniform(-1.0, 1.0), 3)
+        trust = round(rng.betavariate(2, 2), 3)
+        temperament = round(rng.betavariate(2, 3), 3)
+        age = rng.randint(18, 85)
+        education = rng.choices(EDUCATION_LEVELS, EDUCATION_WEIGHTS)[0]
+        urban_rural = rng.choices(URBAN_RURAL, URBAN_RURAL_WEIGHTS)[0]
+        classe_sociale = rng.choices(CLASSES_SOCIALES, CLASSES_SOCIALES_WEIGHTS)[0]
+        agents.append(
+            {
+                "id": str(uuid4()),
+                "survey_id": survey_id,
+                "agent_index": idx,
+                "eco": eco,
+                "open": open_,
+                "trust": trust,
+                "temperament": temperament,
+                "age": age,
+                "education": education,
+                "urban_rural": urban_rural,
+                "classe_sociale": classe_sociale,
+                "background": _background(age, education, urban_rural, classe_sociale),
+            }
+        )
+    return agents
+
+
+def _background(age: int, education: str, urban_rural: str, classe_sociale: str) -> str:
+    return (
+        f"Personne de {age} ans, niveau d'études {education}, "
+        f"vivant en zone {urban_rural}, classe sociale {classe_sociale}."
+    )
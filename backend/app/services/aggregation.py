@@ -0,0 +1,196 @@
+import heapq
+import itertools
+import threading
+from functools import lru_cache
+from typing import Any
+
+from app.domain.entities.survey_question import SurveyQuestion
+
+TOP_REASONS = 10
+
+
+class TextAggregator:
+    """Running stance counts, confidence sum and top-k reasons (mode text)."""
+
+    def __init__(self, top_k: int = TOP_REASONS):
+        self.total = 0
+        self.counts = {"agree": 0, "disagree": 0, "mixed": 0}
+        self.confidence_sum = 0.0
+        self.fallback_count = 0
+        self._top_k = top_k
+        # Min-heap of (confidence, -seq, stance, reason): the weakest entry is popped
+        # first and, among equal confidences, the most recent one, like a stable sort.
+        self._top: list[tuple[float, int, str | None, str | None]] = []
+        self._seq = itertools.count()
+
+    def add(
+        self,
+        stance: str | None,
+        confidence: float,
+        short_reason: str | None,
+        is_fallback: bool,
+    ) -> None:
+        self.total += 1
+        if stance in self.counts:
+            self.counts[stance] += 1
+        self.confidence_sum += confidence
+        if is_fallback:
+            self.fallback_count += 1
+        entry = (confidence, -next(self._seq), stance, short_reason)
+        if len(self._top) < self._top_k:
+            heapq.heappush(self._top, entry)
+        elif entry > self._top[0]:
+            heapq.heapreplace(self._top, entry)
+
+    def snapshot(self) -> dict[str, Any]:
+        total = self.total
+        if total == 0:
+            return {
+                "total": 0,
+                "agree_pct": 0,
+                "disagree_pct": 0,
+                "mixed_pct": 0,
+                "mean_confidence": 0,
+            }
+
+        top_reasons = [
+            {"stance": stance, "confidence": round(confidence, 3), "reason": reason}
+            for confidence, _, stance, reason in sorted(self._top, reverse=True)
+            if reason
+        ]
+        return {
+            "total": total,
+            "agree_count": self.counts["agree"],
+            "disagree_count": self.counts["disagree"],
+            "mixed_count": self.counts["mixed"],
+            "agree_pct": round(self.counts["agree"] / total * 100, 1),
+            "disagree_pct": round(self.counts["disagree"] / total * 100, 1),
+            "mixed_pct": round(self.counts["mixed"] / total * 100, 1),
+            "mean_confidence": round(self.confidence_sum / total, 3),
+            "fallback_count": self.fallback_count,
+            "top_reasons": top_reasons,
+        }
+
+
+class QuestionAggregator:
+    """Running statistics for one questionnaire item (stance, likert or mcq)."""
+
+    def __init__(self, q_type: str):
+        self.q_type = q_type
+        self.total = 0
+        self.confidence_sum = 0.0
+        self.counts: dict[str, int] = {}
+        self.likert_sum = 0.0
+        self.likert_count = 0
+
+    def add(self, answer: str, confidence: float) -> None:
+        self.total += 1
+        self.confidence_sum += confidence
+        if self.q_type == "likert":
+            try:
+                self.likert_sum += float(answer)
+                self.likert_count += 1
+            except (ValueError, TypeError):
+                pass
+        else:
+            self.counts[answer] = self.counts.get(answer, 0) + 1
+
+    def snapshot(self) -> dict[str, Any]:
+        total = self.total
+        if total == 0:
+            return {"total": 0, "type": self.q_type}
+
+        mean_conf = round(self.confidence_sum / total, 3)
+        if self.q_type == "stance":
+            return {
+                "total": total,
+                "type": self.q_type,
+                "agree_pct": round(self.counts.get("agree", 0) / total * 100, 1),
+                "disagree_pct": round(self.counts.get("disagree", 0) / total * 100, 1),
+                "mixed_pct": round(self.counts.get("mixed", 0) / total * 100, 1),
+                "mean_confidence": mean_conf,
+            }
+        elif self.q_type == "likert":
+            mean_val = self.likert_sum / self.likert_count if self.likert_count else 0
+            return {
+                "total": total,
+                "type": self.q_type,
+                "mean_value": round(mean_val, 2),
+                "mean_confidence": mean_conf,
+            }
+        else:  # mcq
+            return {
+                "total": total,
+                "type": self.q_type,
+                "distribution": {k: round(v / total * 100, 1) for k, v in self.counts.items()},
+                "mean_confidence": mean_conf,
+            }
+
+
+class SurveyAggregator:
+    """Folds a survey's responses in as they are stored, at O(1) cost per row."""
+
+    def __init__(self, questions: list[SurveyQuestion] | None = None):
+        self._lock = threading.Lock()
+        self._text = TextAggregator()
+        self._questions = {q.question_id: QuestionAggregator(q.type) for q in questions or []}
+        self._is_questionnaire = questions is not None
+        self.last_persisted_at = 0.0
+
+    def add_responses(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for r in rows:
+                self._text.add(
+                    r.get("stance"),
+                    float(r.get("confidence", 0.5)),
+                    r.get("short_reason"),
+                    bool(r.get("is_fallback", False)),
+                )
+
+    def add_question_responses(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for r in rows:
+                aggregator = self._questions.get(r["question_id"])
+                if aggregator is not None:
+                    aggregator.add(r["answer"], float(r.get("confidence", 0.5)))
+
+    def snapshots(self) -> list[tuple[str | None, dict[str, Any]]]:
+        """Current aggregation rows as (question_id, aggregation) pairs."""
+        with self._lock:
+            if not self._is_questionnaire:
+                return [(None, self._text.snapshot())]
+            return [(qid, agg.snapshot()) for qid, agg in self._questions.items()]
+
+
+class LiveAggregates:
+    """Registry of the aggregators of surveys being filled.
+
+    Services of one process share the instance of `get_live_aggregates`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_survey: dict[str, SurveyAggregator] = {}
+
+    def get(self, survey_id: str) -> SurveyAggregator | None:
+        with self._lock:
+            return self._by_survey.get(survey_id)
+
+    def get_or_create(
+        self,
+        survey_id: str,
+        questions: list[SurveyQuestion] | None = None,
+    ) -> SurveyAggregator:
+        with self._lock:
+            if survey_id not in self._by_survey:
+                self._by_survey[survey_id] = SurveyAggregator(questions)
+            return self._by_survey[survey_id]
+
+    def discard(self, survey_id: str) -> None:
+        with self._lock:
+            self._by_survey.pop(survey_id, None)
+
+
+@lru_cache
+def get_live_aggregates() -> LiveAggregates:
+    return LiveAggregates()
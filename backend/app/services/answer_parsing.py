@@ -0,0 +1,360 @@
+"""Tolerant parsing of LLM answers into answer/stance, confidence and reason.
+
+Each raw output goes through increasingly lenient stages, and the first one
+yielding a valid answer wins:
+
+1. `json`: the first JSON object in the text, chatter and code fences ignored;
+2. `repaired`: that object once truncated or sloppy JSON is fixed (unclosed
+   strings and brackets, trailing commas, single quotes);
+3. `regex`: `key: value` pairs picked out of free text;
+4. `keywords`: the stance, scale value or choice named in plain words.
+
+Only when every stage fails is the answer a fallback. `ParseStats` counts
+the stage that settled each answer.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from app.domain.entities.survey_question import SurveyQuestion
+from app.services.aggregation_engine import STANCES
+from app.services.prompts import DEFAULT_LIKERT_SCALE
+
+ParseMethod = Literal["json", "repaired", "regex", "keywords", "fallback"]
+
+_DECODER = json.JSONDecoder()
+_FIELDS = ("stance", "answer", "confidence", "short_reason")
+_FIELD_PATTERNS = {
+    name: re.compile(
+        rf"""["']?{name}["']?\s*[:=]\s*(?:"([^"\n]*)"?|'([^'\n]*)'?|([^,;}}\n]+))""",
+        re.IGNORECASE,
+    )
+    for name in _FIELDS
+}
+_OUT_OF = re.compile(r"\s*(?:/|sur|out of)\s*\d+", re.IGNORECASE)
+# Checked in this order, each match being blanked out before the next stance
+# is counted: "pas d'accord" must not also count as "d'accord".
+_STANCE_KEYWORDS = {
+    "disagree": re.compile(
+        r"\bdisagree|\bpas (?:du tout )?d'accord|\bcontre\b|\bdéfavorable|\boppos[ée]|\brejet",
+        re.IGNORECASE,
+    ),
+    "mixed": re.compile(
+        r"\bmixed\b|\bmitig[ée]|\bpartag[ée]|\bnuanc[ée]|\bça dépend|\bneutre\b|\bambivalent",
+        re.IGNORECASE,
+    ),
+    "agree": re.compile(
+        r"\bagree\b|\bd'accord\b|\bfavorable|\bapprouve|\bsoutiens?\b", re.IGNORECASE
+    ),
+}
+
+
+@dataclass
+class ParseStats:
+    """Answers parsed, by the stage that settled them."""
+
+    methods: Counter = field(default_factory=Counter)
+
+    def record(self, method: ParseMethod) -> None:
+        self.methods[method] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.methods.values())
+
+    @property
+    def fallback_rate(self) -> float:
+        return self.methods["fallback"] / self.total if self.total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "parsed": self.total,
+            "parse_fallbacks": self.methods["fallback"],
+            "parse_fallback_rate": round(self.fallback_rate, 3),
+            "parse_methods": dict(self.methods),
+        }
+
+
+def parse_text_answer(raw: str, stats: ParseStats | None = None) -> dict[str, Any]:
+    settled = _settle(raw, "stance", _normalize_stance, classify_stance)
+    if settled is None:
+        _record(stats, "fallback")
+        return _row("stance", "mixed", {}, raw, is_fallback=True)
+    stance, fields, method = settled
+    _record(stats, method)
+    return _row("stance", stance, fields, raw)
+
+
+def parse_question_answer(
+    question: SurveyQuestion,
+    raw: str,
+    stats: ParseStats | None = None,
+) -> dict[str, Any]:
+    settled = _settle(
+        raw,
+        "answer",
+        lambda value: normalize_answer(question, value),
+        lambda text: _classify_answer(question, text),
+    )
+    if settled is None:
+        _record(stats, "fallback")
+        return _row("answer", fallback_answer(question), {}, raw, is_fallback=True)
+    answer, fields, method = settled
+    _record(stats, method)
+    return _row("answer", answer, fields, raw)
+
+
+def parse_packed_answers(
+    questions: list[SurveyQuestion],
+    raw: str,
+    stats: ParseStats | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Valid answers of a packed reply by question_id; invalid items are left out.
+
+    Items are looked up by question_id, or by position when the model replied
+    with a list (`{"answers": [...]}`). Each item keeps its own JSON fragment
+    as `raw_llm_output`.
+    """
+    data, method = extract_json(raw)
+    if data is None:
+        return {}
+    items = data.get("answers")
+    if isinstance(items, list):
+        by_id = {
+            item.get("question_id"): item
+            for item in items
+            if isinstance(item, dict) and "question_id" in item
+        }
+        data = by_id or dict(zip((q.question_id for q in questions), items, strict=False))
+
+    parsed: dict[str, dict[str, Any]] = {}
+    for question in questions:
+        item = data.get(question.question_id)
+        fields = _lower_keys(item) if isinstance(item, dict) else {"answer": item}
+        answer = normalize_answer(question, fields.get("answer"))
+        if answer is None:
+            continue
+        _record(stats, method)
+        parsed[question.question_id] = _row(
+            "answer", answer, fields, json.dumps(item, ensure_ascii=False)
+        )
+    return parsed
+
+
+def extract_json(raw: str) -> tuple[dict[str, Any] | None, ParseMethod]:
+    """First JSON object found in `raw`, repaired if needed, and how it was read."""
+    text = raw or ""
+    first = text.find("{")
+    if first == -1:
+        return None, "fallback"
+    value = _decode(text, first)
+    if value is not None:
+        return value, "json"
+    try:
+        value = json.loads(repair_json(text[first:]))
+    except json.JSONDecodeError:
+        value = None
+    if isinstance(value, dict):
+        return value, "repaired"
+    start = text.find("{", first + 1)
+    while start != -1:
+        value = _decode(text, start)
+        if value is not None:
+            return value, "json"
+        start = text.find("{", start + 1)
+    return None, "fallback"
+
+
+def repair_json(fragment: str) -> str:
+    """Best-effort fix of a JSON object cut short or written loosely by a model."""
+    if '"' not in fragment:
+        fragment = fragment.replace("'", '"')
+    out: list[str] = []
+    closers: list[str] = []
+    in_string = escaped = False
+    for char in fragment:
+        out.append(char)
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers:
+            closers.pop()
+            if not closers:
+                break
+    text = "".join(out)
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    if closers:
+        # A trailing number may be cut short ("0." of "0.85"): drop its pair.
+        text = re.sub(r'([,{])\s*"[^"]*"\s*:\s*-?[\d.eE+-]+$', r"\1", text)
+    text = re.sub(r"\s*:\s*$", "", text)
+    text = re.sub(r'([,{])\s*"[^"]*"$', r"\1", text)
+    text = re.sub(r",\s*$", "", text)
+    text = re.sub(r",\s*([}\]])", r"\1", text)
+    return text + "".join(reversed(closers))
+
+
+def classify_stance(text: str) -> str | None:
+    """Stance named in free text, or None when absent or ambiguous."""
+    text = (text or "").replace("’", "'")
+    counts = {}
+    for stance, pattern in _STANCE_KEYWORDS.items():
+        counts[stance] = len(pattern.findall(text))
+        text = pattern.sub(" ", text)
+    best = max(counts.values())
+    winners = [stance for stance, n in counts.items() if n == best]
+    return winners[0] if best and len(winners) == 1 else None
+
+
+def normalize_answer(question: SurveyQuestion, value: Any) -> str | None:
+    if value is None:
+        return None
+    if question.type == "stance":
+        return _normalize_stance(value)
+    if question.type == "likert":
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        # "inf", 1e999 and 3.7 are not points of the scale.
+        if not math.isfinite(number) or not number.is_integer():
+            return None
+        return str(int(number)) if number in (question.scale or DEFAULT_LIKERT_SCALE) else None
+    for choice in question.choices or []:
+        if str(value).strip().lower() == choice.lower():
+            return choice
+    return None
+
+
+def fallback_answer(question: SurveyQuestion) -> str:
+    if question.type == "likert":
+        scale = question.scale or DEFAULT_LIKERT_SCALE
+        return str(scale[len(scale) // 2])
+    if question.type == "mcq" and question.choices:
+        return question.choices[0]
+    return "mixed"
+
+
+# ── Private helpers ──────────────────────────────────────
+
+
+def _settle(
+    raw: str,
+    key: str,
+    normalize: Callable[[Any], str | None],
+    classify: Callable[[str], str | None],
+) -> tuple[str, dict[str, Any], ParseMethod] | None:
+    data, method = extract_json(raw)
+    if data is not None:
+        fields = _lower_keys(data)
+        value = normalize(fields.get(key))
+        if value is not None:
+            return value, fields, method
+    fields = _regex_fields(raw)
+    value = normalize(fields.get(key))
+    if value is not None:
+        return value, fields, "regex"
+    value = classify(raw)
+    if value is not None:
+        return value, {}, "keywords"
+    return None
+
+
+def _decode(text: str, start: int) -> dict[str, Any] | None:
+    try:
+        value, _ = _DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _regex_fields(raw: str) -> dict[str, Any]:
+    fields = {}
+    for name, pattern in _FIELD_PATTERNS.items():
+        match = pattern.search(raw or "")
+        if match:
+            value = next(group for group in match.groups() if group is not None)
+            fields[name] = value.strip().strip("\"'")
+    return fields
+
+
+def _classify_answer(question: SurveyQuestion, text: str) -> str | None:
+    if question.type == "stance":
+        return classify_stance(text)
+    if question.type == "likert":
+        scale = {str(n) for n in question.scale or DEFAULT_LIKERT_SCALE}
+        text = _OUT_OF.sub("", text or "")
+        found = set(re.findall(r"(?<![\w.])\d+(?!\w|\.\d)", text)) & scale
+        return found.pop() if len(found) == 1 else None
+    text = text or ""
+    found = [
+        c
+        for c in question.choices or []
+        if re.search(rf"(?<!\w){re.escape(c)}(?!\w)", text, re.IGNORECASE)
+    ]
+    return found[0] if len(found) == 1 else None
+
+
+def _normalize_stance(value: Any) -> str | None:
+    stance = str(value).strip().lower() if value is not None else ""
+    return stance if stance in STANCES else None
+
+
+def _lower_keys(data: dict[str, Any]) -> dict[str, Any]:
+    return {str(k).lower(): v for k, v in data.items()}
+
+
+def _row(
+    key: str,
+    value: str,
+    fields: dict[str, Any],
+    raw: str,
+    is_fallback: bool = False,
+) -> dict[str, Any]:
+    return {
+        key: value,
+        "confidence": _confidence(fields.get("confidence")),
+        "short_reason": _reason(fields.get("short_reason")),
+        "raw_llm_output": raw,
+        "is_fallback": is_fallback,
+    }
+
+
+def _confidence(value: Any) -> float:
+    if isinstance(value, str) and value.strip().endswith("%"):
+        value = _percent(value)
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return 0.5
+
+
+def _percent(value: str) -> float | None:
+    try:
+        return float(value.strip().rstrip("%")) / 100
+    except ValueError:
+        return None
+
+
+def _reason(value: Any) -> str | None:
+    return str(value)[:180] if value else None
+
+
+def _record(stats: ParseStats | None, method: ParseMethod) -> None:
+    if stats is not None:
+        stats.record(method)
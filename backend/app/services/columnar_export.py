@@ -0,0 +1,103 @@
+"""Parquet and Arrow IPC export of responses joined with their agents.
+
+Columns are typed for analysis: low-cardinality text (answers, stances,
+demographics) is dictionary-encoded, traits and confidences are float32 and
+timestamps are real timestamps. Rows are converted in record batches of
+`BATCH_ROWS`, so memory is bounded by one batch whatever the survey size.
+Requires the optional `pyarrow` package (`pip install '.[export]'`).
+"""
+
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any, Literal
+
+from app.core.errors import FeatureUnavailableError
+from app.domain.entities.survey import Survey
+from app.services.export import export_columns, export_rows
+from app.services.survey_service import SurveyService
+
+ColumnarFormat = Literal["parquet", "arrow"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+CATEGORIES = ("question_id", "answer", "stance", "education", "urban_rural", "classe_sociale")
+FLOAT32 = ("confidence", "eco", "open", "trust", "temperament")
+BATCH_ROWS = 50_000
+
+
+def write_columnar(svc: SurveyService, survey: Survey, fmt: ColumnarFormat) -> str:
+    """Write the export to a temporary file and return its path (caller deletes it)."""
+    pa = _pyarrow()
+    columns = export_columns(survey, include_agents=True, include_raw=False)
+    schema = arrow_schema(columns)
+    batches = _batches(export_rows(svc, survey, columns, include_agents=True), schema)
+
+    with tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=False) as handle:
+        path = handle.name
+    try:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+        else:
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_stream(sink, schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def arrow_schema(columns: list[str]) -> Any:
+    pa = _pyarrow()
+    category = pa.dictionary(pa.int32(), pa.string())
+
+    def column_type(name: str) -> Any:
+        if name in CATEGORIES:
+            return category
+        if name in FLOAT32:
+            return pa.float32()
+        if name == "is_fallback":
+            return pa.bool_()
+        if name == "created_at":
+            return pa.timestamp("us", tz="UTC")
+        if name in ("agent_index", "age"):
+            return pa.int32()
+        return pa.string()
+
+    return pa.schema([(name, column_type(name)) for name in columns])
+
+
+# ── Private helpers ──────────────────────────────────────
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError:
+        raise FeatureUnavailableError(
+            "Columnar exports need the pyarrow package (pip install '.[export]')"
+        )
+    return pyarrow
+
+
+def _batches(rows: Iterable[dict[str, Any]], schema: Any) -> Iterator[Any]:
+    pa = _pyarrow()
+    pending: list[dict[str, Any]] = []
+    for row in rows:
+        created_at = row.get("created_at")
+        if isinstance(created_at, str):
+            row["created_at"] = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        pending.append(row)
+        if len(pending) >= BATCH_ROWS:
+            yield pa.RecordBatch.from_pylist(pending, schema=schema)
+            pending = []
+    if pending:
+        yield pa.RecordBatch.from_pylist(pending, schema=schema)
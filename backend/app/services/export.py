@@ -0,0 +1,117 @@
+"""Streaming export of a survey's responses as NDJSON or CSV.
+
+Rows are read page by page from the repositories and encoded as they
+arrive, a few hundred per chunk, so memory stays flat whatever the survey
+size and the first bytes leave after the first page. Joining demographics
+keeps one small row per agent in memory, never the responses.
+"""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from typing import Any, Literal
+
+import orjson
+
+from app.domain.entities.survey import Survey
+from app.services.survey_service import SurveyService
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+TEXT_COLUMNS = ("id", "agent_id", "stance", "confidence", "short_reason", "is_fallback")
+QUESTION_COLUMNS = (
+    "id",
+    "agent_id",
+    "question_id",
+    "answer",
+    "confidence",
+    "short_reason",
+    "is_fallback",
+)
+AGENT_COLUMNS = (
+    "agent_index",
+    "age",
+    "education",
+    "urban_rural",
+    "classe_sociale",
+    "eco",
+    "open",
+    "trust",
+    "temperament",
+)
+CHUNK_ROWS = 500
+
+
+def export_columns(survey: Survey, include_agents: bool, include_raw: bool) -> list[str]:
+    columns = list(QUESTION_COLUMNS if survey.mode == "questionnaire" else TEXT_COLUMNS)
+    if include_raw:
+        columns.append("raw_llm_output")
+    columns.append("created_at")
+    if include_agents:
+        columns.extend(AGENT_COLUMNS)
+    return columns
+
+
+def stream_export(
+    svc: SurveyService,
+    survey: Survey,
+    fmt: ExportFormat,
+    include_agents: bool = False,
+    include_raw: bool = False,
+) -> Iterator[bytes]:
+    columns = export_columns(survey, include_agents, include_raw)
+    rows = export_rows(svc, survey, columns, include_agents)
+    if fmt == "csv":
+        return _csv_chunks(rows, columns)
+    return _ndjson_chunks(rows)
+
+
+def export_rows(
+    svc: SurveyService,
+    survey: Survey,
+    columns: list[str],
+    include_agents: bool,
+) -> Iterator[dict[str, Any]]:
+    """Response rows restricted to `columns`, joined with their agent if asked."""
+    own = [c for c in columns if c not in AGENT_COLUMNS]
+    if not include_agents:
+        for row in svc.iter_result_rows(survey, own):
+            yield {c: row.get(c) for c in own}
+        return
+    agents = {a["id"]: a for a in svc.iter_agent_rows(survey.id, ["id", *AGENT_COLUMNS])}
+    for row in svc.iter_result_rows(survey, own):
+        agent = agents.get(row.get("agent_id"), {})
+        yield {c: row.get(c) for c in own} | {c: agent.get(c) for c in AGENT_COLUMNS}
+
+
+# ── Private helpers ──────────────────────────────────────
+
+
+def _ndjson_chunks(rows: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    chunk = bytearray()
+    for count, row in enumerate(rows, 1):
+        chunk += orjson.dumps(row)
+        chunk += b"\n"
+        if count % CHUNK_ROWS == 0:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+def _csv_chunks(rows: Iterable[dict[str, Any]], columns: list[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n")
+    writer.writeheader()
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
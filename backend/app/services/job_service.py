@@ -0,0 +1,73 @@
+from app.core.errors import ConflictError, NotFoundError, ValidationError
+from app.core.logging import get_logger
+from app.domain.entities.job import Job
+from app.domain.entities.survey import Survey
+from app.infrastructure.queue.sqlite_queue import SQLiteJobQueue
+from app.services.survey_service import SurveyService
+
+logger = get_logger(__name__)
+
+SURVEY_RUN = "survey_run"
+
+RUNNABLE_STATUSES = ("pending", "failed")
+
+# The survey status is a projection of the state of its latest run job.
+JOB_TO_SURVEY_STATUS: dict[str, str] = {
+    "queued": "pending",
+    "leased": "running",
+    "succeeded": "completed",
+    "failed": "failed",
+    "cancelled": "failed",
+}
+
+
+class SurveyJobService:
+    def __init__(
+        self,
+        surveys: SurveyService,
+        queue: SQLiteJobQueue,
+        max_attempts: int = 3,
+    ):
+        self._surveys = surveys
+        self._queue = queue
+        self._max_attempts = max_attempts
+
+    def submit_run(self, survey_id: str) -> Job:
+        survey = self._surveys.get_survey(survey_id)
+        if survey.status not in RUNNABLE_STATUSES:
+            raise ConflictError(f"Survey {survey_id} is {survey.status}, cannot run it")
+        if survey.mode == "text" and not survey.input_text:
+            raise ValidationError("Text surveys need an input_text to run")
+        if survey.mode == "questionnaire" and not self._surveys.get_questions(survey_id):
+            raise ValidationError("Questionnaire surveys need at least one question to run")
+
+        job = self._queue.enqueue(SURVEY_RUN, survey_id, max_attempts=self._max_attempts)
+        self.sync_survey_status(job)
+        logger.info(f"Survey run queued: {survey_id} (job {job.id})")
+        return job
+
+    def get_job(self, survey_id: str) -> Job:
+        job = self._queue.get_latest_for_survey(survey_id)
+        if job is None:
+            raise NotFoundError(f"No run job for survey {survey_id}")
+        return job
+
+    def cancel_run(self, survey_id: str) -> Job:
+        job = self.get_job(survey_id)
+        if job.status not in ("queued", "leased"):
+            raise ConflictError(f"Run job {job.id} is already {job.status}")
+        job = self._queue.cancel(job.id)
+        if job.status == "cancelled":
+            self.sync_survey_status(job)
+        logger.info(f"Survey run cancellation requested: {survey_id} (job {job.id})")
+        return job
+
+    def sync_survey_status(self, job: Job, elapsed_seconds: float | None = None) -> Survey:
+        status = JOB_TO_SURVEY_STATUS[job.status]
+        if status == "running":
+            return self._surveys.mark_running(job.survey_id)
+        if status == "completed":
+            return self._surveys.mark_completed(job.survey_id, elapsed_seconds or 0.0)
+        if status == "failed":
+            return self._surveys.mark_failed(job.survey_id)
+        return self._surveys.mark_pending(job.survey_id)
@@ -0,0 +1,57 @@
+from typing import Any
+
+from app.domain.entities.survey_question import SurveyQuestion
+
+DEFAULT_LIKERT_SCALE = [1, 2, 3, 4, 5]
+
+
+def persona_system_prompt(agent: dict[str, Any]) -> str:
+    """System prompt describing the agent the LLM must role-play."""
+    return (
+        "Tu incarnes un citoyen français virtuel répondant à un sondage.\n"
+        f"Profil : {agent['background']}\n"
+        f"Axe économique (-1 gauche, +1 droite) : {agent['eco']}\n"
+        f"Ouverture (-1 conservateur, +1 progressiste) : {agent['open']}\n"
+        f"Confiance dans les institutions (0 à 1) : {agent['trust']}\n"
+        f"Tempérament (0 modéré, 1 radical) : {agent['temperament']}\n"
+        "Réponds uniquement avec un objet JSON, sans texte autour."
+    )
+
+
+def text_prompt(input_text: str) -> str:
+    return (
+        f'Affirmation : "{input_text}"\n'
+        "Donne ta position sous la forme "
+        '{"stance": "agree" | "disagree" | "mixed", '
+        '"confidence": nombre entre 0 et 1, '
+        '"short_reason": "justification en une phrase (180 caractères max)"}'
+    )
+
+
+def question_prompt(question: SurveyQuestion) -> str:
+    return (
+        f'Question : "{question.text}"\n'
+        "Réponds sous la forme "
+        f'{{"answer": {_answer_spec(question)}, '
+        '"confidence": nombre entre 0 et 1, '
+        '"short_reason": "justification en une phrase (180 caractères max)"}'
+    )
+
+
+def packed_questions_prompt(questions: list[SurveyQuestion]) -> str:
+    """Every question of the survey in one prompt, answered as one JSON object."""
+    items = "\n".join(f'- "{q.question_id}" : "{q.text}" → {_answer_spec(q)}' for q in questions)
+    return (
+        f"Questionnaire :\n{items}\n"
+        "Réponds à toutes les questions, dans l'ordre, sous la forme "
+        '{"<question_id>": {"answer": ..., "confidence": nombre entre 0 et 1, '
+        '"short_reason": "justification en une phrase (180 caractères max)"}, ...}'
+    )
+
+
+def _answer_spec(question: SurveyQuestion) -> str:
+    if question.type == "stance":
+        return '"agree" | "disagree" | "mixed"'
+    if question.type == "likert":
+        return f"un entier parmi {question.scale or DEFAULT_LIKERT_SCALE}"
+    return "une valeur parmi " + ", ".join(f'"{c}"' for c in question.choices or [])
@@ -0,0 +1,91 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from app.core.logging import get_logger
+from app.services.realtime_service import BATCH_EVENT, COALESCIBLE_TYPES, RealtimeService
+
+logger = get_logger(__name__)
+
+DEFAULT_COALESCED_TYPES = COALESCIBLE_TYPES
+
+
+@dataclass
+class _Buffer:
+    events: list[dict[str, Any]] = field(default_factory=list)
+    latest: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+class RealtimeBatcher:
+    """Buffers events per experiment and publishes them as one `batch` message.
+
+    Buffers are flushed every `interval` seconds, or as soon as one holds
+    `max_batch_size` events. Events whose type is in `coalesced_types` (progress
+    counters) only keep their latest value within a batch, at the position of
+    that latest event. Exposes the same `broadcast` signature as
+    `RealtimeService`, so producers can use either.
+    """
+
+    def __init__(
+        self,
+        realtime: RealtimeService,
+        interval: float = 0.1,
+        max_batch_size: int = 100,
+        coalesced_types: frozenset[str] = DEFAULT_COALESCED_TYPES,
+    ):
+        self._realtime = realtime
+        self._interval = interval
+        self._max_batch_size = max_batch_size
+        self._coalesced_types = coalesced_types
+        self._buffers: dict[str, _Buffer] = {}
+        self._task: asyncio.Task | None = None
+
+    async def broadcast(
+        self,
+        experiment_id: str,
+        event_type: str,
+        data: dict[str, Any],
+    ) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._tick())
+
+        buffer = self._buffers.setdefault(experiment_id, _Buffer())
+        event = {"type": event_type, "data": data, "ts": datetime.utcnow().isoformat()}
+        if event_type in self._coalesced_types:
+            # The new value moves to the end, after the events it follows.
+            superseded = buffer.latest.get(event_type)
+            if superseded is not None:
+                buffer.events.remove(superseded)
+            buffer.latest[event_type] = event
+        buffer.events.append(event)
+
+        if len(buffer.events) >= self._max_batch_size:
+            await self.flush(experiment_id)
+
+    async def flush(self, experiment_id: str | None = None) -> None:
+        """Publish pending events of one experiment, or of all of them."""
+        experiment_ids = [experiment_id] if experiment_id else list(self._buffers)
+        for eid in experiment_ids:
+            buffer = self._buffers.pop(eid, None)
+            if buffer and buffer.events:
+                await self._realtime.broadcast(eid, BATCH_EVENT, {"events": buffer.events})
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        await self._realtime.close()
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Realtime batch flush failed")
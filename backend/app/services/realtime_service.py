@@ -1,26 +1,185 @@
+import asyncio
 import json
+from collections import deque
+from collections.abc import Callable
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from fastapi import WebSocket
 
+from app.core.logging import get_logger
+from app.infrastructure.pubsub.base import Broker
+from app.infrastructure.pubsub.memory_broker import InProcessBroker
+
+logger = get_logger(__name__)
+
+OverflowPolicy = Literal["drop_oldest", "drop_newest", "coalesce"]
+
+BATCH_EVENT = "batch"
+# Events that only report a state superseded by the next one of their type.
+COALESCIBLE_TYPES = frozenset({"progress"})
+# Under `coalesce`, a send queue this many times over its size evicts the client.
+HARD_CAP_FACTOR = 4
+
+
+class _Subscriber:
+    """One websocket with its own bounded send queue and writer task.
+
+    When the queue is full, `policy` decides what is lost: the oldest pending
+    message, the new one, or (`coalesce`) a pending progress message, which
+    the newer ones supersede. Under `coalesce`, the new message is always
+    queued and nothing else (status changes, batches holding such events) is
+    ever dropped: the queue may then grow past its size, up to
+    `HARD_CAP_FACTOR` times, at which point the client is evicted.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        queue_size: int,
+        policy: OverflowPolicy,
+        send_timeout: float,
+        on_evict: Callable[["_Subscriber"], None],
+    ):
+        self.websocket = websocket
+        self.dropped = 0
+        # (coalesce key, message): the key is read once, not on every overflow.
+        self._queue: deque[tuple[str | None, str]] = deque()
+        self._queue_size = queue_size
+        self._policy = policy
+        self._send_timeout = send_timeout
+        self._on_evict = on_evict
+        self._ready = asyncio.Event()
+        self._task = asyncio.create_task(self._write())
+        self._closing: asyncio.Task | None = None
+
+    def push(self, message: str, coalesce_key: str | None = None) -> None:
+        if self._closing is not None:
+            return
+        if len(self._queue) >= self._queue_size:
+            if self._policy == "coalesce":
+                self._coalesce(coalesce_key)
+                if len(self._queue) >= self._queue_size * HARD_CAP_FACTOR:
+                    self._evict()
+                    return
+            else:
+                self.dropped += 1
+                if self._policy == "drop_newest":
+                    return
+                self._queue.popleft()
+        self._queue.append((coalesce_key, message))
+        self._ready.set()
+
+    def stop(self) -> None:
+        self._task.cancel()
+
+    def _evict(self) -> None:
+        """Close a client that drains each message just in time but never catches up."""
+        logger.info("Evicting websocket client: send queue over its hard cap")
+        self.dropped += len(self._queue) + 1
+        self._queue.clear()
+        self._task.cancel()
+        self._on_evict(self)
+        self._closing = asyncio.create_task(self._close())
+
+    def _coalesce(self, key: str | None) -> None:
+        """Drop the pending message superseded by one with `key`, if any.
+
+        A progress message supersedes the pending one of the same key; any
+        other message takes the place of the oldest pending progress message.
+        """
+        for i, (pending_key, _) in enumerate(self._queue):
+            if pending_key is not None and (key is None or pending_key == key):
+                del self._queue[i]
+                self.dropped += 1
+                return
+
+    async def _write(self) -> None:
+        while True:
+            await self._ready.wait()
+            while self._queue:
+                _, message = self._queue.popleft()
+                try:
+                    await asyncio.wait_for(
+                        self.websocket.send_text(message),
+                        timeout=self._send_timeout,
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.info(f"Evicting websocket client: {type(e).__name__}")
+                    self._on_evict(self)
+                    await self._close()
+                    return
+            self._ready.clear()
+
+    async def _close(self) -> None:
+        try:
+            await asyncio.wait_for(self.websocket.close(code=1008), timeout=1.0)
+        except Exception:
+            pass
+
+
+def _coalesce_key(message: str) -> str | None:
+    """Key under which a pending message can be superseded, None if it must be sent."""
+    try:
+        payload = json.loads(message)
+        event_type = payload.get("type")
+        if event_type == BATCH_EVENT:
+            events = payload["data"]["events"]
+            coalescible = bool(events) and all(e["type"] in COALESCIBLE_TYPES for e in events)
+            return BATCH_EVENT if coalescible else None
+    except (ValueError, AttributeError, KeyError, TypeError):
+        return None
+    return event_type if event_type in COALESCIBLE_TYPES else None
+
 
 class RealtimeService:
-    def __init__(self):
-        self._connections: dict[str, list[WebSocket]] = {}
+    """Websocket fan-out for experiment events.
+
+    Events go through the broker rather than straight to the sockets, so an
+    event produced in one process (API worker or survey worker) reaches the
+    clients connected to any other process subscribed to the same experiment.
+    Delivery only enqueues on each client's send queue: a slow client never
+    delays the others.
+    """
+
+    def __init__(
+        self,
+        broker: Broker | None = None,
+        send_queue_size: int = 100,
+        overflow_policy: OverflowPolicy = "coalesce",
+        send_timeout: float = 5.0,
+    ):
+        self._broker = broker or InProcessBroker()
+        self._started = False
+        self._connections: dict[str, list[_Subscriber]] = {}
+        self._send_queue_size = send_queue_size
+        self._overflow_policy = overflow_policy
+        self._send_timeout = send_timeout
+        self._dropped_evicted = 0
 
     async def connect(self, experiment_id: str, websocket: WebSocket) -> None:
         await websocket.accept()
+        await self._ensure_started()
         if experiment_id not in self._connections:
             self._connections[experiment_id] = []
-        self._connections[experiment_id].append(websocket)
+            self._broker.subscribe(experiment_id)
+        self._connections[experiment_id].append(
+            _Subscriber(
+                websocket,
+                queue_size=self._send_queue_size,
+                policy=self._overflow_policy,
+                send_timeout=self._send_timeout,
+                on_evict=lambda sub: self._remove(experiment_id, sub),
+            )
+        )
 
     def disconnect(self, experiment_id: str, websocket: WebSocket) -> None:
-        if experiment_id in self._connections:
-            if websocket in self._connections[experiment_id]:
-                self._connections[experiment_id].remove(websocket)
-            if not self._connections[experiment_id]:
-                del self._connections[experiment_id]
+        for subscriber in list(self._connections.get(experiment_id, [])):
+            if subscriber.websocket is websocket:
+                subscriber.stop()
+                self._remove(experiment_id, subscriber)
 
     async def broadcast(
         self,
@@ -28,9 +187,7 @@ class RealtimeService:
         event_type: str,
         data: dict[str, Any],
     ) -> None:
-        if experiment_id not in self._connections:
-            return
-
+        await self._ensure_started()
         message = json.dumps(
             {
                 "type": event_type,
@@ -38,16 +195,52 @@ class RealtimeService:
                 "ts": datetime.utcnow().isoformat(),
             }
         )
+        await self._broker.publish(experiment_id, message)
 
-        dead_connections: list[WebSocket] = []
-        for websocket in self._connections[experiment_id]:
-            try:
-                await websocket.send_text(message)
-            except Exception:
-                dead_connections.append(websocket)
-
-        for ws in dead_connections:
-            self.disconnect(experiment_id, ws)
+    async def close(self) -> None:
+        for experiment_id in list(self._connections):
+            for subscriber in list(self._connections.get(experiment_id, [])):
+                subscriber.stop()
+                self._remove(experiment_id, subscriber)
+        if self._started:
+            await self._broker.close()
+            self._started = False
 
     def get_connection_count(self, experiment_id: str) -> int:
         return len(self._connections.get(experiment_id, []))
+
+    @property
+    def dropped(self) -> int:
+        """Messages lost to full send queues since start, across all clients."""
+        live = sum(s.dropped for subs in self._connections.values() for s in subs)
+        return self._dropped_evicted + live
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "connections": sum(len(subs) for subs in self._connections.values()),
+            "dropped": self.dropped,
+        }
+
+    async def _ensure_started(self) -> None:
+        if not self._started:
+            self._started = True
+            await self._broker.start(self._deliver)
+
+    async def _deliver(self, experiment_id: str, message: str) -> None:
+        subscribers = self._connections.get(experiment_id, [])
+        if not subscribers:
+            return
+        key = _coalesce_key(message) if self._overflow_policy == "coalesce" else None
+        for subscriber in list(subscribers):
+            subscriber.push(message, key)
+
+    def _remove(self, experiment_id: str, subscriber: _Subscriber) -> None:
+        subscribers = self._connections.get(experiment_id)
+        if subscribers is None:
+            return
+        if subscriber in subscribers:
+            subscribers.remove(subscriber)
+            self._dropped_evicted += subscriber.dropped
+        if not subscribers:
+            del self._connections[experiment_id]
+            self._broker.unsubscribe(experiment_id)
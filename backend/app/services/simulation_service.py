@@ -0,0 +1,359 @@
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.logging import get_logger
+from app.domain.entities.survey import Survey
+from app.domain.entities.survey_question import SurveyQuestion
+from app.infrastructure.llm.base import AsyncLLMProvider
+from app.infrastructure.llm.cache import CachedLLMClient, LLMResponseCache
+from app.infrastructure.llm.router import LLMRouter
+from app.infrastructure.llm.single_flight import SingleFlightLLMClient
+from app.services.agent_factory import generate_agents
+from app.services.answer_parsing import (
+    ParseStats,
+    parse_packed_answers,
+    parse_question_answer,
+    parse_text_answer,
+)
+from app.services.prompts import (
+    packed_questions_prompt,
+    persona_system_prompt,
+    question_prompt,
+    text_prompt,
+)
+from app.services.realtime_batcher import RealtimeBatcher
+from app.services.survey_service import SurveyService
+
+logger = get_logger(__name__)
+
+LLMFactory = Callable[[str], AsyncLLMProvider]
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+Call = Callable[[], Awaitable[list[dict[str, Any]]]]
+# Parse tally of the model that answered (prompt, system_prompt, max_tokens).
+ParseStatsFor = Callable[[str, str, int], ParseStats]
+
+
+@dataclass
+class SimulationResult:
+    responses: int
+    elapsed_seconds: float
+    llm_stats: dict[str, Any] = field(default_factory=dict)
+
+
+class SimulationService:
+    """Runs a survey end to end: agents, LLM fan-out, chunked inserts, aggregates.
+
+    Status transitions are not handled here: they follow the job that drives
+    the run (see `SurveyJobService`).
+    """
+
+    def __init__(
+        self,
+        surveys: SurveyService,
+        llm_factory: LLMFactory,
+        realtime: RealtimeBatcher | None = None,
+        max_concurrency: int = 16,
+        chunk_size: int = 200,
+        llm_cache: LLMResponseCache | None = None,
+        llm_provider: str = "",
+    ):
+        self._surveys = surveys
+        self._llm_factory = llm_factory
+        self._realtime = realtime
+        self._llm_cache = llm_cache
+        self._llm_provider = llm_provider
+        self._max_concurrency = max_concurrency
+        self._chunk_size = chunk_size
+
+    async def execute(
+        self,
+        survey_id: str,
+        on_progress: ProgressCallback | None = None,
+    ) -> SimulationResult:
+        """Run the whole simulation and return once aggregates are stored.
+
+        Any partial output of a previous attempt is cleared first, so a job can
+        safely be retried. LLM answers go through the response cache, and
+        identical prompts in flight share one upstream call, unless the survey
+        sets `"llm_cache": false` / `"llm_dedup": false` in its parameters.
+        Questionnaires with `"pack_questions": true` ask every question of an
+        agent in a single call. Parse outcomes are added to the per-model
+        totals kept in the LLM cache file.
+        """
+        start = time.perf_counter()
+        survey = await asyncio.to_thread(self._surveys.get_survey, survey_id)
+        await asyncio.to_thread(self._surveys.reset_results, survey_id)
+        params = survey.parameters or {}
+        questions: list[SurveyQuestion] = []
+        if survey.mode != "text":
+            questions = await asyncio.to_thread(self._surveys.get_questions, survey_id)
+        llm, layers = self._llm_client(survey, questions, params)
+        temperature = float(params.get("temperature", 0.7))
+        max_tokens = int(params.get("max_tokens", 256))
+
+        agents = generate_agents(survey_id, survey.n_agents, survey.seed)
+        for i in range(0, len(agents), self._chunk_size):
+            chunk = agents[i : i + self._chunk_size]
+            await asyncio.to_thread(self._surveys.store_agents, survey_id, chunk)
+        await self._emit(survey_id, "agents_created", {"count": len(agents)})
+
+        served_by = next(
+            (layer.served_by for layer in layers if isinstance(layer, LLMRouter)), None
+        )
+        by_model: dict[str, ParseStats] = {}
+
+        def parsing(prompt: str, system_prompt: str, tokens: int) -> ParseStats:
+            model = None
+            if served_by is not None:
+                model = served_by(prompt, system_prompt, temperature, tokens)
+            return by_model.setdefault(model or survey.model, ParseStats())
+
+        if survey.mode == "text":
+            calls = self._text_calls(survey, agents, llm, parsing, temperature, max_tokens)
+            store = self._surveys.store_responses
+            total = len(agents)
+        else:
+            build = (
+                self._packed_calls if params.get("pack_questions") else self._questionnaire_calls
+            )
+            calls = build(questions, agents, llm, parsing, temperature, max_tokens)
+            store = self._surveys.store_question_responses
+            total = len(agents) * len(questions)
+        total = await self._fan_out(survey_id, calls, total, store, on_progress)
+
+        await asyncio.to_thread(self._surveys.finalize_aggregates, survey_id)
+        if self._llm_cache is not None:
+            await asyncio.to_thread(self._llm_cache.flush_stats)
+            await asyncio.to_thread(
+                self._llm_cache.record_parsing,
+                {model: dict(stats.methods) for model, stats in by_model.items()},
+            )
+        elapsed = round(time.perf_counter() - start, 3)
+        llm_stats = {key: value for layer in layers for key, value in layer.stats().items()}
+        run_parsing = ParseStats(sum((stats.methods for stats in by_model.values()), Counter()))
+        llm_stats.update(run_parsing.as_dict())
+        await self._emit(survey_id, "llm_stats", llm_stats)
+        logger.info(f"Survey {survey_id} simulated: {total} responses in {elapsed}s {llm_stats}")
+        return SimulationResult(responses=total, elapsed_seconds=elapsed, llm_stats=llm_stats)
+
+    def _llm_client(
+        self, survey: Survey, questions: list[SurveyQuestion], params: dict[str, Any]
+    ) -> tuple[AsyncLLMProvider, list[CachedLLMClient | SingleFlightLLMClient | LLMRouter]]:
+        """Provider client wrapped in the cache and dedup layers the survey allows.
+
+        Behind a router, the model that answers is only known once a provider
+        is picked: responses are then cached per provider, under its own model.
+        Replies that would parse to a fallback are not cached.
+        """
+        cache = self._llm_cache if params.get("llm_cache", True) else None
+        usable = _usable_reply(survey, questions)
+
+        def cached(inner: AsyncLLMProvider, provider: str, model: str) -> CachedLLMClient:
+            return CachedLLMClient(
+                inner,
+                cache,
+                provider=provider,
+                model=model,
+                seed=survey.seed,
+                max_concurrency=self._max_concurrency,
+                accept=usable,
+            )
+
+        llm: AsyncLLMProvider = self._llm_factory(survey.model)
+        layers: list[CachedLLMClient | SingleFlightLLMClient | LLMRouter] = []
+        if isinstance(llm, LLMRouter):
+            llm = llm.session(
+                (lambda p: cached(p.client, p.name, p.model)) if cache is not None else None
+            )
+            layers.append(llm)
+        elif cache is not None:
+            llm = cached(llm, self._llm_provider, survey.model)
+            layers.append(llm)
+        if params.get("llm_dedup", True):
+            # Outermost, so collapsed duplicates do not even reach the cache.
+            llm = SingleFlightLLMClient(llm, max_concurrency=self._max_concurrency)
+            layers.append(llm)
+        return llm, layers
+
+    # ── Modes ────────────────────────────────────────────
+
+    def _text_calls(
+        self,
+        survey: Survey,
+        agents: list[dict[str, Any]],
+        llm: AsyncLLMProvider,
+        parsing: ParseStatsFor,
+        temperature: float,
+        max_tokens: int,
+    ) -> list[Call]:
+        prompt = text_prompt(survey.input_text or "")
+
+        async def answer(agent: dict[str, Any]) -> list[dict[str, Any]]:
+            system_prompt = persona_system_prompt(agent)
+            raw = await llm.generate(
+                prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            stats = parsing(prompt, system_prompt, max_tokens)
+            return [{"agent_id": agent["id"], **parse_text_answer(raw, stats)}]
+
+        return [lambda a=a: answer(a) for a in agents]
+
+    def _questionnaire_calls(
+        self,
+        questions: list[SurveyQuestion],
+        agents: list[dict[str, Any]],
+        llm: AsyncLLMProvider,
+        parsing: ParseStatsFor,
+        temperature: float,
+        max_tokens: int,
+    ) -> list[Call]:
+        prompts = {q.question_id: question_prompt(q) for q in questions}
+
+        async def answer(agent: dict[str, Any], question: SurveyQuestion) -> list[dict[str, Any]]:
+            prompt = prompts[question.question_id]
+            system_prompt = persona_system_prompt(agent)
+            raw = await llm.generate(
+                prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            stats = parsing(prompt, system_prompt, max_tokens)
+            return [
+                {
+                    "agent_id": agent["id"],
+                    "question_id": question.question_id,
+                    **parse_question_answer(question, raw, stats),
+                }
+            ]
+
+        return [lambda a=a, q=q: answer(a, q) for a in agents for q in questions]
+
+    def _packed_calls(
+        self,
+        questions: list[SurveyQuestion],
+        agents: list[dict[str, Any]],
+        llm: AsyncLLMProvider,
+        parsing: ParseStatsFor,
+        temperature: float,
+        max_tokens: int,
+    ) -> list[Call]:
+        """One call per agent answering the whole questionnaire.
+
+        `max_tokens` stays a per-answer budget. Items missing or invalid in the
+        packed answer are asked again one by one, and fall back only if that
+        second answer is invalid too.
+        """
+        packed_prompt = packed_questions_prompt(questions)
+        prompts = {q.question_id: question_prompt(q) for q in questions}
+
+        async def answer(agent: dict[str, Any]) -> list[dict[str, Any]]:
+            system_prompt = persona_system_prompt(agent)
+            packed_tokens = max_tokens * len(questions)
+            raw = await llm.generate(
+                packed_prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=packed_tokens,
+            )
+            stats = parsing(packed_prompt, system_prompt, packed_tokens)
+            parsed = parse_packed_answers(questions, raw, stats)
+            rows = []
+            for question in questions:
+                result = parsed.get(question.question_id)
+                if result is None:
+                    prompt = prompts[question.question_id]
+                    retry = await llm.generate(
+                        prompt,
+                        system_prompt=system_prompt,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    )
+                    stats = parsing(prompt, system_prompt, max_tokens)
+                    result = parse_question_answer(question, retry, stats)
+                rows.append(
+                    {"agent_id": agent["id"], "question_id": question.question_id, **result}
+                )
+            return rows
+
+        return [lambda a=a: answer(a) for a in agents]
+
+    async def _fan_out(
+        self,
+        survey_id: str,
+        calls: list[Call],
+        total: int,
+        store: Callable[[str, list[dict[str, Any]]], int],
+        on_progress: ProgressCallback | None,
+    ) -> int:
+        """Run LLM calls with bounded concurrency and stream rows out in chunks.
+
+        `total` is the number of rows the calls produce. A `progress` event is
+        emitted per completed call; the batcher keeps only the latest of them
+        in each frame it publishes.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def bounded(call: Call) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await call()
+
+        done = 0
+        stored = 0
+        buffer: list[dict[str, Any]] = []
+        tasks = [asyncio.create_task(bounded(call)) for call in calls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                rows = await next_done
+                buffer.extend(rows)
+                done += len(rows)
+                if len(buffer) >= self._chunk_size:
+                    stored += await asyncio.to_thread(store, survey_id, buffer)
+                    buffer = []
+                    if on_progress is not None:
+                        await on_progress(stored, total)
+                await self._emit(
+                    survey_id,
+                    "progress",
+                    {"done": done, "stored": stored, "total": total},
+                )
+            if buffer:
+                stored += await asyncio.to_thread(store, survey_id, buffer)
+                if on_progress is not None:
+                    await on_progress(stored, total)
+                await self._emit(
+                    survey_id,
+                    "progress",
+                    {"done": done, "stored": stored, "total": total},
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+        return stored
+
+    async def _emit(self, survey_id: str, event_type: str, data: dict[str, Any]) -> None:
+        if self._realtime is not None:
+            await self._realtime.broadcast(survey_id, event_type, data)
+
+
+def _usable_reply(survey: Survey, questions: list[SurveyQuestion]) -> Callable[[str, str], bool]:
+    """Whether a raw reply to one of the run's prompts parses without a fallback."""
+    if survey.mode == "text":
+        return lambda prompt, raw: not parse_text_answer(raw)["is_fallback"]
+    packed = packed_questions_prompt(questions)
+    by_prompt = {question_prompt(q): q for q in questions}
+
+    def usable(prompt: str, raw: str) -> bool:
+        if prompt == packed:
+            return len(parse_packed_answers(questions, raw)) == len(questions)
+        question = by_prompt.get(prompt)
+        return question is None or not parse_question_answer(question, raw)["is_fallback"]
+
+    return usable
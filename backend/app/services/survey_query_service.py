@@ -0,0 +1,37 @@
+from app.domain.entities.survey import Survey
+from app.domain.entities.survey_aggregate import SurveyAggregate
+from app.domain.entities.survey_question import SurveyQuestion
+from app.repositories.survey_aggregate_repo import AsyncSurveyAggregateRepository
+from app.repositories.survey_question_repo import AsyncSurveyQuestionRepository
+from app.repositories.survey_repo import AsyncSurveyRepository
+
+
+class SurveyQueryService:
+    """Read-only survey queries awaited directly by `async def` endpoints."""
+
+    def __init__(
+        self,
+        survey_repo: AsyncSurveyRepository,
+        question_repo: AsyncSurveyQuestionRepository,
+        aggregate_repo: AsyncSurveyAggregateRepository,
+    ):
+        self._surveys = survey_repo
+        self._questions = question_repo
+        self._aggregates = aggregate_repo
+
+    async def get_survey(self, survey_id: str) -> Survey:
+        return await self._surveys.get_survey(survey_id)
+
+    async def list_surveys(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        created_by: str | None = None,
+    ) -> list[Survey]:
+        return await self._surveys.list_surveys(limit=limit, offset=offset, created_by=created_by)
+
+    async def get_questions(self, survey_id: str) -> list[SurveyQuestion]:
+        return await self._questions.list_by_survey(survey_id)
+
+    async def get_aggregates(self, survey_id: str) -> list[SurveyAggregate]:
+        return await self._aggregates.get_aggregates(survey_id)
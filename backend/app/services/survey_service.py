@@ -1,3 +1,5 @@
+import time
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
@@ -10,6 +12,8 @@ from app.repositories.survey_aggregate_repo import SurveyAggregateRepository
 from app.repositories.survey_question_repo import SurveyQuestionRepository
 from app.repositories.survey_question_response_repo import SurveyQuestionResponseRepository
 from app.repositories.survey_repo import SurveyRepository
+from app.services.aggregation import LiveAggregates
+from app.services.aggregation_engine import question_aggregation, text_aggregation
 
 logger = get_logger(__name__)
 
@@ -23,6 +27,8 @@ class SurveyService:
         aggregate_repo: SurveyAggregateRepository,
         question_repo: SurveyQuestionRepository,
         question_response_repo: SurveyQuestionResponseRepository,
+        live_aggregates: LiveAggregates | None = None,
+        snapshot_interval: float = 2.0,
     ):
         self._surveys = survey_repo
         self._agents = agent_repo
@@ -30,6 +36,8 @@ class SurveyService:
         self._aggregates = aggregate_repo
         self._questions = question_repo
         self._question_responses = question_response_repo
+        self._live = live_aggregates or LiveAggregates()
+        self._snapshot_interval = snapshot_interval
 
     # ── CRUD ─────────────────────────────────────────────
 
@@ -69,7 +77,7 @@ class SurveyService:
                         "scale": q.get("scale"),
                     }
                 )
-            self._questions.create_questions_batch(q_rows)
+            self._questions.create_questions_batch(q_rows, returning=False)
         logger.info(f"Survey created: {survey.id} ({survey.mode})")
         return survey
 
@@ -92,8 +100,19 @@ class SurveyService:
         self._surveys.delete_survey(survey_id)
         logger.info(f"Survey deleted: {survey_id}")
 
+    def reset_results(self, survey_id: str) -> None:
+        self._live.discard(survey_id)
+        self._aggregates.delete_by_survey(survey_id)
+        deleted = self._question_responses.delete_by_survey(survey_id)
+        deleted += self._responses.delete_responses_by_survey(survey_id)
+        deleted += self._agents.delete_agents_by_survey(survey_id)
+        logger.info(f"Survey results reset: {survey_id} ({deleted} row(s) deleted)")
+
     # ── Status transitions ───────────────────────────────
 
+    def mark_pending(self, survey_id: str) -> Survey:
+        return self._surveys.update_survey(survey_id, {"status": "pending"})
+
     def mark_running(self, survey_id: str) -> Survey:
         return self._surveys.update_survey(
             survey_id,
@@ -131,162 +150,113 @@ class SurveyService:
     def store_agents(self, survey_id: str, agents_data: list[dict[str, Any]]) -> int:
         for a in agents_data:
             a["survey_id"] = survey_id
-        self._agents.create_agents_batch(agents_data)
-        return len(agents_data)
+        return self._agents.create_agents_batch(agents_data, returning=False)
 
     def get_agents(self, survey_id: str) -> list:
-        return self._agents.list_agents_by_survey(survey_id)
+        return list(self._agents.iter_agents_by_survey(survey_id))
 
     # ── Responses (mode text) ────────────────────────────
 
     def store_responses(self, survey_id: str, responses: list[dict[str, Any]]) -> int:
         for r in responses:
             r["survey_id"] = survey_id
-        self._responses.create_responses_batch(responses)
-        return len(responses)
+        written = self._responses.create_responses_batch(responses, returning=False)
+        aggregator = self._live.get_or_create(survey_id)
+        aggregator.add_responses(responses)
+        self._maybe_persist_snapshot(survey_id)
+        return written
 
-    def get_responses(self, survey_id: str) -> list:
-        return self._responses.list_responses_by_survey(survey_id)
+    def get_responses(self, survey_id: str, include_raw: bool = True) -> list:
+        return list(self._responses.iter_responses_by_survey(survey_id, include_raw=include_raw))
+
+    def get_response_rows(self, survey_id: str, fields: list[str]) -> list[dict[str, Any]]:
+        return list(self._responses.iter_rows_by_survey(survey_id, fields))
 
     # ── Responses (mode questionnaire) ───────────────────
 
     def store_question_responses(self, survey_id: str, rows: list[dict[str, Any]]) -> int:
         for r in rows:
             r["survey_id"] = survey_id
-        self._question_responses.create_batch(rows)
-        return len(rows)
+        written = self._question_responses.create_batch(rows, returning=False)
+        aggregator = self._live.get(survey_id)
+        if aggregator is None:
+            questions = self._questions.list_by_survey(survey_id)
+            aggregator = self._live.get_or_create(survey_id, questions)
+        aggregator.add_question_responses(rows)
+        self._maybe_persist_snapshot(survey_id)
+        return written
 
-    def get_question_responses(self, survey_id: str) -> list:
-        return self._question_responses.list_by_survey(survey_id)
+    def get_question_responses(self, survey_id: str, include_raw: bool = True) -> list:
+        return list(self._question_responses.iter_by_survey(survey_id, include_raw=include_raw))
+
+    def get_question_response_rows(
+        self,
+        survey_id: str,
+        fields: list[str],
+    ) -> list[dict[str, Any]]:
+        return list(self._question_responses.iter_rows_by_survey(survey_id, fields))
 
     def get_questions(self, survey_id: str) -> list:
         return self._questions.list_by_survey(survey_id)
 
+    # ── Export ───────────────────────────────────────────
+
+    def iter_result_rows(self, survey: Survey, fields: list[str]) -> Iterator[dict[str, Any]]:
+        """Stream the responses of either mode, restricted to `fields`."""
+        repo = self._question_responses if survey.mode == "questionnaire" else self._responses
+        return repo.iter_rows_by_survey(survey.id, fields)
+
+    def iter_agent_rows(self, survey_id: str, fields: list[str]) -> Iterator[dict[str, Any]]:
+        return self._agents.iter_rows_by_survey(survey_id, fields)
+
     # ── Aggregation ──────────────────────────────────────
 
     def compute_and_store_aggregates(self, survey_id: str) -> list[SurveyAggregate]:
         survey = self._surveys.get_survey(survey_id)
-        # Delete old aggregates
-        self._aggregates.delete_by_survey(survey_id)
-
-        results: list[SurveyAggregate] = []
+        agents = list(self._agents.iter_agents_by_survey(survey_id))
 
         if survey.mode == "text":
-            responses = self._responses.list_responses_by_survey(survey_id)
-            agg = self._compute_text_aggregation(responses)
-            result = self._aggregates.upsert_aggregate(
-                survey_id=survey_id,
-                aggregation=agg,
-                question_id=None,
-            )
-            results.append(result)
+            responses = self._responses.iter_summaries_by_survey(survey_id)
+            aggregations = [(None, text_aggregation(responses, agents))]
         else:
             questions = self._questions.list_by_survey(survey_id)
-            for q in questions:
-                q_responses = self._question_responses.list_by_survey_and_question(
-                    survey_id,
+            # One paged stream for the whole survey, grouped here by question.
+            by_question: dict[str, list] = {q.question_id: [] for q in questions}
+            for r in self._question_responses.iter_summaries_by_survey(survey_id):
+                if r.question_id in by_question:
+                    by_question[r.question_id].append(r)
+            aggregations = [
+                (
                     q.question_id,
+                    question_aggregation(q.type, by_question[q.question_id], agents, q.scale),
                 )
-                agg = self._compute_question_aggregation(q.type, q_responses)
-                result = self._aggregates.upsert_aggregate(
-                    survey_id=survey_id,
-                    aggregation=agg,
-                    question_id=q.question_id,
-                )
-                results.append(result)
+                for q in questions
+            ]
 
+        results = self._aggregates.upsert_aggregates_batch(survey_id, aggregations)
+        self._aggregates.delete_other_aggregates(survey_id, [a.id for a in results])
         logger.info(f"Aggregates computed for survey {survey_id}: {len(results)} group(s)")
         return results
 
+    def finalize_aggregates(self, survey_id: str) -> list[SurveyAggregate]:
+        """Replace the live snapshots of a finished run by the full aggregates.
+
+        Live snapshots only carry running counts; quantiles, histograms and
+        demographic breakdowns need the whole response set, read once here.
+        """
+        self._live.discard(survey_id)
+        return self.compute_and_store_aggregates(survey_id)
+
     def get_aggregates(self, survey_id: str) -> list[SurveyAggregate]:
         return self._aggregates.get_aggregates(survey_id)
 
     # ── Private helpers ──────────────────────────────────
 
-    @staticmethod
-    def _compute_text_aggregation(responses: list) -> dict[str, Any]:
-        total = len(responses)
-        if total == 0:
-            return {
-                "total": 0,
-                "agree_pct": 0,
-                "disagree_pct": 0,
-                "mixed_pct": 0,
-                "mean_confidence": 0,
-            }
-
-        agree = sum(1 for r in responses if r.stance == "agree")
-        disagree = sum(1 for r in responses if r.stance == "disagree")
-        mixed = sum(1 for r in responses if r.stance == "mixed")
-        mean_conf = sum(r.confidence for r in responses) / total
-        fallback_count = sum(1 for r in responses if r.is_fallback)
-
-        top_reasons = []
-        for r in sorted(responses, key=lambda x: x.confidence, reverse=True)[:10]:
-            if r.short_reason:
-                top_reasons.append(
-                    {
-                        "stance": r.stance,
-                        "confidence": round(r.confidence, 3),
-                        "reason": r.short_reason,
-                    }
-                )
-
-        return {
-            "total": total,
-            "agree_count": agree,
-            "disagree_count": disagree,
-            "mixed_count": mixed,
-            "agree_pct": round(agree / total * 100, 1),
-            "disagree_pct": round(disagree / total * 100, 1),
-            "mixed_pct": round(mixed / total * 100, 1),
-            "mean_confidence": round(mean_conf, 3),
-            "fallback_count": fallback_count,
-            "top_reasons": top_reasons,
-        }
-
-    @staticmethod
-    def _compute_question_aggregation(q_type: str, responses: list) -> dict[str, Any]:
-        total = len(responses)
-        if total == 0:
-            return {"total": 0, "type": q_type}
-
-        mean_conf = sum(r.confidence for r in responses) / total
-
-        if q_type == "stance":
-            agree = sum(1 for r in responses if r.answer == "agree")
-            disagree = sum(1 for r in responses if r.answer == "disagree")
-            mixed = sum(1 for r in responses if r.answer == "mixed")
-            return {
-                "total": total,
-                "type": q_type,
-                "agree_pct": round(agree / total * 100, 1),
-                "disagree_pct": round(disagree / total * 100, 1),
-                "mixed_pct": round(mixed / total * 100, 1),
-                "mean_confidence": round(mean_conf, 3),
-            }
-        elif q_type == "likert":
-            values = []
-            for r in responses:
-                try:
-                    values.append(float(r.answer))
-                except (ValueError, TypeError):
-                    pass
-            mean_val = sum(values) / len(values) if values else 0
-            return {
-                "total": total,
-                "type": q_type,
-                "mean_value": round(mean_val, 2),
-                "mean_confidence": round(mean_conf, 3),
-            }
-        else:  # mcq
-            counts: dict[str, int] = {}
-            for r in responses:
-                counts[r.answer] = counts.get(r.answer, 0) + 1
-            distribution = {k: round(v / total * 100, 1) for k, v in counts.items()}
-            return {
-                "total": total,
-                "type": q_type,
-                "distribution": distribution,
-                "mean_confidence": round(mean_conf, 3),
-            }
+    def _maybe_persist_snapshot(self, survey_id: str) -> None:
+        """Persist live aggregates at most once per `snapshot_interval`."""
+        aggregator = self._live.get(survey_id)
+        now = time.monotonic()
+        if aggregator is None or now - aggregator.last_persisted_at < self._snapshot_interval:
+            return
+        aggregator.last_persisted_at = now
+        self._aggregates.upsert_aggregates_batch(survey_id, aggregator.snapshots(), returning=False)
@@ -1,3 +1,5 @@
+import json
+import re
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
@@ -7,6 +9,10 @@ from fastapi.testclient import TestClient
 
 from app.core.dependencies import (
     get_agent_repo,
+    get_async_survey_aggregate_repo,
+    get_async_survey_question_repo,
+    get_async_survey_repo,
+    get_realtime_service,
     get_response_repo,
     get_survey_aggregate_repo,
     get_survey_question_repo,
@@ -19,7 +25,18 @@ from app.domain.entities.survey import Survey
 from app.domain.entities.survey_aggregate import SurveyAggregate
 from app.domain.entities.survey_question import SurveyQuestion
 from app.domain.entities.survey_question_response import SurveyQuestionResponse
+from app.infrastructure.cache.factory import get_cache, get_response_cache
+from app.infrastructure.cache.memory_cache import TTLCache
+from app.infrastructure.llm.cache import LLMResponseCache
+from app.infrastructure.llm.factory import get_llm_cache
+from app.infrastructure.queue.sqlite_queue import SQLiteJobQueue, get_job_queue
 from app.main import app
+from app.repositories.survey_aggregate_repo import aggregate_id
+from app.services.job_service import SurveyJobService
+from app.services.realtime_service import RealtimeService
+from app.services.simulation_service import SimulationService
+from app.services.survey_service import SurveyService
+from app.workers.survey_worker import SurveyWorker
 
 # ── Fake Repositories ────────────────────────────────────
 
@@ -56,8 +73,8 @@ class FakeSurveyRepository:
         self._store[survey_id].update(data)
         return self._to_entity(self._store[survey_id])
 
-    def delete_survey(self, survey_id: str) -> None:
-        self._store.pop(survey_id, None)
+    def delete_survey(self, survey_id: str) -> int:
+        return 1 if self._store.pop(survey_id, None) else 0
 
     def _to_entity(self, row: dict) -> Survey:
         return Survey(
@@ -79,21 +96,31 @@ class FakeAgentRepository:
     def __init__(self):
         self._store: list[dict[str, Any]] = []
 
-    def create_agents_batch(self, agents_data: list[dict]) -> list[Agent]:
+    def create_agents_batch(self, agents_data: list[dict], returning=True) -> list[Agent]:
         result = []
         for a in agents_data:
             a.setdefault("id", str(uuid4()))
             a.setdefault("created_at", datetime.utcnow().isoformat())
             self._store.append(a)
             result.append(self._to_entity(a))
-        return result
+        return result if returning else len(result)
+
+    def iter_agents_by_survey(self, survey_id: str):
+        yield from self.list_agents_by_survey(survey_id, limit=len(self._store))
 
     def list_agents_by_survey(self, survey_id: str, limit=1000, offset=0) -> list[Agent]:
         rows = [a for a in self._store if a.get("survey_id") == survey_id]
         return [self._to_entity(r) for r in rows[offset : offset + limit]]
 
-    def delete_agents_by_survey(self, survey_id: str) -> None:
+    def iter_rows_by_survey(self, survey_id: str, fields: list[str]):
+        for a in self._store:
+            if a.get("survey_id") == survey_id:
+                yield {k: a.get(k) for k in fields}
+
+    def delete_agents_by_survey(self, survey_id: str) -> int:
+        before = len(self._store)
         self._store = [a for a in self._store if a.get("survey_id") != survey_id]
+        return before - len(self._store)
 
     def _to_entity(self, row: dict) -> Agent:
         return Agent(
@@ -116,20 +143,36 @@ class FakeResponseRepository:
     def __init__(self):
         self._store: list[dict[str, Any]] = []
 
-    def create_responses_batch(self, rows: list[dict]) -> list[Response]:
+    def create_responses_batch(self, rows: list[dict], returning=True) -> list[Response]:
         result = []
         for r in rows:
             r.setdefault("id", str(uuid4()))
             self._store.append(r)
             result.append(self._to_entity(r))
-        return result
+        return result if returning else len(result)
+
+    def iter_responses_by_survey(self, survey_id: str, include_raw=True):
+        for r in self.list_responses_by_survey(survey_id, limit=len(self._store)):
+            if not include_raw:
+                r.raw_llm_output = None
+            yield r
+
+    def iter_rows_by_survey(self, survey_id: str, fields: list[str]):
+        for r in self._store:
+            if r.get("survey_id") == survey_id:
+                yield {k: r.get(k) for k in fields}
+
+    def iter_summaries_by_survey(self, survey_id: str):
+        yield from self.iter_responses_by_survey(survey_id, include_raw=False)
 
     def list_responses_by_survey(self, survey_id: str, limit=1000, offset=0) -> list[Response]:
         rows = [r for r in self._store if r.get("survey_id") == survey_id]
         return [self._to_entity(r) for r in rows[offset : offset + limit]]
 
-    def delete_responses_by_survey(self, survey_id: str) -> None:
+    def delete_responses_by_survey(self, survey_id: str) -> int:
+        before = len(self._store)
         self._store = [r for r in self._store if r.get("survey_id") != survey_id]
+        return before - len(self._store)
 
     def _to_entity(self, row: dict) -> Response:
         return Response(
@@ -148,42 +191,54 @@ class FakeSurveyAggregateRepository:
     def __init__(self):
         self._store: list[dict[str, Any]] = []
 
-    def upsert_aggregate(self, survey_id, aggregation, question_id=None) -> SurveyAggregate:
-        row = {
-            "id": str(uuid4()),
-            "survey_id": survey_id,
-            "question_id": question_id,
-            "aggregation": aggregation,
-            "computed_at": datetime.utcnow(),
-        }
-        self._store.append(row)
-        return SurveyAggregate(**row)
+    def upsert_aggregates_batch(self, survey_id, aggregations, returning=True):
+        written = []
+        for qid, agg in aggregations:
+            row = {
+                "id": aggregate_id(survey_id, qid),
+                "survey_id": survey_id,
+                "question_id": qid,
+                "aggregation": agg,
+                "computed_at": datetime.utcnow(),
+            }
+            self._store = [r for r in self._store if r["id"] != row["id"]] + [row]
+            written.append(SurveyAggregate(**row))
+        return written if returning else len(written)
 
     def get_aggregates(self, survey_id: str) -> list[SurveyAggregate]:
         return [SurveyAggregate(**r) for r in self._store if r["survey_id"] == survey_id]
 
-    def delete_by_survey(self, survey_id: str) -> None:
+    def delete_other_aggregates(self, survey_id: str, keep_ids: list[str]) -> int:
+        before = len(self._store)
+        self._store = [r for r in self._store if r["survey_id"] != survey_id or r["id"] in keep_ids]
+        return before - len(self._store)
+
+    def delete_by_survey(self, survey_id: str) -> int:
+        before = len(self._store)
         self._store = [r for r in self._store if r["survey_id"] != survey_id]
+        return before - len(self._store)
 
 
 class FakeSurveyQuestionRepository:
     def __init__(self):
         self._store: list[dict[str, Any]] = []
 
-    def create_questions_batch(self, questions: list[dict]) -> list[SurveyQuestion]:
+    def create_questions_batch(self, questions: list[dict], returning=True) -> list[SurveyQuestion]:
         result = []
         for q in questions:
             q.setdefault("id", str(uuid4()))
             self._store.append(q)
             result.append(self._to_entity(q))
-        return result
+        return result if returning else len(result)
 
     def list_by_survey(self, survey_id: str) -> list[SurveyQuestion]:
         rows = [q for q in self._store if q.get("survey_id") == survey_id]
         return [self._to_entity(q) for q in rows]
 
-    def delete_by_survey(self, survey_id: str) -> None:
+    def delete_by_survey(self, survey_id: str) -> int:
+        before = len(self._store)
         self._store = [q for q in self._store if q.get("survey_id") != survey_id]
+        return before - len(self._store)
 
     def _to_entity(self, row: dict) -> SurveyQuestion:
         return SurveyQuestion(
@@ -202,18 +257,32 @@ class FakeSurveyQuestionResponseRepository:
     def __init__(self):
         self._store: list[dict[str, Any]] = []
 
-    def create_batch(self, rows: list[dict]) -> list[SurveyQuestionResponse]:
+    def create_batch(self, rows: list[dict], returning=True) -> list[SurveyQuestionResponse]:
         result = []
         for r in rows:
             r.setdefault("id", str(uuid4()))
             self._store.append(r)
             result.append(self._to_entity(r))
-        return result
+        return result if returning else len(result)
 
     def list_by_survey(self, survey_id: str, limit=5000, offset=0) -> list[SurveyQuestionResponse]:
         rows = [r for r in self._store if r.get("survey_id") == survey_id]
         return [self._to_entity(r) for r in rows[offset : offset + limit]]
 
+    def iter_by_survey(self, survey_id: str, page_size=1000, include_raw=True):
+        for r in self.list_by_survey(survey_id, limit=len(self._store)):
+            if not include_raw:
+                r.raw_llm_output = None
+            yield r
+
+    def iter_rows_by_survey(self, survey_id: str, fields: list[str]):
+        for r in self._store:
+            if r.get("survey_id") == survey_id:
+                yield {k: r.get(k) for k in fields}
+
+    def iter_summaries_by_survey(self, survey_id: str):
+        yield from self.iter_by_survey(survey_id, include_raw=False)
+
     def list_by_survey_and_question(self, survey_id, question_id) -> list[SurveyQuestionResponse]:
         rows = [
             r
@@ -222,8 +291,10 @@ class FakeSurveyQuestionResponseRepository:
         ]
         return [self._to_entity(r) for r in rows]
 
-    def delete_by_survey(self, survey_id: str) -> None:
+    def delete_by_survey(self, survey_id: str) -> int:
+        before = len(self._store)
         self._store = [r for r in self._store if r.get("survey_id") != survey_id]
+        return before - len(self._store)
 
     def _to_entity(self, row: dict) -> SurveyQuestionResponse:
         return SurveyQuestionResponse(
@@ -239,6 +310,59 @@ class FakeSurveyQuestionResponseRepository:
         )
 
 
+class AsyncRepoAdapter:
+    """Exposes a fake sync repository's methods as coroutines for the async deps."""
+
+    def __init__(self, repo: Any):
+        self._repo = repo
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._repo, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+class FakeLLM:
+    """Async LLM answering survey prompts with well-formed JSON."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=256) -> str:
+        self.calls += 1
+        if prompt.startswith("Affirmation"):
+            return json.dumps({"stance": "agree", **self._reason()})
+        if prompt.startswith("Questionnaire"):
+            items = re.findall(r'^- "([^"]+)" : .*$', prompt, re.MULTILINE)
+            lines = prompt.splitlines()[1:]
+            return json.dumps({qid: self._answer(line) for qid, line in zip(items, lines)})
+        return json.dumps(self._answer(prompt))
+
+    def _answer(self, prompt: str) -> dict[str, Any]:
+        if "entier parmi" in prompt:
+            return {"answer": 4, **self._reason()}
+        if "une valeur parmi" in prompt:
+            choice = re.search(r'une valeur parmi "([^"]+)"', prompt).group(1)
+            return {"answer": choice, **self._reason()}
+        return {"answer": "disagree", **self._reason()}
+
+    @staticmethod
+    def _reason() -> dict[str, Any]:
+        return {"confidence": 0.8, "short_reason": "Raison simulée"}
+
+    async def generate_batch(self, prompts, system_prompt=None, temperature=0.7, max_tokens=256):
+        return [await self.generate(p, system_prompt, temperature, max_tokens) for p in prompts]
+
+    async def is_available(self) -> bool:
+        return True
+
+    async def list_models(self) -> list[str]:
+        return ["fake"]
+
+
 # ── Fixtures ─────────────────────────────────────────────
 
 
@@ -272,8 +396,55 @@ def fake_question_response_repo():
     return FakeSurveyQuestionResponseRepository()
 
 
+@pytest.fixture
+def fake_llm():
+    return FakeLLM()
+
+
+@pytest.fixture
+def llm_cache(tmp_path) -> LLMResponseCache:
+    return LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"))
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), retry_base_seconds=0)
+
+
+@pytest.fixture
+def survey_service(
+    fake_survey_repo,
+    fake_agent_repo,
+    fake_response_repo,
+    fake_aggregate_repo,
+    fake_question_repo,
+    fake_question_response_repo,
+) -> SurveyService:
+    return SurveyService(
+        survey_repo=fake_survey_repo,
+        agent_repo=fake_agent_repo,
+        response_repo=fake_response_repo,
+        aggregate_repo=fake_aggregate_repo,
+        question_repo=fake_question_repo,
+        question_response_repo=fake_question_response_repo,
+    )
+
+
+@pytest.fixture
+def survey_worker(job_queue, survey_service, fake_llm) -> SurveyWorker:
+    """Worker sharing the fake repositories and job queue of the `client` fixture."""
+    return SurveyWorker(
+        queue=job_queue,
+        jobs=SurveyJobService(survey_service, job_queue),
+        simulation=SimulationService(survey_service, llm_factory=lambda model: fake_llm),
+        worker_id="test-worker",
+    )
+
+
 @pytest.fixture
 def client(
+    job_queue,
+    llm_cache,
     fake_survey_repo,
     fake_agent_repo,
     fake_response_repo,
@@ -289,6 +460,21 @@ def client(
     app.dependency_overrides[get_survey_question_response_repo] = lambda: (
         fake_question_response_repo
     )
+    app.dependency_overrides[get_async_survey_repo] = lambda: AsyncRepoAdapter(fake_survey_repo)
+    app.dependency_overrides[get_async_survey_question_repo] = lambda: AsyncRepoAdapter(
+        fake_question_repo
+    )
+    app.dependency_overrides[get_async_survey_aggregate_repo] = lambda: AsyncRepoAdapter(
+        fake_aggregate_repo
+    )
+    app.dependency_overrides[get_job_queue] = lambda: job_queue
+    cache = TTLCache()
+    app.dependency_overrides[get_cache] = lambda: cache
+    response_cache = TTLCache()
+    app.dependency_overrides[get_response_cache] = lambda: response_cache
+    app.dependency_overrides[get_llm_cache] = lambda: llm_cache
+    realtime = RealtimeService()
+    app.dependency_overrides[get_realtime_service] = lambda: realtime
 
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,180 @@
+"""Tests for the incremental aggregators used while a survey run is stored."""
+
+import random
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.domain.entities.agent import Agent
+from app.domain.entities.survey_question import SurveyQuestion
+from app.services.agent_factory import generate_agents
+from app.services.aggregation import QuestionAggregator, SurveyAggregator, TextAggregator
+from app.services.aggregation_engine import question_aggregation, text_aggregation
+from app.services.survey_service import SurveyService
+
+
+def _text_rows(n: int, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "stance": rng.choice(["agree", "disagree", "mixed"]),
+            "confidence": rng.choice([0.2, 0.5, 0.8, 0.9]),
+            "short_reason": f"raison {i}" if i % 3 else None,
+            "is_fallback": i % 7 == 0,
+        }
+        for i in range(n)
+    ]
+
+
+def _reference_top_reasons(rows: list[dict]) -> list[dict]:
+    ranked = sorted(rows, key=lambda r: r["confidence"], reverse=True)[:10]
+    return [
+        {
+            "stance": r["stance"],
+            "confidence": round(r["confidence"], 3),
+            "reason": r["short_reason"],
+        }
+        for r in ranked
+        if r["short_reason"]
+    ]
+
+
+class TestTextAggregator:
+    def test_chunks_match_single_pass(self):
+        rows = _text_rows(500)
+        incremental = SurveyAggregator()
+        for i in range(0, len(rows), 37):
+            incremental.add_responses(rows[i : i + 37])
+        single = TextAggregator()
+        for r in rows:
+            single.add(r["stance"], r["confidence"], r["short_reason"], r["is_fallback"])
+
+        snapshot = incremental.snapshots()[0][1]
+        assert incremental.snapshots()[0][0] is None
+        assert snapshot == single.snapshot()
+        assert snapshot["total"] == 500
+        assert snapshot["fallback_count"] == sum(r["is_fallback"] for r in rows)
+
+    def test_top_reasons_match_stable_sort(self):
+        rows = _text_rows(200, seed=11)
+        aggregator = TextAggregator()
+        for r in rows:
+            aggregator.add(r["stance"], r["confidence"], r["short_reason"], r["is_fallback"])
+        assert aggregator.snapshot()["top_reasons"] == _reference_top_reasons(rows)
+
+    def test_empty(self):
+        assert TextAggregator().snapshot()["total"] == 0
+
+
+class TestQuestionAggregator:
+    def test_likert_ignores_non_numeric(self):
+        aggregator = QuestionAggregator("likert")
+        for answer in ["1", "5", "oops"]:
+            aggregator.add(answer, 0.6)
+        snapshot = aggregator.snapshot()
+        assert snapshot["total"] == 3
+        assert snapshot["mean_value"] == 3.0
+        assert snapshot["mean_confidence"] == 0.6
+
+    def test_questionnaire_snapshots_follow_question_order(self):
+        questions = [
+            SurveyQuestion(
+                id=str(i), survey_id="s", question_index=i, question_id=qid, type=q_type, text="t"
+            )
+            for i, (qid, q_type) in enumerate([("q1", "stance"), ("q2", "mcq")])
+        ]
+        aggregator = SurveyAggregator(questions)
+        aggregator.add_question_responses(
+            [
+                {"question_id": "q2", "answer": "A", "confidence": 0.5},
+                {"question_id": "q2", "answer": "B", "confidence": 0.5},
+                {"question_id": "q1", "answer": "agree", "confidence": 1.0},
+                {"question_id": "unknown", "answer": "x", "confidence": 1.0},
+            ]
+        )
+        snapshots = dict(aggregator.snapshots())
+        assert list(snapshots) == ["q1", "q2"]
+        assert snapshots["q1"]["agree_pct"] == 100.0
+        assert snapshots["q2"]["distribution"] == {"A": 50.0, "B": 50.0}
+
+
+class TestLiveAggregates:
+    def test_live_state_matches_full_recompute(self, survey_service: SurveyService):
+        survey = survey_service.create_survey(
+            title="T", mode="text", input_text="x", n_agents=300, seed=1
+        )
+        survey_service._snapshot_interval = 0
+        rows = _text_rows(300, seed=5)
+        for i in range(0, len(rows), 50):
+            chunk = [{**r, "agent_id": f"a{i + j}"} for j, r in enumerate(rows[i : i + 50])]
+            survey_service.store_responses(survey.id, chunk)
+
+        live = survey_service.get_aggregates(survey.id)[0].aggregation
+        final = survey_service.finalize_aggregates(survey.id)[0].aggregation
+        assert live == {key: final[key] for key in live}
+        assert "confidence_quantiles" in final
+
+    def test_snapshots_are_persisted_during_the_run(self, survey_service: SurveyService):
+        survey = survey_service.create_survey(title="T", mode="text", input_text="x", n_agents=2)
+        survey_service._snapshot_interval = 0
+        survey_service.store_responses(survey.id, [{"agent_id": "a", **_text_rows(1)[0]}])
+        assert survey_service.get_aggregates(survey.id)[0].aggregation["total"] == 1
+        survey_service.store_responses(survey.id, [{"agent_id": "b", **_text_rows(1)[0]}])
+        [aggregate] = survey_service.get_aggregates(survey.id)
+        assert aggregate.aggregation["total"] == 2
+
+        survey_service.reset_results(survey.id)
+        assert survey_service.get_aggregates(survey.id) == []
+
+    def test_recompute_replaces_rows_with_legacy_ids(self, survey_service: SurveyService):
+        survey = survey_service.create_survey(title="T", mode="text", input_text="x", n_agents=1)
+        legacy = {"id": "legacy", "survey_id": survey.id, "question_id": None}
+        survey_service._aggregates._store.append(
+            {**legacy, "aggregation": {"total": 0}, "computed_at": datetime.utcnow()}
+        )
+        survey_service.compute_and_store_aggregates(survey.id)
+        [aggregate] = survey_service.get_aggregates(survey.id)
+        assert aggregate.id != "legacy"
+
+
+class TestAggregationEngine:
+    def test_matches_incremental_text_aggregation(self):
+        rows = _text_rows(1000, seed=8)
+        aggregator = TextAggregator()
+        for r in rows:
+            aggregator.add(r["stance"], r["confidence"], r["short_reason"], r["is_fallback"])
+
+        result = text_aggregation(SimpleNamespace(agent_id="a", **r) for r in rows)
+        assert {key: result[key] for key in aggregator.snapshot()} == aggregator.snapshot()
+        assert result["top_reasons"] == _reference_top_reasons(rows)
+        quantiles = result["confidence_quantiles"]
+        assert list(quantiles) == ["p10", "p25", "p50", "p75", "p90"]
+        assert quantiles["p10"] <= quantiles["p50"] <= quantiles["p90"]
+
+    def test_likert_distribution(self):
+        responses = [
+            SimpleNamespace(agent_id="a", answer=a, confidence=0.5) for a in ["1", "1", "5", "x"]
+        ]
+        result = question_aggregation("likert", responses, scale=[1, 2, 3, 4, 5])
+        assert result["mean_value"] == round(7 / 3, 2)
+        assert result["variance"] == round(32 / 9, 3)
+        assert result["histogram"] == {"1": 2, "2": 0, "3": 0, "4": 0, "5": 1}
+
+    def test_demographic_breakdowns(self):
+        agents = [Agent(**a) for a in generate_agents("s", 50, seed=4)]
+        responses = [
+            SimpleNamespace(
+                agent_id=a.id, answer="A" if a.urban_rural == "urbain" else "B", confidence=0.7
+            )
+            for a in agents
+        ]
+        result = question_aggregation("mcq", responses, agents)
+        by_area = result["breakdowns"]["urban_rural"]
+        assert sum(group["total"] for group in by_area.values()) == 50
+        for area, group in by_area.items():
+            assert group["distribution"] == {"A" if area == "urbain" else "B": 100.0}
+        assert set(result["breakdowns"]) == {
+            "age_band",
+            "education",
+            "urban_rural",
+            "classe_sociale",
+        }
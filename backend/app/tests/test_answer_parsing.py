@@ -0,0 +1,118 @@
+"""Tests for the tolerant LLM answer parser."""
+
+from app.domain.entities.survey_question import SurveyQuestion
+from app.services.answer_parsing import (
+    ParseStats,
+    classify_stance,
+    extract_json,
+    parse_packed_answers,
+    parse_question_answer,
+    parse_text_answer,
+    repair_json,
+)
+
+
+def _question(kind: str, question_id: str = "q", **kwargs) -> SurveyQuestion:
+    return SurveyQuestion(
+        id=question_id,
+        survey_id="s",
+        question_index=0,
+        question_id=question_id,
+        type=kind,
+        text="t",
+        **kwargs,
+    )
+
+
+class TestTextAnswer:
+    def test_json_with_noise(self):
+        raw = 'Voici: {"stance": "Disagree", "confidence": 1.7, "short_reason": "Non"} {x}'
+        parsed = parse_text_answer(raw)
+        assert parsed["stance"] == "disagree"
+        assert parsed["confidence"] == 1.0
+        assert not parsed["is_fallback"]
+
+    def test_truncated_json_is_repaired(self):
+        stats = ParseStats()
+        parsed = parse_text_answer(
+            '```json\n{"stance": "agree", "confidence": 0.9, "short_re', stats
+        )
+        assert parsed["stance"] == "agree"
+        assert parsed["confidence"] == 0.9
+        assert stats.methods == {"repaired": 1}
+
+    def test_truncated_number_is_dropped(self):
+        parsed = parse_text_answer('{"stance": "disagree", "confidence": 0.')
+        assert parsed["stance"] == "disagree"
+        assert parsed["confidence"] == 0.5
+
+    def test_regex_and_keywords(self):
+        stats = ParseStats()
+        assert parse_text_answer("stance: mixed, confidence: 60%", stats)["confidence"] == 0.6
+        keyword = parse_text_answer("Je ne suis pas d'accord avec cette idée.", stats)
+        assert keyword["stance"] == "disagree"
+        assert not keyword["is_fallback"]
+        assert stats.methods == {"regex": 1, "keywords": 1}
+
+    def test_fallback_is_counted(self):
+        stats = ParseStats()
+        parsed = parse_text_answer("je ne sais pas", stats)
+        assert parsed["is_fallback"]
+        assert parsed["stance"] == "mixed"
+        assert stats.as_dict()["parse_fallback_rate"] == 1.0
+
+
+class TestQuestionAnswer:
+    def test_likert_out_of_scale_falls_back(self):
+        parsed = parse_question_answer(_question("likert"), '{"answer": 9}')
+        assert parsed["is_fallback"]
+        assert parsed["answer"] == "3"
+
+    def test_likert_rejects_non_finite_and_fractional_values(self):
+        likert = _question("likert")
+        for raw in ("answer: inf", '{"answer": 1e999}', '{"answer": "3.7"}'):
+            assert parse_question_answer(likert, raw)["is_fallback"], raw
+        parsed = parse_packed_answers([likert], '{"q": {"answer": 1e999}}')
+        assert parsed == {}
+
+    def test_answers_named_in_plain_text(self):
+        assert parse_question_answer(_question("likert"), "Je dirais 4 sur 5.")["answer"] == "4"
+        assert parse_question_answer(_question("likert"), "Entre 2 et 4.")["is_fallback"]
+        mcq = _question("mcq", choices=["Solaire", "Éolien"])
+        assert parse_question_answer(mcq, "Plutôt l'éolien")["answer"] == "Éolien"
+
+    def test_choices_match_whole_words(self):
+        yes_no = _question("mcq", choices=["Oui", "Non"])
+        assert parse_question_answer(yes_no, "Je suis anonyme et je dis oui")["answer"] == "Oui"
+        transport = _question("mcq", choices=["Bus", "Vélo"])
+        parsed = parse_question_answer(transport, "Plutôt le vélo, les abus de la voiture...")
+        assert parsed["answer"] == "Vélo"
+
+
+class TestPacked:
+    def test_keeps_valid_items_only(self):
+        questions = [_question("stance", "a"), _question("likert", "b")]
+        parsed = parse_packed_answers(questions, '{"a": {"Answer": "Agree"}, "b": {"answer": 7}}')
+        assert set(parsed) == {"a"}
+        assert parsed["a"]["answer"] == "agree"
+
+        listed = parse_packed_answers(questions, '{"answers": ["mixed", 2]}')
+        assert {k: v["answer"] for k, v in listed.items()} == {"a": "mixed", "b": "2"}
+
+    def test_truncated_reply_keeps_complete_items(self):
+        questions = [_question("stance", "a"), _question("likert", "b")]
+        parsed = parse_packed_answers(questions, '{"a": {"answer": "agree"}, "b": {"ans')
+        assert set(parsed) == {"a"}
+
+
+def test_repair_json():
+    assert repair_json('{"a": [1, 2,') == '{"a": [1, 2]}'
+    assert repair_json('{"a": 1, "b"') == '{"a": 1}'
+    assert repair_json("{'a': 'x',}") == '{"a": "x"}'
+    assert extract_json('{"a": 1} trailing }') == ({"a": 1}, "json")
+
+
+def test_classify_stance():
+    assert classify_stance("Tout à fait d'accord") == "agree"
+    assert classify_stance("Je suis défavorable") == "disagree"
+    assert classify_stance("D'accord sur le fond, mais contre la méthode") is None
@@ -0,0 +1,80 @@
+"""Tests for the async LLM clients against in-process fakes."""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.infrastructure.llm.base import AsyncLLMProvider, LLMProvider
+from app.infrastructure.llm.groq_client import AsyncGroqClient, GroqClient, GroqConfig
+from app.infrastructure.llm.ollama_client import (
+    AsyncOllamaClient,
+    OllamaClient,
+    OllamaConfig,
+)
+
+
+class FakeAsyncGroqAPI:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = SimpleNamespace(list=self._list)
+
+    async def _create(self, model, messages, temperature, max_tokens):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        message = SimpleNamespace(content=f"{model}:{messages[-1]['content']}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def _list(self):
+        return SimpleNamespace(data=[SimpleNamespace(id="llama-3.3-70b-versatile")])
+
+
+class FakeAsyncOllamaAPI:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def chat(self, model, messages, options):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        return {"message": {"content": f"{model}:{messages[-1]['content']}"}}
+
+    async def list(self):
+        return {"models": [{"name": "llama3.2:3b"}]}
+
+
+def test_clients_implement_provider_protocols():
+    assert isinstance(GroqClient(client=object()), LLMProvider)
+    assert isinstance(OllamaClient(client=object()), LLMProvider)
+    assert isinstance(AsyncGroqClient(client=object()), AsyncLLMProvider)
+    assert isinstance(AsyncOllamaClient(client=object()), AsyncLLMProvider)
+
+
+async def test_async_groq_batch_fans_out_on_one_loop():
+    api = FakeAsyncGroqAPI(latency=0.02)
+    client = AsyncGroqClient(GroqConfig(model="m", max_concurrency=50), client=api)
+    prompts = [f"p{i}" for i in range(200)]
+    results = await client.generate_batch(prompts)
+    assert results == [f"m:p{i}" for i in range(200)]
+    assert api.max_in_flight == 50
+
+
+async def test_async_groq_availability():
+    client = AsyncGroqClient(client=FakeAsyncGroqAPI())
+    assert await client.is_available()
+    assert await client.list_models() == ["llama-3.3-70b-versatile"]
+
+
+async def test_async_ollama_batch_respects_concurrency():
+    api = FakeAsyncOllamaAPI(latency=0.01)
+    client = AsyncOllamaClient(OllamaConfig(model="m", max_concurrency=4), client=api)
+    results = await client.generate_batch(["a", "b", "c", "d", "e", "f"])
+    assert results == ["m:a", "m:b", "m:c", "m:d", "m:e", "m:f"]
+    assert api.max_in_flight == 4
+    assert await client.list_models() == ["llama3.2:3b"]
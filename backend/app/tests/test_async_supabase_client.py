@@ -0,0 +1,161 @@
+"""Tests for AsyncSupabaseClient against an in-process PostgREST stand-in."""
+
+import json
+
+import httpx
+import pytest
+
+from app.core.errors import RepoError
+from app.infrastructure.db.async_supabase_client import AsyncSupabaseClient
+from app.repositories.survey_question_repo import AsyncSurveyQuestionRepository
+
+
+class FakePostgrestApp:
+    """Answers `/rest/v1/<table>` requests from in-memory rows."""
+
+    def __init__(self, tables: dict[str, list[dict]] | None = None):
+        self.tables = tables or {}
+        self.requests: list[httpx.Request] = []
+        self.fail = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.fail:
+            return httpx.Response(500, json={"message": "boom"})
+        table = request.url.path.rsplit("/", 1)[-1]
+        rows = self.tables.setdefault(table, [])
+        params = dict(request.url.params)
+
+        if request.method == "GET":
+            return httpx.Response(200, json=self._query(rows, params))
+        if request.method == "POST":
+            payload = json.loads(request.content)
+            payload = payload if isinstance(payload, list) else [payload]
+            rows.extend(payload)
+            return self._written(request, payload)
+        if request.method == "DELETE":
+            matched = self._match(rows, params)
+            self.tables[table] = [r for r in rows if r not in matched]
+            return self._written(request, matched)
+        return httpx.Response(405)
+
+    @staticmethod
+    def _match(rows: list[dict], params: dict[str, str]) -> list[dict]:
+        def keep(row: dict) -> bool:
+            for name, predicate in params.items():
+                if name in ("select", "order", "limit", "offset", "on_conflict"):
+                    continue
+                op, _, value = predicate.partition(".")
+                if op == "eq" and str(row.get(name)) != value:
+                    return False
+                if op == "gt" and not str(row.get(name)) > value:
+                    return False
+            return True
+
+        return [r for r in rows if keep(r)]
+
+    def _query(self, rows: list[dict], params: dict[str, str]) -> list[dict]:
+        result = self._match(rows, params)
+        if "order" in params:
+            column, _, direction = params["order"].partition(".")
+            result.sort(key=lambda r: str(r[column]), reverse=direction == "desc")
+        offset = int(params.get("offset", 0))
+        limit = int(params["limit"]) if "limit" in params else None
+        return result[offset : offset + limit if limit is not None else None]
+
+    @staticmethod
+    def _written(request: httpx.Request, rows: list[dict]) -> httpx.Response:
+        if "return=minimal" in request.headers.get("prefer", ""):
+            return httpx.Response(201, headers={"Content-Range": f"*/{len(rows)}"})
+        return httpx.Response(201, json=rows)
+
+
+@pytest.fixture
+def postgrest() -> FakePostgrestApp:
+    return FakePostgrestApp()
+
+
+@pytest.fixture
+async def db(postgrest):
+    client = AsyncSupabaseClient(
+        "https://example.supabase.co",
+        "service-key",
+        schema="crowd",
+        page_size=3,
+        transport=httpx.MockTransport(postgrest),
+    )
+    yield client
+    await client.close()
+
+
+async def test_select_applies_filters_order_and_limit(db, postgrest):
+    postgrest.tables["surveys"] = [
+        {"id": "s2", "created_by": "u1"},
+        {"id": "s1", "created_by": "u1"},
+        {"id": "s3", "created_by": "u2"},
+    ]
+
+    rows = await db.select(
+        "surveys", filters={"created_by": "u1"}, order_by="id", order_desc=True, limit=5
+    )
+
+    assert [r["id"] for r in rows] == ["s2", "s1"]
+    request = postgrest.requests[-1]
+    assert request.url.path == "/rest/v1/surveys"
+    assert request.url.params["created_by"] == "eq.u1"
+    assert request.headers["apikey"] == "service-key"
+    assert request.headers["accept-profile"] == "crowd"
+
+
+async def test_select_iter_walks_every_page(db, postgrest):
+    postgrest.tables["responses"] = [{"id": f"r{i:02d}", "survey_id": "s1"} for i in range(7)]
+
+    ids = [row["id"] async for row in db.select_iter("responses", filters={"survey_id": "s1"})]
+
+    assert ids == [f"r{i:02d}" for i in range(7)]
+    assert len(postgrest.requests) == 4
+    assert postgrest.requests[-1].url.params["id"] == "gt.r06"
+
+
+async def test_minimal_writes_return_counts(db, postgrest):
+    written = await db.upsert("responses", [{"id": "a"}, {"id": "b"}], returning=False)
+    deleted = await db.delete("responses", filters={"id": "a"}, returning=False)
+
+    assert (written, deleted) == (2, 1)
+    prefer = postgrest.requests[0].headers["prefer"]
+    assert "return=minimal" in prefer and "resolution=merge-duplicates" in prefer
+    assert postgrest.requests[0].url.params["on_conflict"] == "id"
+
+
+async def test_http_errors_are_wrapped(db, postgrest):
+    postgrest.fail = True
+
+    with pytest.raises(RepoError, match="Select failed on surveys"):
+        await db.select("surveys")
+
+
+async def test_async_repository_maps_rows(db, postgrest):
+    postgrest.tables["survey_questions"] = [
+        {
+            "id": "q2",
+            "survey_id": "s1",
+            "question_index": 2,
+            "question_id": "q2",
+            "type": "likert",
+            "text": "Second",
+            "created_at": "2026-01-01T00:00:00Z",
+        },
+        {
+            "id": "q1",
+            "survey_id": "s1",
+            "question_index": 1,
+            "question_id": "q1",
+            "type": "stance",
+            "text": "First",
+            "created_at": "2026-01-01T00:00:00Z",
+        },
+    ]
+
+    questions = await AsyncSurveyQuestionRepository(db).list_by_survey("s1")
+
+    assert [q.id for q in questions] == ["q1", "q2"]
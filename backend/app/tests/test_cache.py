@@ -0,0 +1,156 @@
+"""Tests for the survey read cache and its invalidation by the repositories."""
+
+import sqlite3
+import time
+from contextlib import closing
+
+import pytest
+
+from app.core.errors import NotFoundError
+from app.infrastructure.cache.memory_cache import TTLCache
+from app.infrastructure.cache.sqlite_cache import SQLiteCache
+from app.repositories.survey_question_repo import SurveyQuestionRepository
+from app.repositories.survey_repo import SurveyRepository
+
+
+class CountingDB:
+    """Minimal SupabaseClient stand-in counting the reads it serves."""
+
+    def __init__(self):
+        self.rows = {
+            "surveys": [{"id": "s1", "title": "T", "mode": "text", "status": "pending"}],
+            "survey_questions": [
+                {
+                    "id": "q1",
+                    "survey_id": "s1",
+                    "question_index": 0,
+                    "question_id": "q1",
+                    "type": "stance",
+                    "text": "?",
+                }
+            ],
+        }
+        self.reads = 0
+
+    def _match(self, table, filters):
+        return [r for r in self.rows[table] if all(r.get(k) == v for k, v in filters.items())]
+
+    def select(self, table, columns="*", filters=None, **kwargs):
+        self.reads += 1
+        return self._match(table, filters or {})
+
+    def select_one(self, table, columns="*", filters=None):
+        rows = self.select(table, columns, filters)
+        return rows[0] if rows else None
+
+    def update(self, table, data, filters, returning=True):
+        rows = self._match(table, filters)
+        for row in rows:
+            row.update(data)
+        return rows
+
+    def delete(self, table, filters, returning=True):
+        rows = self._match(table, filters)
+        self.rows[table] = [r for r in self.rows[table] if r not in rows]
+        return len(rows)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return TTLCache(max_entries=100, ttl=60)
+    return SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=100, ttl=60)
+
+
+def test_repeated_reads_are_served_from_cache(cache):
+    db = CountingDB()
+    surveys = SurveyRepository(db, cache)
+    questions = SurveyQuestionRepository(db, cache)
+
+    for _ in range(5):
+        assert surveys.get_survey("s1").title == "T"
+        assert [q.id for q in questions.list_by_survey("s1")] == ["q1"]
+
+    assert db.reads == 2
+    assert (cache.stats.hits, cache.stats.misses) == (8, 2)
+
+
+def test_update_and_delete_invalidate(cache):
+    db = CountingDB()
+    surveys = SurveyRepository(db, cache)
+    questions = SurveyQuestionRepository(db, cache)
+    surveys.get_survey("s1")
+    questions.list_by_survey("s1")
+
+    surveys.update_survey("s1", {"status": "running"})
+    assert surveys.get_survey("s1").status == "running"
+
+    surveys.delete_survey("s1")
+    with pytest.raises(NotFoundError):
+        surveys.get_survey("s1")
+    assert cache.get(SurveyQuestionRepository.cache_key("s1")) is None
+
+
+def test_fill_racing_an_update_is_not_cached(cache):
+    db = CountingDB()
+    surveys = SurveyRepository(db, cache)
+    select_one = db.select_one
+
+    def select_then_update(table, columns="*", filters=None):
+        # The row is loaded, then a worker updates it before the fill.
+        row = dict(select_one(table, columns, filters))
+        db.select_one = select_one
+        surveys.update_survey("s1", {"status": "running"})
+        return row
+
+    db.select_one = select_then_update
+    assert surveys.get_survey("s1").status == "pending"
+    assert surveys.get_survey("s1").status == "running"
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    api, worker = SQLiteCache(path), SQLiteCache(path)
+
+    api.set("survey:s1", {"status": "pending"})
+    assert worker.get("survey:s1") == {"status": "pending"}
+
+    worker.delete("survey:s1")
+    assert api.get("survey:s1") is None
+
+
+def test_sqlite_cache_hits_only_refresh_stale_recency(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, max_entries=2, ttl=60, touch_interval=0.05)
+
+    def accessed_at(key: str) -> float:
+        with closing(sqlite3.connect(path)) as conn:
+            return conn.execute("SELECT accessed_at FROM cache WHERE key = ?", (key,)).fetchone()[0]
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    written = accessed_at("a")
+    assert cache.get("a") == 1
+    assert accessed_at("a") == written
+
+    time.sleep(0.06)
+    cache.get("a")
+    assert accessed_at("a") > written
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
@@ -0,0 +1,109 @@
+"""Tests for GroqClient batch generation against a local fake API."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.infrastructure.llm.groq_client import GroqClient, GroqConfig
+from app.infrastructure.llm.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: float | None = None):
+        super().__init__("rate limited")
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class FakeGroqAPI:
+    """Simulates latency, echoes prompts and fails the first calls with 429."""
+
+    def __init__(self, latency: float = 0.0, rate_limited_calls: int = 0):
+        self.latency = latency
+        self.rate_limited_calls = rate_limited_calls
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, temperature, max_tokens):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if call <= self.rate_limited_calls:
+                raise FakeRateLimitError(retry_after=0.01)
+            message = SimpleNamespace(content=f"echo:{messages[-1]['content']}")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _client(api: FakeGroqAPI, **config) -> GroqClient:
+    return GroqClient(GroqConfig(backoff_base=0.01, **config), client=api)
+
+
+class TestGenerateBatch:
+    def test_preserves_prompt_order(self):
+        api = FakeGroqAPI(latency=0.01)
+        prompts = [f"p{i}" for i in range(20)]
+        results = _client(api, max_concurrency=8).generate_batch(prompts)
+        assert results == [f"echo:p{i}" for i in range(20)]
+
+    def test_runs_concurrently_within_limit(self):
+        api = FakeGroqAPI(latency=0.05)
+        start = time.perf_counter()
+        _client(api, max_concurrency=10).generate_batch([f"p{i}" for i in range(20)])
+        elapsed = time.perf_counter() - start
+        assert api.max_in_flight <= 10
+        assert api.max_in_flight > 1
+        assert elapsed < 20 * 0.05 / 2
+
+    def test_retries_after_rate_limit(self):
+        api = FakeGroqAPI(rate_limited_calls=3)
+        results = _client(api, max_concurrency=2).generate_batch(["a", "b"])
+        assert results == ["echo:a", "echo:b"]
+        assert api.calls == 5
+
+    def test_gives_up_after_max_retries(self):
+        api = FakeGroqAPI(rate_limited_calls=100)
+        with pytest.raises(FakeRateLimitError):
+            _client(api, max_retries=2).generate("a")
+        assert api.calls == 3
+
+    def test_empty_batch(self):
+        assert _client(FakeGroqAPI()).generate_batch([]) == []
+
+
+class TestRateLimiter:
+    def test_bucket_waits_once_exhausted(self):
+        now = [0.0]
+        bucket = TokenBucket(capacity=2, refill_per_second=1, clock=lambda: now[0])
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == pytest.approx(1.0)
+        now[0] = 3.0
+        assert bucket.reserve(1) == 0
+
+    def test_requests_per_minute_budget(self):
+        now = [0.0]
+        limiter = RateLimiter(requests_per_minute=60, clock=lambda: now[0])
+        waits = [limiter.reserve(10) for _ in range(62)]
+        assert waits[:60] == [0.0] * 60
+        assert waits[60] == pytest.approx(1.0)
+        assert waits[61] == pytest.approx(2.0)
+
+    def test_pause_delays_every_caller(self):
+        now = [0.0]
+        limiter = RateLimiter(clock=lambda: now[0])
+        limiter.pause(5)
+        assert limiter.reserve(1) == pytest.approx(5.0)
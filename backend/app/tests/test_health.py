@@ -6,3 +6,17 @@ def test_health_check(client: TestClient) -> None:
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "ok"
+
+
+def test_realtime_stats(client: TestClient) -> None:
+    response = client.get("/api/v1/health/realtime")
+    assert response.status_code == 200
+    assert response.json() == {"connections": 0, "dropped": 0}
+
+
+def test_cache_stats(client: TestClient) -> None:
+    response = client.get("/api/v1/health/cache")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["hits"] == 0
+    assert data["hit_ratio"] == 0.0
@@ -0,0 +1,85 @@
+"""Tests for the SQLite-backed job queue."""
+
+import threading
+import time
+
+import pytest
+
+from app.core.errors import ConflictError
+from app.infrastructure.queue.sqlite_queue import SQLiteJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), retry_base_seconds=0)
+
+
+def test_lease_is_exclusive(queue):
+    queue.enqueue("survey_run", "s1")
+    assert queue.lease("w1", lease_seconds=60).lease_owner == "w1"
+    assert queue.lease("w2", lease_seconds=60) is None
+
+
+def test_one_active_job_per_survey(queue):
+    queue.enqueue("survey_run", "s1")
+    with pytest.raises(ConflictError):
+        queue.enqueue("survey_run", "s1")
+
+
+def test_concurrent_workers_never_share_a_job(queue):
+    for i in range(20):
+        queue.enqueue("survey_run", f"s{i}")
+    leased: list[str] = []
+    lock = threading.Lock()
+
+    def drain(worker_id: str) -> None:
+        while (job := queue.lease(worker_id, lease_seconds=60)) is not None:
+            with lock:
+                leased.append(job.id)
+
+    threads = [threading.Thread(target=drain, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(leased) == len(set(leased)) == 20
+
+
+def test_expired_lease_is_handed_to_another_worker(queue):
+    job = queue.enqueue("survey_run", "s1")
+    queue.lease("w1", lease_seconds=0.01)
+    time.sleep(0.02)
+    released = queue.lease("w2", lease_seconds=60)
+    assert released.id == job.id
+    assert released.attempts == 2
+    assert not queue.heartbeat(job.id, "w1", lease_seconds=60)
+
+
+def test_fail_requeues_until_attempts_exhausted(queue):
+    job = queue.enqueue("survey_run", "s1", max_attempts=2)
+    queue.lease("w1", lease_seconds=60)
+    assert queue.fail(job.id, "w1", "boom").status == "queued"
+    queue.lease("w1", lease_seconds=60)
+    failed = queue.fail(job.id, "w1", "boom again")
+    assert failed.status == "failed"
+    assert failed.last_error == "boom again"
+
+
+def test_cancel_leased_job_stops_heartbeat(queue):
+    job = queue.enqueue("survey_run", "s1")
+    queue.lease("w1", lease_seconds=60)
+    assert queue.heartbeat(job.id, "w1", 60, progress_done=3, progress_total=10)
+    assert queue.cancel(job.id).cancel_requested
+    assert not queue.heartbeat(job.id, "w1", 60)
+    assert queue.mark_cancelled(job.id, "w1").status == "cancelled"
+    assert queue.get(job.id).progress_done == 3
+
+
+def test_reap_fails_exhausted_expired_jobs(queue):
+    job = queue.enqueue("survey_run", "s1", max_attempts=1)
+    queue.lease("w1", lease_seconds=0.01)
+    time.sleep(0.02)
+    assert queue.lease("w2", lease_seconds=60) is None
+    reaped = queue.reap_expired()
+    assert [j.id for j in reaped] == [job.id]
+    assert reaped[0].status == "failed"
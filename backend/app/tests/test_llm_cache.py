@@ -0,0 +1,135 @@
+"""Tests for the persistent LLM response cache and its use by simulation runs."""
+
+import asyncio
+import sqlite3
+from contextlib import closing
+
+from app.infrastructure.llm.cache import CachedLLMClient, LLMResponseCache, cache_key
+from app.services.job_service import SurveyJobService
+from app.services.simulation_service import SimulationService
+from app.workers.survey_worker import SurveyWorker
+
+API = "/api/v1/surveys"
+
+
+def test_key_covers_sampling_parameters():
+    base = cache_key("groq", "m", "sys", "p", 0.7, 256, 42)
+    assert base == cache_key("groq", "m", "sys", "p", 0.7, 256, 42)
+    assert base != cache_key("groq", "m", "sys", "p", 0.7, 256, 43)
+    assert base != cache_key("groq", "m", "sys", "p", 0.2, 256, 42)
+    assert base != cache_key("ollama", "m", "sys", "p", 0.7, 256, 42)
+
+
+def test_lru_eviction_is_bounded_by_size(tmp_path):
+    cache = LLMResponseCache(
+        str(tmp_path / "c.sqlite3"), max_bytes=250, evict_every=1, touch_interval=0
+    )
+    cache.set("a", "x" * 100)
+    cache.set("b", "x" * 100)
+    assert cache.get("a") is not None
+    cache.set("c", "x" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["size_bytes"] == 200
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_lookups_take_no_write_lock(tmp_path):
+    path = str(tmp_path / "c.sqlite3")
+    cache = LLMResponseCache(path, touch_interval=60, flush_every=10)
+    cache.set("a", "x")
+
+    with closing(sqlite3.connect(path, isolation_level=None)) as writer:
+        writer.execute("BEGIN IMMEDIATE")
+        for _ in range(9):
+            assert cache.get("a") == "x"
+        writer.execute("COMMIT")
+
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (9, 0)
+
+
+async def test_client_serves_repeated_prompts_from_cache(tmp_path, fake_llm):
+    cache = LLMResponseCache(str(tmp_path / "c.sqlite3"))
+    llm = CachedLLMClient(fake_llm, cache, provider="groq", model="m", seed=1)
+
+    first = await llm.generate_batch(["Affirmation 1", "Affirmation 2"], system_prompt="s")
+    second = await llm.generate_batch(["Affirmation 1", "Affirmation 2"], system_prompt="s")
+
+    assert first == second
+    assert fake_llm.calls == 2
+    assert llm.stats() == {"cache_hits": 2, "cache_misses": 2, "cache_hit_ratio": 0.5}
+
+
+def _cached_worker(job_queue, survey_service, fake_llm, llm_cache) -> SurveyWorker:
+    simulation = SimulationService(
+        survey_service, llm_factory=lambda model: fake_llm, llm_cache=llm_cache
+    )
+    return SurveyWorker(
+        queue=job_queue,
+        jobs=SurveyJobService(survey_service, job_queue),
+        simulation=simulation,
+        worker_id="test-worker",
+    )
+
+
+def _run(client, worker, parameters=None) -> None:
+    body = {"title": "T", "mode": "text", "input_text": "Le vélo", "n_agents": 6, "seed": 3}
+    if parameters is not None:
+        body["parameters"] = parameters
+    sid = client.post(API, json=body).json()["id"]
+    client.post(f"{API}/{sid}/run")
+    assert asyncio.run(worker.run_once())
+
+
+def test_identical_rerun_makes_no_llm_call(client, job_queue, survey_service, fake_llm, llm_cache):
+    worker = _cached_worker(job_queue, survey_service, fake_llm, llm_cache)
+    _run(client, worker)
+    _run(client, worker)
+
+    assert fake_llm.calls == 6
+    stats = client.get("/api/v1/health/llm-cache").json()
+    assert stats["enabled"]
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (6, 6, 6)
+
+
+def test_parse_outcomes_are_totalled_per_model(
+    client, job_queue, survey_service, fake_llm, llm_cache
+):
+    worker = _cached_worker(job_queue, survey_service, fake_llm, llm_cache)
+    _run(client, worker)
+    _run(client, worker, {"llm_cache": False})
+
+    stats = client.get("/api/v1/health/llm-parsing").json()
+    assert stats["enabled"]
+    assert stats["models"]["llama-3.3-70b-versatile"] == {
+        "parsed": 12,
+        "parse_fallbacks": 0,
+        "parse_fallback_rate": 0.0,
+        "parse_methods": {"json": 12},
+    }
+
+
+def test_survey_can_opt_out(client, job_queue, survey_service, fake_llm, llm_cache):
+    worker = _cached_worker(job_queue, survey_service, fake_llm, llm_cache)
+    _run(client, worker, {"llm_cache": False})
+    _run(client, worker, {"llm_cache": False})
+
+    assert fake_llm.calls == 12
+    assert llm_cache.stats()["entries"] == 0
+
+
+def test_unusable_replies_are_not_cached(client, job_queue, survey_service, fake_llm, llm_cache):
+    async def shrug(prompt, system_prompt=None, temperature=0.7, max_tokens=256) -> str:
+        fake_llm.calls += 1
+        return "Je ne sais pas."
+
+    fake_llm.generate = shrug
+    worker = _cached_worker(job_queue, survey_service, fake_llm, llm_cache)
+    _run(client, worker)
+    _run(client, worker)
+
+    assert fake_llm.calls == 12
+    assert llm_cache.stats()["entries"] == 0
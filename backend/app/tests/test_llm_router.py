@@ -0,0 +1,182 @@
+"""Tests for the LLM provider router against local fake providers."""
+
+import asyncio
+
+import pytest
+
+from app.infrastructure.llm.cache import CachedLLMClient, LLMResponseCache
+from app.infrastructure.llm.router import (
+    CircuitBreaker,
+    LLMRouter,
+    NoProviderAvailableError,
+    RoutedProvider,
+)
+
+
+class FakeProvider:
+    def __init__(
+        self, name: str, latency: float = 0.0, fail: bool = False, error: Exception | None = None
+    ):
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+        self.error = error or ConnectionError(f"{name} down")
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=256):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.fail:
+                raise self.error
+            return f"{self.name}:{prompt}"
+        finally:
+            self.in_flight -= 1
+
+    async def is_available(self) -> bool:
+        return not self.fail
+
+    async def list_models(self) -> list[str]:
+        return [f"{self.name}-model"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _router(
+    *providers: FakeProvider, caps: tuple[int, ...] = (), max_retries: int = 0, **breaker
+) -> LLMRouter:
+    return LLMRouter(
+        [
+            RoutedProvider(
+                name=p.name,
+                client=p,
+                model=f"{p.name}-model",
+                max_concurrency=caps[i] if caps else 4,
+                breaker=CircuitBreaker(**breaker),
+            )
+            for i, p in enumerate(providers)
+        ],
+        max_retries=max_retries,
+        backoff_base=0.001,
+    )
+
+
+async def test_batch_uses_every_provider_within_its_cap():
+    groq, ollama = FakeProvider("groq", 0.01), FakeProvider("ollama", 0.01)
+    router = _router(groq, ollama, caps=(3, 2))
+
+    results = await router.generate_batch([f"p{i}" for i in range(20)])
+
+    assert len(results) == 20
+    assert groq.max_in_flight == 3
+    assert ollama.max_in_flight == 2
+    assert groq.calls + ollama.calls == 20
+
+
+async def test_faster_provider_gets_more_traffic():
+    fast, slow = FakeProvider("fast", 0.001), FakeProvider("slow", 0.03)
+    router = _router(fast, slow, caps=(1, 1))
+
+    for i in range(10):
+        await router.generate(f"p{i}")
+
+    assert fast.calls > slow.calls
+
+
+async def test_failover_and_circuit_breaker():
+    clock = FakeClock()
+    broken, healthy = FakeProvider("broken", fail=True), FakeProvider("healthy", 0.01)
+    router = _router(broken, healthy, failure_threshold=2, reset_seconds=10, clock=clock)
+    router.providers[1].latency = 1.0  # `broken` looks better until it fails
+
+    assert await router.generate("a") == "healthy:a"
+    assert await router.generate("b") == "healthy:b"
+    assert router.stats()["providers"]["broken"]["state"] == "open"
+
+    await router.generate("c")
+    assert broken.calls == 2
+
+    clock.now = 11
+    broken.fail = False
+    router.providers[1].latency = 1.0
+    assert await router.generate("d") == "broken:d"
+    assert router.providers[0].breaker.state == "closed"
+
+
+async def test_all_providers_down():
+    router = _router(FakeProvider("a", fail=True), FakeProvider("b", fail=True))
+    with pytest.raises(ConnectionError, match="down"):
+        await router.generate("x")
+
+    for provider in router.providers:
+        provider.breaker = CircuitBreaker(failure_threshold=1)
+        provider.breaker.record_failure()
+    with pytest.raises(NoProviderAvailableError):
+        await router.generate("x")
+    assert not await router.is_available()
+
+
+async def test_request_errors_neither_fail_over_nor_trip_the_breaker():
+    bad_request = FakeProvider("groq", fail=True, error=StatusError(400))
+    other = FakeProvider("ollama")
+    router = _router(bad_request, other, failure_threshold=1)
+    router.providers[1].latency = 1.0
+
+    with pytest.raises(StatusError):
+        await router.generate("too long")
+    assert other.calls == 0
+    assert router.providers[0].breaker.state == "closed"
+
+
+async def test_last_provider_is_retried_after_a_rate_limit():
+    groq = FakeProvider("groq", error=StatusError(429))
+    generate = groq.generate
+
+    async def rate_limited_twice(prompt, *args):
+        groq.fail = groq.calls < 2
+        return await generate(prompt, *args)
+
+    groq.generate = rate_limited_twice
+    router = _router(groq, max_retries=3, failure_threshold=10)
+
+    assert await router.generate("a") == "groq:a"
+    assert groq.calls == 3
+
+
+async def test_session_caches_per_provider_and_counts_its_own_calls(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "c.sqlite3"))
+    router = _router(FakeProvider("groq"), FakeProvider("ollama"), caps=(1, 1))
+    await router.generate("warm-up")
+    session = router.session(lambda p: CachedLLMClient(p.client, cache, p.name, p.model))
+    groq, ollama = router.providers
+
+    groq.latency, ollama.latency = 0.0, 1.0
+    assert await session.generate("a") == "groq:a"
+    groq.latency, ollama.latency = 1.0, 0.0
+    assert await session.generate("a") == "ollama:a"
+    groq.latency, ollama.latency = 0.0, 1.0
+    assert await session.generate("a") == "groq:a"
+
+    stats = session.stats()["providers"]
+    assert stats["groq"]["model"] == "groq-model"
+    assert (stats["groq"]["requests"], stats["groq"]["cache_hits"]) == (2, 1)
+    assert (stats["ollama"]["requests"], stats["ollama"]["cache_hits"]) == (1, 0)
+    assert sum(p["requests"] for p in router.stats()["providers"].values()) == 1
+    assert session.served_by("a") == "groq-model"
+    assert router.served_by("warm-up") is None
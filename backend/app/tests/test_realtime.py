@@ -0,0 +1,182 @@
+"""Tests for RealtimeService fan-out through the pub/sub brokers."""
+
+import asyncio
+import json
+
+from app.infrastructure.pubsub.sqlite_broker import SQLiteBroker
+from app.services.realtime_service import RealtimeService
+
+
+class FakeWebSocket:
+    def __init__(self, fail: bool = False, latency: float = 0.0):
+        self.fail = fail
+        self.latency = latency
+        self.accepted = False
+        self.closed = False
+        self.sent: list[dict] = []
+
+    async def accept(self) -> None:
+        self.accepted = True
+
+    async def send_text(self, text: str) -> None:
+        if self.fail:
+            raise RuntimeError("socket closed")
+        await asyncio.sleep(self.latency)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed = True
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def test_in_process_broadcast():
+    realtime = RealtimeService()
+    ws = FakeWebSocket()
+    other = FakeWebSocket()
+    await realtime.connect("exp-1", ws)
+    await realtime.connect("exp-2", other)
+
+    await realtime.broadcast("exp-1", "progress", {"done": 1})
+    await _wait_for(lambda: ws.sent)
+
+    assert ws.accepted
+    assert [m["type"] for m in ws.sent] == ["progress"]
+    assert other.sent == []
+    await realtime.close()
+
+
+async def test_dead_socket_is_disconnected():
+    realtime = RealtimeService()
+    await realtime.connect("exp-1", FakeWebSocket(fail=True))
+    await realtime.broadcast("exp-1", "progress", {})
+    await _wait_for(lambda: realtime.get_connection_count("exp-1") == 0)
+
+
+async def test_slow_client_does_not_delay_others_and_is_evicted():
+    realtime = RealtimeService(send_timeout=0.1)
+    slow = FakeWebSocket(latency=10)
+    fast = FakeWebSocket()
+    await realtime.connect("exp-1", slow)
+    await realtime.connect("exp-1", fast)
+
+    for i in range(3):
+        await realtime.broadcast("exp-1", "progress", {"done": i})
+    await _wait_for(lambda: len(fast.sent) == 3, timeout=0.05)
+
+    await _wait_for(lambda: slow.closed)
+    assert realtime.get_connection_count("exp-1") == 1
+    await realtime.close()
+
+
+async def test_coalesce_policy_keeps_latest_of_each_type():
+    realtime = RealtimeService(send_queue_size=2, overflow_policy="coalesce")
+    ws = FakeWebSocket(latency=0.05)
+    await realtime.connect("exp-1", ws)
+
+    await realtime.broadcast("exp-1", "agents_created", {"count": 10})
+    await asyncio.sleep(0.01)  # first message is now being sent
+    await realtime.broadcast("exp-1", "progress", {"done": 1})
+    await realtime.broadcast("exp-1", "status", {"status": "running"})
+    await realtime.broadcast("exp-1", "progress", {"done": 2})
+    await _wait_for(lambda: len(ws.sent) == 3)
+
+    assert [m["type"] for m in ws.sent] == ["agents_created", "status", "progress"]
+    assert ws.sent[-1]["data"] == {"done": 2}
+    await realtime.close()
+
+
+async def test_coalesce_never_drops_batches_with_status_events():
+    realtime = RealtimeService(send_queue_size=2, overflow_policy="coalesce")
+    ws = FakeWebSocket(latency=0.05)
+    await realtime.connect("exp-1", ws)
+
+    def batch(*types: str) -> dict:
+        return {"events": [{"type": t, "data": {}} for t in types]}
+
+    await realtime.broadcast("exp-1", "batch", batch("progress"))
+    await asyncio.sleep(0.01)  # first message is now being sent
+    await realtime.broadcast("exp-1", "batch", batch("agents_created", "progress"))
+    await realtime.broadcast("exp-1", "batch", batch("progress"))
+    await realtime.broadcast("exp-1", "batch", batch("survey_status"))
+    await realtime.broadcast("exp-1", "batch", batch("progress"))
+    await _wait_for(lambda: len(ws.sent) == 4)
+    await asyncio.sleep(0.1)
+
+    sent = [[e["type"] for e in m["data"]["events"]] for m in ws.sent]
+    assert sent == [["progress"], ["agents_created", "progress"], ["survey_status"], ["progress"]]
+    assert realtime.dropped == 1
+    await realtime.close()
+
+
+async def test_coalesce_evicts_a_client_whose_queue_keeps_growing():
+    realtime = RealtimeService(send_queue_size=2, overflow_policy="coalesce", send_timeout=30)
+    ws = FakeWebSocket(latency=10)
+    await realtime.connect("exp-1", ws)
+
+    await realtime.broadcast("exp-1", "survey_status", {"i": 0})
+    await asyncio.sleep(0.01)  # first message is now being sent
+    for i in range(1, 10):
+        await realtime.broadcast("exp-1", "survey_status", {"i": i})
+    await _wait_for(lambda: ws.closed)
+
+    assert realtime.get_connection_count("exp-1") == 0
+    # The 8 queued messages (4 times the queue size) and the one that overflowed.
+    assert realtime.dropped == 9
+    await realtime.close()
+
+
+async def test_drop_newest_policy():
+    realtime = RealtimeService(send_queue_size=1, overflow_policy="drop_newest")
+    ws = FakeWebSocket(latency=0.05)
+    await realtime.connect("exp-1", ws)
+
+    for i in range(4):
+        await realtime.broadcast("exp-1", "progress", {"done": i})
+        await asyncio.sleep(0)
+    await _wait_for(lambda: len(ws.sent) == 2)
+    await asyncio.sleep(0.1)
+
+    assert [m["data"]["done"] for m in ws.sent] == [0, 1]
+    assert realtime.stats() == {"connections": 1, "dropped": 2}
+    await realtime.close()
+    assert realtime.dropped == 2
+
+
+async def test_sqlite_broker_relays_across_processes(tmp_path):
+    path = str(tmp_path / "realtime.sqlite3")
+    api_worker = RealtimeService(SQLiteBroker(path, poll_interval=0.01))
+    survey_worker = RealtimeService(SQLiteBroker(path, poll_interval=0.01))
+    ws = FakeWebSocket()
+    await api_worker.connect("exp-1", ws)
+    try:
+        await survey_worker.broadcast("exp-1", "progress", {"done": 5, "total": 10})
+        await survey_worker.broadcast("exp-2", "progress", {"done": 1, "total": 1})
+        await _wait_for(lambda: ws.sent)
+        await asyncio.sleep(0.05)
+        assert [m["data"] for m in ws.sent] == [{"done": 5, "total": 10}]
+    finally:
+        await api_worker.close()
+        await survey_worker.close()
+
+
+async def test_sqlite_broker_skips_events_before_start(tmp_path):
+    path = str(tmp_path / "realtime.sqlite3")
+    publisher = RealtimeService(SQLiteBroker(path, poll_interval=0.01))
+    await publisher.broadcast("exp-1", "old", {})
+
+    subscriber = RealtimeService(SQLiteBroker(path, poll_interval=0.01))
+    ws = FakeWebSocket()
+    await subscriber.connect("exp-1", ws)
+    try:
+        await publisher.broadcast("exp-1", "new", {})
+        await _wait_for(lambda: ws.sent)
+        assert [m["type"] for m in ws.sent] == ["new"]
+    finally:
+        await publisher.close()
+        await subscriber.close()
@@ -0,0 +1,74 @@
+"""Tests for RealtimeBatcher coalescing and flushing."""
+
+import asyncio
+
+from app.services.realtime_batcher import RealtimeBatcher
+
+
+class RecordingRealtime:
+    def __init__(self):
+        self.messages: list[tuple[str, str, dict]] = []
+
+    async def broadcast(self, experiment_id, event_type, data):
+        self.messages.append((experiment_id, event_type, data))
+
+    async def close(self):
+        pass
+
+
+async def test_progress_events_are_coalesced_into_one_batch():
+    sink = RecordingRealtime()
+    batcher = RealtimeBatcher(sink, interval=0.02)
+
+    await batcher.broadcast("exp-1", "agents_created", {"count": 1000})
+    for done in range(1, 1001):
+        await batcher.broadcast("exp-1", "progress", {"done": done, "total": 1000})
+    await asyncio.sleep(0.05)
+
+    assert len(sink.messages) == 1
+    experiment_id, event_type, data = sink.messages[0]
+    assert (experiment_id, event_type) == ("exp-1", "batch")
+    assert [e["type"] for e in data["events"]] == ["agents_created", "progress"]
+    assert data["events"][1]["data"] == {"done": 1000, "total": 1000}
+    await batcher.close()
+
+
+async def test_coalesced_event_keeps_its_latest_position():
+    sink = RecordingRealtime()
+    batcher = RealtimeBatcher(sink, interval=60)
+
+    await batcher.broadcast("exp-1", "progress", {"done": 10})
+    await batcher.broadcast("exp-1", "llm_stats", {"hits": 1})
+    await batcher.broadcast("exp-1", "progress", {"done": 20})
+    await batcher.flush()
+
+    events = sink.messages[0][2]["events"]
+    assert [(e["type"], e["data"]) for e in events] == [
+        ("llm_stats", {"hits": 1}),
+        ("progress", {"done": 20}),
+    ]
+    await batcher.close()
+
+
+async def test_flushes_at_size_threshold():
+    sink = RecordingRealtime()
+    batcher = RealtimeBatcher(sink, interval=60, max_batch_size=3)
+
+    for i in range(7):
+        await batcher.broadcast("exp-1", "response", {"i": i})
+
+    assert [len(m[2]["events"]) for m in sink.messages] == [3, 3]
+    await batcher.close()
+    assert [len(m[2]["events"]) for m in sink.messages] == [3, 3, 1]
+
+
+async def test_batches_are_per_experiment():
+    sink = RecordingRealtime()
+    batcher = RealtimeBatcher(sink, interval=60)
+
+    await batcher.broadcast("exp-1", "progress", {"done": 1})
+    await batcher.broadcast("exp-2", "progress", {"done": 2})
+    await batcher.flush()
+
+    assert sorted(m[0] for m in sink.messages) == ["exp-1", "exp-2"]
+    await batcher.close()
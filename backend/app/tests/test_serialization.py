@@ -0,0 +1,52 @@
+"""The fast list serialisation must produce what the response models would."""
+
+import json
+from datetime import datetime, timezone
+
+from app.api.v1.schemas.response import QuestionResponseListResponse, QuestionResponseOut
+from app.api.v1.serialization import list_response, project
+from app.domain.entities.survey_question_response import (
+    SurveyQuestionResponse,
+    SurveyQuestionResponseSummary,
+)
+
+
+def _responses() -> list[SurveyQuestionResponse]:
+    return [
+        SurveyQuestionResponse(
+            id=f"r{i}",
+            survey_id="s1",
+            agent_id=f"a{i}",
+            question_id="q1",
+            answer="4",
+            confidence=0.25 * i,
+            short_reason=None if i % 2 else "parce que",
+            raw_llm_output='{"answer": "4"}',
+            is_fallback=bool(i % 3 == 0),
+            created_at=datetime(2026, 3, 1, 12, 0, i, 1234, tzinfo=timezone.utc),
+        )
+        for i in range(4)
+    ]
+
+
+def test_matches_response_model_output():
+    responses = _responses()
+    expected = QuestionResponseListResponse(
+        responses=[QuestionResponseOut.model_validate(r) for r in responses],
+        count=len(responses),
+    ).model_dump_json()
+
+    body = list_response("responses", responses, QuestionResponseOut).body
+
+    assert json.loads(body) == json.loads(expected)
+    assert b"2026-03-01T12:00:01.001234Z" in body
+
+
+def test_objects_not_mirroring_the_schema_are_projected():
+    summary = SurveyQuestionResponseSummary("a1", "q1", "yes", 0.9, False)
+
+    class Schema(QuestionResponseOut.__base__):
+        agent_id: str
+        answer: str
+
+    assert project([summary], Schema) == [{"agent_id": "a1", "answer": "yes"}]
@@ -0,0 +1,233 @@
+"""Tests for the server-side simulation runner (POST /surveys/{id}/run + worker)."""
+
+import asyncio
+import io
+import json
+import sys
+
+import pytest
+
+from app.services.agent_factory import generate_agents
+
+API = "/api/v1/surveys"
+
+QUESTIONS = [
+    {"question_id": "q1", "type": "stance", "text": "Le climat se réchauffe"},
+    {"question_id": "q2", "type": "likert", "text": "Importance", "scale": [1, 2, 3, 4, 5]},
+    {"question_id": "q3", "type": "mcq", "text": "Énergie", "choices": ["Solaire", "Éolien"]},
+]
+
+
+class TestRunSurvey:
+    def test_run_text_survey(self, client, survey_worker, fake_llm):
+        sid = client.post(
+            API,
+            json={"title": "T", "mode": "text", "input_text": "Le vélo en ville", "n_agents": 12},
+        ).json()["id"]
+
+        resp = client.post(f"{API}/{sid}/run")
+        assert resp.status_code == 202
+        assert resp.json()["status"] == "queued"
+        assert client.get(f"{API}/{sid}").json()["status"] == "pending"
+
+        assert asyncio.run(survey_worker.run_once())
+
+        survey = client.get(f"{API}/{sid}").json()
+        assert survey["status"] == "completed"
+        assert survey["elapsed_seconds"] is not None
+        job = client.get(f"{API}/{sid}/job").json()
+        assert job["status"] == "succeeded"
+        assert job["progress_done"] == job["progress_total"] == 12
+        assert client.get(f"{API}/{sid}/agents").json()["count"] == 12
+        assert client.get(f"{API}/{sid}/responses").json()["count"] == 12
+        aggregates = client.get(f"{API}/{sid}/aggregates").json()["aggregates"]
+        assert aggregates[0]["aggregation"]["agree_pct"] == 100.0
+        assert fake_llm.calls == 12
+
+    def test_run_questionnaire_survey(self, client, survey_worker, fake_llm):
+        sid = client.post(
+            API,
+            json={"title": "Q", "mode": "questionnaire", "n_agents": 5, "questions": QUESTIONS},
+        ).json()["id"]
+
+        assert client.post(f"{API}/{sid}/run").status_code == 202
+        assert asyncio.run(survey_worker.run_once())
+
+        assert client.get(f"{API}/{sid}").json()["status"] == "completed"
+        responses = client.get(f"{API}/{sid}/question-responses").json()["responses"]
+        assert len(responses) == 15
+        assert not any(r["is_fallback"] for r in responses)
+        by_question = {r["question_id"]: r["answer"] for r in responses}
+        assert by_question == {"q1": "disagree", "q2": "4", "q3": "Solaire"}
+        assert client.get(f"{API}/{sid}/aggregates").json()["count"] == 3
+        assert fake_llm.calls == 15
+
+    def test_packed_questionnaire_survey(self, client, survey_worker, fake_llm):
+        sid = client.post(
+            API,
+            json={
+                "title": "Q",
+                "mode": "questionnaire",
+                "n_agents": 5,
+                "questions": QUESTIONS,
+                "parameters": {"pack_questions": True},
+            },
+        ).json()["id"]
+
+        client.post(f"{API}/{sid}/run")
+        assert asyncio.run(survey_worker.run_once())
+
+        responses = client.get(f"{API}/{sid}/question-responses").json()["responses"]
+        assert len(responses) == 15
+        assert not any(r["is_fallback"] for r in responses)
+        by_question = {r["question_id"]: r["answer"] for r in responses}
+        assert by_question == {"q1": "disagree", "q2": "4", "q3": "Solaire"}
+        assert client.get(f"{API}/{sid}/job").json()["progress_total"] == 15
+        assert fake_llm.calls == 5
+
+    def test_packed_invalid_items_are_asked_again(self, client, survey_worker, fake_llm):
+        sid = client.post(
+            API,
+            json={
+                "title": "Q",
+                "mode": "questionnaire",
+                "n_agents": 2,
+                "questions": QUESTIONS,
+                "parameters": {"pack_questions": True},
+            },
+        ).json()["id"]
+        original = fake_llm.generate
+
+        async def partial(prompt, *args, **kwargs):
+            raw = await original(prompt, *args, **kwargs)
+            if prompt.startswith("Questionnaire"):
+                return raw.replace('"answer": 4', '"answer": 12')
+            return raw
+
+        fake_llm.generate = partial
+        client.post(f"{API}/{sid}/run")
+        asyncio.run(survey_worker.run_once())
+
+        responses = client.get(f"{API}/{sid}/question-responses").json()["responses"]
+        assert {r["answer"] for r in responses if r["question_id"] == "q2"} == {"4"}
+        assert not any(r["is_fallback"] for r in responses)
+        assert fake_llm.calls == 4
+
+    def test_response_projection(self, client, survey_worker):
+        sid = client.post(
+            API,
+            json={"title": "T", "mode": "text", "input_text": "Le vélo en ville", "n_agents": 3},
+        ).json()["id"]
+        client.post(f"{API}/{sid}/run")
+        asyncio.run(survey_worker.run_once())
+
+        full = client.get(f"{API}/{sid}/responses").json()["responses"]
+        assert full[0]["raw_llm_output"]
+        light = client.get(f"{API}/{sid}/responses?include_raw=false").json()["responses"]
+        assert all(r["raw_llm_output"] is None for r in light)
+        projected = client.get(f"{API}/{sid}/responses?fields=stance,confidence").json()
+        assert projected["count"] == 3
+        assert set(projected["responses"][0]) == {"stance", "confidence"}
+        assert client.get(f"{API}/{sid}/responses?fields=stance,nope").status_code == 422
+
+    def test_streaming_export(self, client, survey_worker):
+        sid = client.post(
+            API,
+            json={"title": "Q", "mode": "questionnaire", "n_agents": 4, "questions": QUESTIONS},
+        ).json()["id"]
+        client.post(f"{API}/{sid}/run")
+        asyncio.run(survey_worker.run_once())
+
+        ndjson = client.get(f"{API}/{sid}/export?include_agents=true")
+        assert ndjson.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in ndjson.text.splitlines()]
+        assert len(rows) == 12
+        assert {"question_id", "answer", "age", "classe_sociale"} <= set(rows[0])
+        assert "raw_llm_output" not in rows[0]
+
+        csv_export = client.get(f"{API}/{sid}/export?format=csv")
+        lines = csv_export.text.splitlines()
+        assert lines[0].startswith("id,agent_id,question_id,answer")
+        assert len(lines) == 13
+        assert client.get(f"{API}/{sid}/export?format=xml").status_code == 422
+
+    def test_columnar_export(self, client, survey_worker):
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        sid = client.post(
+            API,
+            json={"title": "Q", "mode": "questionnaire", "n_agents": 50, "questions": QUESTIONS},
+        ).json()["id"]
+        client.post(f"{API}/{sid}/run")
+        asyncio.run(survey_worker.run_once())
+
+        parquet = client.get(f"{API}/{sid}/export.parquet")
+        table = pq.read_table(io.BytesIO(parquet.content))
+        assert table.num_rows == 150
+        assert pa.types.is_dictionary(table.schema.field("answer").type)
+        assert pa.types.is_dictionary(table.schema.field("classe_sociale").type)
+        assert table.schema.field("trust").type == pa.float32()
+        ndjson = client.get(f"{API}/{sid}/export?include_agents=true")
+        assert len(parquet.content) < len(ndjson.content) / 2
+
+        arrow = client.get(f"{API}/{sid}/export.arrow")
+        assert pa.ipc.open_stream(arrow.content).read_all().num_rows == 150
+
+    def test_columnar_export_without_pyarrow(self, client, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        sid = client.post(API, json={"title": "T", "mode": "text", "input_text": "x"}).json()["id"]
+        response = client.get(f"{API}/{sid}/export.parquet")
+        assert response.status_code == 501
+        assert "pyarrow" in response.json()["error"]["message"]
+
+    def test_failed_run_is_retried(self, client, survey_worker, fake_llm):
+        sid = client.post(API, json={"title": "T", "mode": "text", "input_text": "x"}).json()["id"]
+        client.post(f"{API}/{sid}/run")
+
+        original = fake_llm.generate
+
+        async def broken(*args, **kwargs):
+            raise RuntimeError("LLM down")
+
+        fake_llm.generate = broken
+        asyncio.run(survey_worker.run_once())
+        assert client.get(f"{API}/{sid}").json()["status"] == "pending"
+        assert client.get(f"{API}/{sid}/job").json()["last_error"] == "LLM down"
+
+        fake_llm.generate = original
+        asyncio.run(survey_worker.run_once())
+        assert client.get(f"{API}/{sid}").json()["status"] == "completed"
+        assert client.get(f"{API}/{sid}/job").json()["attempts"] == 2
+
+    def test_cancel_queued_run(self, client, survey_worker):
+        sid = client.post(API, json={"title": "T", "mode": "text", "input_text": "x"}).json()["id"]
+        client.post(f"{API}/{sid}/run")
+
+        resp = client.post(f"{API}/{sid}/cancel")
+        assert resp.status_code == 202
+        assert resp.json()["status"] == "cancelled"
+        assert client.get(f"{API}/{sid}").json()["status"] == "failed"
+        assert not asyncio.run(survey_worker.run_once())
+
+    def test_cannot_run_twice(self, client):
+        sid = client.post(API, json={"title": "T", "mode": "text", "input_text": "x"}).json()["id"]
+        client.post(f"{API}/{sid}/run")
+        assert client.post(f"{API}/{sid}/run").status_code == 409
+
+    def test_text_survey_requires_input(self, client):
+        sid = client.post(API, json={"title": "T", "mode": "text"}).json()["id"]
+        assert client.post(f"{API}/{sid}/run").status_code == 422
+
+    def test_job_not_found(self, client):
+        sid = client.post(API, json={"title": "T", "mode": "text"}).json()["id"]
+        assert client.get(f"{API}/{sid}/job").status_code == 404
+
+
+class TestAgentFactory:
+    def test_same_seed_same_panel(self):
+        a = generate_agents("s", 20, seed=7)
+        b = generate_agents("s", 20, seed=7)
+        strip = [{k: v for k, v in x.items() if k != "id"} for x in a]
+        assert strip == [{k: v for k, v in x.items() if k != "id"} for x in b]
+        assert [x["agent_index"] for x in a] == list(range(20))
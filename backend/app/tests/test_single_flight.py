@@ -0,0 +1,63 @@
+"""Tests for the single-flight deduplication of concurrent LLM prompts."""
+
+import asyncio
+
+import pytest
+
+from app.infrastructure.llm.single_flight import SingleFlightLLMClient
+
+
+class GatedLLM:
+    """Holds every call until `release` is set, so duplicates overlap."""
+
+    def __init__(self, error: Exception | None = None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error = error
+
+    async def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=256):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return f"{system_prompt}:{prompt}"
+
+
+async def test_identical_concurrent_prompts_share_one_call():
+    inner = GatedLLM()
+    llm = SingleFlightLLMClient(inner)
+
+    batch = asyncio.create_task(llm.generate_batch(["a", "a", "b", "a"], system_prompt="s"))
+    await asyncio.sleep(0.01)
+    inner.release.set()
+
+    assert await batch == ["s:a", "s:a", "s:b", "s:a"]
+    assert inner.calls == 2
+    stats = llm.stats()
+    assert (stats["requests"], stats["upstream_calls"], stats["dedup_ratio"]) == (4, 2, 0.5)
+    assert stats["dedup_tokens_saved"] > 0
+
+
+async def test_sequential_prompts_are_not_collapsed():
+    inner = GatedLLM()
+    inner.release.set()
+    llm = SingleFlightLLMClient(inner)
+
+    await llm.generate("a")
+    await llm.generate("a")
+
+    assert inner.calls == 2
+
+
+async def test_failure_reaches_every_waiter():
+    inner = GatedLLM(error=RuntimeError("down"))
+    llm = SingleFlightLLMClient(inner)
+
+    calls = [asyncio.create_task(llm.generate("a")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    inner.release.set()
+
+    for call in calls:
+        with pytest.raises(RuntimeError, match="down"):
+            await call
+    assert inner.calls == 1
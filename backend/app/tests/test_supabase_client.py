@@ -0,0 +1,276 @@
+"""Tests for SupabaseClient paging and the round trips made by the repositories."""
+
+import re
+import threading
+
+import pytest
+
+from app.core.errors import RepoError
+from app.infrastructure.db.bulk_writer import BulkWriter
+from app.infrastructure.db.supabase_client import SupabaseClient
+from app.repositories.survey_aggregate_repo import SurveyAggregateRepository
+from app.repositories.survey_question_response_repo import SurveyQuestionResponseRepository
+
+
+class FakeQuery:
+    """In-memory stand-in for a postgrest request builder."""
+
+    def __init__(self, backend: "FakePostgrest", table: str):
+        self._backend = backend
+        self._table = table
+        self._op = "select"
+        self._payload = None
+        self._predicates: list = []
+        self._order: list[str] = []
+        self._limit: int | None = None
+        self._returning = "representation"
+        self._ignore_duplicates = False
+
+    def select(self, columns="*"):
+        return self
+
+    def insert(self, data, returning="representation", count=None):
+        self._op, self._payload, self._returning = "insert", data, str(returning)
+        return self
+
+    def upsert(
+        self, data, on_conflict="", returning="representation", count=None, ignore_duplicates=False
+    ):
+        self._op, self._payload, self._returning = "upsert", data, str(returning)
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def delete(self, returning="representation", count=None):
+        self._op, self._returning = "delete", str(returning)
+        return self
+
+    def eq(self, key, value):
+        self._predicates.append(lambda row: row.get(key) == value)
+        return self
+
+    def gt(self, key, value):
+        self._predicates.append(lambda row: row[key] > value)
+        return self
+
+    def or_(self, filters):
+        # Only the `a.gt.x,and(a.eq.x,b.gt.y)` shape built by `keyset_filter`.
+        clauses = [
+            re.findall(r'(\w+)\.(eq|gt)\."([^"]*)"', clause)
+            for clause in re.findall(r"and\([^)]*\)|[^,]+", filters)
+        ]
+        ops = {"eq": lambda a, b: a == b, "gt": lambda a, b: a > b}
+        self._predicates.append(
+            lambda row: any(
+                all(ops[op](str(row[key]), value) for key, op, value in terms) for terms in clauses
+            )
+        )
+        return self
+
+    def order(self, key, desc=False):
+        self._order.append(key)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def execute(self):
+        with self._backend.lock:
+            self._backend.requests.append(f"{self._op} {self._table}")
+            store = self._backend.tables.setdefault(self._table, [])
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            if self._op == "upsert" and self._ignore_duplicates:
+                existing = {r["id"] for r in store}
+                rows = [r for r in rows if r["id"] not in existing]
+                store.extend(rows)
+            elif self._op == "upsert":
+                replaced = {r["id"] for r in rows}
+                store[:] = [r for r in store if r["id"] not in replaced] + rows
+            elif self._op == "insert":
+                store.extend(rows)
+            if self._backend.fail or self._backend.lost_replies > 0:
+                # The write went through but the reply never reached the client.
+                self._backend.lost_replies -= 1
+                raise ConnectionError("boom")
+        if self._op == "delete":
+            with self._backend.lock:
+                rows = [r for r in store if all(p(r) for p in self._predicates)]
+                store[:] = [r for r in store if r not in rows]
+        if self._op in ("insert", "upsert", "delete"):
+            data = [] if self._returning == "minimal" else rows
+            return type("Response", (), {"data": data, "count": len(rows)})
+        rows = [r for r in store if all(p(r) for p in self._predicates)]
+        if self._order:
+            rows.sort(key=lambda r: [r[key] for key in self._order])
+        limit = min(filter(None, [self._limit, self._backend.max_rows]), default=None)
+        return type("Response", (), {"data": rows[:limit]})
+
+
+class FakePostgrest:
+    def __init__(self):
+        self.tables: dict[str, list[dict]] = {}
+        self.requests: list[str] = []
+        self.fail = False
+        self.lost_replies = 0
+        self.max_rows: int | None = None
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+@pytest.fixture
+def backend():
+    return FakePostgrest()
+
+
+@pytest.fixture
+def db(backend) -> SupabaseClient:
+    client = SupabaseClient("http://supabase.test", "key", page_size=1000)
+    client._client = backend
+    return client
+
+
+def _question_rows(n: int, survey_id: str = "s") -> list[dict]:
+    return [
+        {
+            "id": f"{i:06d}",
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "survey_id": survey_id,
+            "agent_id": "a",
+            "question_id": f"q{i % 3}",
+            "answer": "1",
+        }
+        for i in range(n)
+    ]
+
+
+class TestSelectIter:
+    def test_streams_every_row_past_the_page_size(self, db, backend):
+        backend.tables["t"] = _question_rows(2500) + _question_rows(10, survey_id="other")
+        rows = list(db.select_iter("t", filters={"survey_id": "s"}))
+        assert len(rows) == 2500
+        assert len({r["id"] for r in rows}) == 2500
+        assert backend.requests == ["select t"] * 4
+
+    def test_custom_key_and_page_size(self, db, backend):
+        backend.tables["t"] = [{"id": str(i), "agent_index": i} for i in range(7)]
+        rows = list(db.select_iter("t", key="agent_index", page_size=3))
+        assert [r["agent_index"] for r in rows] == list(range(7))
+        assert len(backend.requests) == 4
+
+    def test_composite_key_keeps_creation_order(self, db, backend):
+        backend.tables["t"] = [
+            {"id": f"{(7 * i) % 10}", "created_at": f"2024-01-01T00:00:0{i // 2}+00:00"}
+            for i in range(10)
+        ]
+        rows = list(db.select_iter("t", key=("created_at", "id"), page_size=3))
+        expected = sorted(backend.tables["t"], key=lambda r: (r["created_at"], r["id"]))
+        assert rows == expected
+        assert len(backend.requests) == 5
+
+    def test_pages_cut_by_the_server_are_not_the_end(self, db, backend):
+        backend.tables["t"] = _question_rows(2500)
+        backend.max_rows = 400
+        assert len(list(db.select_iter("t"))) == 2500
+
+    def test_errors_are_wrapped(self, db, backend):
+        backend.fail = True
+        with pytest.raises(RepoError):
+            list(db.select_iter("t"))
+
+
+class TestBulkWriter:
+    def test_rows_are_split_in_bounded_chunks(self, db, backend):
+        writer = BulkWriter(db, chunk_size=100, max_concurrency=3)
+        result = writer.write("t", _question_rows(1050), returning=False)
+        assert result.ok
+        assert result.written == 1050
+        assert result.rows == []
+        assert backend.requests == ["upsert t"] * 11
+        assert len(backend.tables["t"]) == 1050
+
+    def test_chunks_are_bounded_by_payload_size(self, db, backend):
+        rows = [{"id": str(i), "raw_llm_output": "x" * 400} for i in range(10)]
+        writer = BulkWriter(db, chunk_size=100, max_chunk_bytes=1000)
+        assert writer.write("t", rows).written == 10
+        assert len(backend.requests) == 5
+
+    def test_retried_chunks_do_not_duplicate_rows(self, db, backend):
+        backend.lost_replies = 2
+        writer = BulkWriter(db, chunk_size=100, max_concurrency=1, retry_delay=0)
+        result = writer.write("t", _question_rows(300))
+        assert result.ok
+        assert len(result.rows) == 300
+        assert len(backend.tables["t"]) == 300
+        assert len(backend.requests) == 5
+
+    def test_retries_never_overwrite_existing_rows(self, db, backend):
+        backend.tables["t"] = [{**_question_rows(1)[0], "answer": "kept"}]
+        BulkWriter(db, chunk_size=100).write("t", _question_rows(2), returning=False)
+        assert [r["answer"] for r in backend.tables["t"]] == ["kept", "1"]
+
+    def test_rejected_chunks_are_not_retried(self, db):
+        class Rejected(Exception):
+            code = "23505"
+
+        calls = []
+
+        def upsert(*args, **kwargs):
+            calls.append(args)
+            try:
+                raise Rejected("duplicate key value violates unique constraint")
+            except Rejected as e:
+                raise RepoError(f"Upsert failed: {e}")
+
+        db.upsert = upsert
+        result = BulkWriter(db, max_retries=3, retry_delay=0).write("t", _question_rows(5))
+        assert not result.ok
+        assert len(calls) == 1
+
+    def test_failed_chunks_are_reported(self, db, backend):
+        backend.fail = True
+        writer = BulkWriter(db, chunk_size=100, max_retries=1, retry_delay=0)
+        result = writer.write("t", _question_rows(250))
+        assert not result.ok
+        assert [(f.index, f.rows) for f in result.failures] == [(0, 100), (1, 100), (2, 50)]
+        with pytest.raises(RepoError) as exc:
+            writer.write_or_raise("t", _question_rows(250))
+        assert len(exc.value.details["failed_chunks"]) == 3
+
+
+class TestRepositoryRoundTrips:
+    def test_question_responses_are_streamed_by_page(self, db, backend):
+        backend.tables["survey_question_responses"] = _question_rows(2500)
+        repo = SurveyQuestionResponseRepository(db)
+        assert len(list(repo.iter_by_survey("s"))) == 2500
+        assert len(repo.list_by_survey_and_question("s", "q1")) == 833
+        assert backend.requests == ["select survey_question_responses"] * 6
+
+    def test_projected_rows_omit_the_paging_key(self, db, backend):
+        backend.tables["survey_question_responses"] = _question_rows(1500)
+        rows = list(SurveyQuestionResponseRepository(db).iter_rows_by_survey("s", ["answer"]))
+        assert len(rows) == 1500
+        assert all(row == {"answer": "1"} for row in rows)
+
+    def test_aggregates_are_upserted_in_place(self, db, backend):
+        repo = SurveyAggregateRepository(db)
+        repo.upsert_aggregates_batch("s", [("q1", {"total": 1}), (None, {"total": 1})])
+        assert repo.upsert_aggregates_batch("s", [("q1", {"total": 2})], returning=False) == 1
+        rows = backend.tables["survey_aggregates"]
+        assert sorted((r["question_id"] or "", r["aggregation"]["total"]) for r in rows) == [
+            ("", 1),
+            ("q1", 2),
+        ]
+        assert "delete survey_aggregates" not in backend.requests
+
+
+class TestMinimalWrites:
+    def test_insert_returns_count_only(self, db, backend):
+        assert db.insert("t", _question_rows(3), returning=False) == 3
+        assert [r["id"] for r in db.insert("t", _question_rows(1))] == ["000000"]
+
+    def test_delete_returns_count(self, db, backend):
+        backend.tables["survey_question_responses"] = _question_rows(5) + _question_rows(2, "x")
+        assert SurveyQuestionResponseRepository(db).delete_by_survey("s") == 5
+        assert len(backend.tables["survey_question_responses"]) == 2
@@ -128,3 +128,51 @@ class TestSurveyAggregates:
         resp = client.get(f"{API}/{sid}/aggregates")
         assert resp.status_code == 200
         assert resp.json()["count"] == 0
+
+
+class TestCompletedSurveyCaching:
+    def _completed(self, client, fake_survey_repo):
+        sid = client.post(API, json={"title": "Done", "mode": "text"}).json()["id"]
+        fake_survey_repo.update_survey(sid, {"status": "completed"})
+        return sid
+
+    def test_etag_and_not_modified(self, client, fake_survey_repo):
+        sid = self._completed(client, fake_survey_repo)
+
+        first = client.get(f"{API}/{sid}/agents")
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+        assert first.json()["count"] == 0
+
+        again = client.get(f"{API}/{sid}/agents", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+
+        other = client.get(f"{API}/{sid}/responses?include_raw=false")
+        assert other.headers["etag"] != etag
+
+    def test_body_is_served_from_cache(self, client, fake_survey_repo, fake_agent_repo):
+        sid = self._completed(client, fake_survey_repo)
+        first = client.get(f"{API}/{sid}/agents")
+
+        fake_agent_repo.create_agents_batch([{"survey_id": sid}])
+        assert client.get(f"{API}/{sid}/agents").content == first.content
+
+    def test_running_survey_is_not_cached(
+        self, client, fake_survey_repo, fake_agent_repo, fake_aggregate_repo
+    ):
+        sid = client.post(API, json={"title": "Running", "mode": "text"}).json()["id"]
+        fake_survey_repo.update_survey(sid, {"status": "running"})
+
+        resp = client.get(f"{API}/{sid}/aggregates")
+        assert resp.status_code == 200
+        assert "etag" not in resp.headers
+        assert resp.json()["count"] == 0
+        assert client.get(f"{API}/{sid}/agents").json()["count"] == 0
+
+        fake_aggregate_repo.upsert_aggregates_batch(sid, [(None, {"total": 1})])
+        fake_agent_repo.create_agents_batch([{"survey_id": sid}])
+        again = client.get(f"{API}/{sid}/aggregates")
+        assert "etag" not in again.headers
+        assert again.json()["aggregates"][0]["aggregation"] == {"total": 1}
+        assert client.get(f"{API}/{sid}/agents").json()["count"] == 1
@@ -0,0 +1,233 @@
+"""Survey run worker pool, running outside of the uvicorn API workers.
+
+Usage:
+    python -m app.workers.survey_worker --processes 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+
+from app.core.config import get_settings
+from app.core.logging import get_logger, setup_logging
+from app.domain.entities.job import Job
+from app.infrastructure.cache.factory import get_cache
+from app.infrastructure.db.supabase_client import get_supabase_client
+from app.infrastructure.llm.factory import get_async_llm_client, get_llm_cache
+from app.infrastructure.pubsub.factory import create_broker
+from app.infrastructure.queue.sqlite_queue import SQLiteJobQueue, get_job_queue
+from app.repositories.agent_repo import AgentRepository
+from app.repositories.response_repo import ResponseRepository
+from app.repositories.survey_aggregate_repo import SurveyAggregateRepository
+from app.repositories.survey_question_repo import SurveyQuestionRepository
+from app.repositories.survey_question_response_repo import SurveyQuestionResponseRepository
+from app.repositories.survey_repo import SurveyRepository
+from app.services.aggregation import get_live_aggregates
+from app.services.job_service import SurveyJobService
+from app.services.realtime_batcher import RealtimeBatcher
+from app.services.realtime_service import RealtimeService
+from app.services.simulation_service import SimulationService
+from app.services.survey_service import SurveyService
+
+logger = get_logger(__name__)
+
+
+class SurveyWorker:
+    """Leases survey run jobs and executes them one at a time."""
+
+    def __init__(
+        self,
+        queue: SQLiteJobQueue,
+        jobs: SurveyJobService,
+        simulation: SimulationService,
+        worker_id: str,
+        lease_seconds: float = 60.0,
+        realtime: RealtimeService | RealtimeBatcher | None = None,
+    ):
+        self._queue = queue
+        self._jobs = jobs
+        self._simulation = simulation
+        self._worker_id = worker_id
+        self._lease_seconds = lease_seconds
+        self._realtime = realtime
+
+    async def run_forever(self, stop: asyncio.Event, poll_interval: float = 1.0) -> None:
+        logger.info(f"Worker {self._worker_id} started")
+        while not stop.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception(f"Worker {self._worker_id} loop error")
+                processed = False
+            if not processed:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                except TimeoutError:
+                    pass
+        if self._realtime is not None:
+            await self._realtime.close()
+        logger.info(f"Worker {self._worker_id} stopped")
+
+    async def run_once(self) -> bool:
+        """Process at most one job. Returns False when the queue had nothing to lease."""
+        for reaped in await asyncio.to_thread(self._queue.reap_expired):
+            await self._settle(reaped)
+
+        job = await asyncio.to_thread(self._queue.lease, self._worker_id, self._lease_seconds)
+        if job is None:
+            return False
+
+        logger.info(f"Worker {self._worker_id} leased job {job.id} (attempt {job.attempts})")
+        await self._settle(job)
+
+        async def on_progress(done: int, total: int) -> None:
+            await asyncio.to_thread(
+                self._queue.heartbeat,
+                job.id,
+                self._worker_id,
+                self._lease_seconds,
+                done,
+                total,
+            )
+
+        run = asyncio.create_task(self._simulation.execute(job.survey_id, on_progress))
+        heartbeat = asyncio.create_task(self._keep_alive(job, run))
+        try:
+            result = await run
+        except asyncio.CancelledError:
+            if not (heartbeat.done() and not heartbeat.cancelled() and heartbeat.result()):
+                raise
+            current = await asyncio.to_thread(self._queue.get, job.id)
+            if current.cancel_requested:
+                job = await asyncio.to_thread(self._queue.mark_cancelled, job.id, self._worker_id)
+                await self._settle(job)
+            else:
+                logger.warning(f"Worker {self._worker_id} lost the lease on job {job.id}")
+            return True
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed: {e}")
+            job = await asyncio.to_thread(self._queue.fail, job.id, self._worker_id, str(e))
+            await self._settle(job)
+            return True
+        finally:
+            heartbeat.cancel()
+
+        job = await asyncio.to_thread(self._queue.complete, job.id, self._worker_id)
+        await self._settle(job, result.elapsed_seconds)
+        return True
+
+    async def _keep_alive(self, job: Job, run: asyncio.Task) -> bool:
+        """Renew the lease while the run is going; cancel it when told to stop.
+
+        Returns True when the run was cancelled because of the queue state.
+        """
+        while not run.done():
+            await asyncio.sleep(self._lease_seconds / 3)
+            alive = await asyncio.to_thread(
+                self._queue.heartbeat, job.id, self._worker_id, self._lease_seconds
+            )
+            if not alive:
+                run.cancel()
+                return True
+        return False
+
+    async def _settle(self, job: Job, elapsed_seconds: float | None = None) -> None:
+        survey = await asyncio.to_thread(self._jobs.sync_survey_status, job, elapsed_seconds)
+        if self._realtime is not None:
+            await self._realtime.broadcast(
+                job.survey_id,
+                "survey_status",
+                {
+                    "status": survey.status,
+                    "job_status": job.status,
+                    "attempts": job.attempts,
+                    "error": job.last_error,
+                },
+            )
+
+
+def build_worker(worker_id: str) -> SurveyWorker:
+    settings = get_settings()
+    db = get_supabase_client()
+    cache = get_cache()
+    surveys = SurveyService(
+        survey_repo=SurveyRepository(db, cache),
+        agent_repo=AgentRepository(db),
+        response_repo=ResponseRepository(db),
+        aggregate_repo=SurveyAggregateRepository(db),
+        question_repo=SurveyQuestionRepository(db, cache),
+        question_response_repo=SurveyQuestionResponseRepository(db),
+        live_aggregates=get_live_aggregates(),
+        snapshot_interval=settings.AGGREGATE_SNAPSHOT_INTERVAL,
+    )
+    queue = get_job_queue()
+    # Events published here are relayed by the API workers to their websockets.
+    realtime = RealtimeBatcher(
+        RealtimeService(create_broker()),
+        interval=settings.REALTIME_BATCH_INTERVAL,
+        max_batch_size=settings.REALTIME_BATCH_MAX_SIZE,
+    )
+    simulation = SimulationService(
+        surveys=surveys,
+        llm_factory=get_async_llm_client,
+        realtime=realtime,
+        max_concurrency=settings.SIMULATION_MAX_CONCURRENCY,
+        chunk_size=settings.SIMULATION_CHUNK_SIZE,
+        llm_cache=get_llm_cache(),
+        llm_provider=settings.LLM_PROVIDER,
+    )
+    return SurveyWorker(
+        queue=queue,
+        jobs=SurveyJobService(surveys, queue, max_attempts=settings.JOB_MAX_ATTEMPTS),
+        simulation=simulation,
+        worker_id=worker_id,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        realtime=realtime,
+    )
+
+
+def _run_process(index: int) -> None:
+    setup_logging()
+    worker = build_worker(f"{socket.gethostname()}-{os.getpid()}-{index}")
+
+    async def main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        await worker.run_forever(stop, poll_interval=get_settings().WORKER_POLL_INTERVAL)
+
+    asyncio.run(main())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CrowdMind survey run workers")
+    parser.add_argument("--processes", type=int, default=get_settings().WORKER_PROCESSES)
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.processes <= 1:
+        _run_process(0)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_run_process, args=(i,)) for i in range(args.processes)]
+    for p in processes:
+        p.start()
+
+    def forward(signum: int, _frame: object) -> None:
+        for p in processes:
+            if p.is_alive():
+                p.terminate()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for p in processes:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
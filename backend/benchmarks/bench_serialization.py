@@ -0,0 +1,93 @@
+"""Compare the list endpoint serialisation paths on 30k question responses.
+
+Usage (from backend/): python -m benchmarks.bench_serialization [n_rows]
+
+"models" reproduces the former path: one `QuestionResponseOut` built field by
+field per row, then the list validated and dumped through `response_model`.
+"fast" is `list_response`, which hands the dataclasses straight to orjson.
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.v1.schemas.response import QuestionResponseListResponse, QuestionResponseOut
+from app.api.v1.serialization import list_response
+from app.domain.entities.survey_question_response import SurveyQuestionResponse
+
+
+def make_rows(n: int) -> list[SurveyQuestionResponse]:
+    now = datetime.now(timezone.utc)
+    return [
+        SurveyQuestionResponse(
+            id=f"00000000-0000-0000-0000-{i:012d}",
+            survey_id="survey",
+            agent_id=f"agent-{i % 1000}",
+            question_id=f"q{i % 30}",
+            answer=str(1 + i % 5),
+            confidence=(i % 100) / 100,
+            short_reason="Une raison courte donnée par l'agent pour sa réponse.",
+            raw_llm_output='{"answer": "3", "confidence": 0.7, "short_reason": "..."}',
+            is_fallback=i % 50 == 0,
+            created_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+async def models_path(rows: list[SurveyQuestionResponse], field) -> bytes:
+    items = [
+        QuestionResponseOut(
+            id=r.id,
+            survey_id=r.survey_id,
+            agent_id=r.agent_id,
+            question_id=r.question_id,
+            answer=r.answer,
+            confidence=r.confidence,
+            short_reason=r.short_reason,
+            raw_llm_output=r.raw_llm_output,
+            is_fallback=r.is_fallback,
+            created_at=r.created_at,
+        )
+        for r in rows
+    ]
+    content = QuestionResponseListResponse(responses=items, count=len(items))
+    # What FastAPI does with a returned model: validate against response_model,
+    # dump to jsonable data, then render it with json.dumps.
+    encoded = await serialize_response(field=field, response_content=content)
+    return JSONResponse(encoded).body
+
+
+async def fast_path(rows: list[SurveyQuestionResponse], field) -> bytes:
+    return list_response("responses", rows, QuestionResponseOut).body
+
+
+async def best_of(fn, rows, field, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn(rows, field)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30_000
+    rows = make_rows(n)
+    field = create_model_field(
+        name="response", type_=QuestionResponseListResponse, mode="serialization"
+    )
+    slow = await best_of(models_path, rows, field)
+    fast = await best_of(fast_path, rows, field)
+    print(f"{n} rows")
+    print(f"  models : {slow * 1000:8.1f} ms")
+    print(f"  fast   : {fast * 1000:8.1f} ms  ({slow / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())